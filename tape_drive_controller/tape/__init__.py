@@ -1,6 +1,7 @@
 from .list_devices import list_tape_devices
 from .backup import (
     run_backup,
+    run_backup_raw,
     run_restore,
     rewind,
     erase,
@@ -9,13 +10,15 @@ from .backup import (
     list_tape_contents,
     TapeEntry,
     TapeBackupError,
+    COMPRESSIONS,
 )
-from .capacity import query_remaining_capacity_bytes, nst_to_sg
+from .capacity import query_remaining_capacity_bytes, invalidate_capacity_cache, nst_to_sg
 from .diagnostics import run_tape_diagnostics
 from .ltfs import (
     format_ltfs,
     is_ltfs_available,
     is_ltfs_mount_available,
+    detect_ltfs,
     tape_has_ltfs,
     run_ltfs_rsync,
     unmount_leftover_ltfs_mounts,
@@ -24,6 +27,7 @@ from .ltfs import (
 __all__ = [
     "list_tape_devices",
     "run_backup",
+    "run_backup_raw",
     "run_restore",
     "rewind",
     "erase",
@@ -32,12 +36,15 @@ __all__ = [
     "list_tape_contents",
     "TapeEntry",
     "TapeBackupError",
+    "COMPRESSIONS",
     "query_remaining_capacity_bytes",
+    "invalidate_capacity_cache",
     "nst_to_sg",
     "run_tape_diagnostics",
     "format_ltfs",
     "is_ltfs_available",
     "is_ltfs_mount_available",
+    "detect_ltfs",
     "tape_has_ltfs",
     "run_ltfs_rsync",
     "unmount_leftover_ltfs_mounts",
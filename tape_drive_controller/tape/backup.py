@@ -1,33 +1,270 @@
 """
-Run backup to tape: rewind via mt, then stream tar to device.
-Supports progress callbacks and cancel.
+Run backup to tape: rewind via mt, then stream tar to device through a RAM buffer
+(see buffer.py). Supports progress callbacks and cancel.
 """
+import os
 import queue
 import re
+import selectors
+import shutil
+import stat
 import subprocess
 import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Callable, Optional
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from .buffer import (
+    PIPE_READ_SIZE,
+    TAPE_READ_SIZE,
+    TAPE_RECORD_SIZE,
+    StreamBuffer,
+    grow_pipe,
+    mbuffer_available,
+    mbuffer_write_cmd,
+    open_for_write,
+)
+from .capacity import invalidate_capacity_cache
+from .size_cache import _SizeCache, size_cache
+from .spawn import spawn_argv
 
 # Checkpoint every N files for progress (tar --checkpoint)
 CHECKPOINT_EVERY = 500
 
+# tar/mt output is read from a binary pipe in large blocks and split into lines here,
+# instead of one TextIOWrapper readline per archive member.
+PIPE_BUFSIZE = 1 << 20
+READ_BLOCK_SIZE = 64 * 1024
+# Max blocks buffered between the pipe reader thread and the consumer (bounds memory)
+DRAIN_QUEUE_BLOCKS = 1024
+# cancel_check() is polled at most this often; also the drain queue wait timeout,
+# so an idle loop still polls on time
+CANCEL_POLL_SECONDS = 0.25
+
+# on_log_batch receives up to LOG_BATCH_LINES lines at once, or what arrived within LOG_BATCH_SECONDS
+LOG_BATCH_LINES = 64
+LOG_BATCH_SECONDS = 0.1
+
+# mt commands other than erase: timeout, and bytes of stdout/stderr kept (the rest is dropped)
+MT_TIMEOUT_SEC = 60
+MT_OUTPUT_CAP = 64 * 1024
+
 # Default timeout for mt erase (long erase can take hours on LTO)
 ERASE_TIMEOUT_SEC = 4 * 3600  # 4 hours
+# Interval of "Erase still running" log lines
+ERASE_HEARTBEAT_SEC = 60
 
 TapeBackupError = type("TapeBackupError", (Exception,), {})
 
+# Archive compression: "gzip" is tar's built-in -z (a single core, slower than LTO-7+
+# drives); "pigz" and "zstd" run through tar --use-compress-program and use all cores.
+# tar passes -d to the program when reading, so the same arguments serve restore/list.
+COMPRESSIONS = ("none", "gzip", "pigz", "zstd")
+
+
+def _resolve_compression(compression: Optional[str], use_gzip: bool) -> str:
+    """
+    Return the compression to use. An explicit compression wins over use_gzip;
+    use_gzip alone means gzip format, written/read with pigz when it is installed.
+    Raises TapeBackupError for an unknown compression or a missing pigz/zstd.
+    """
+    if compression is None:
+        if not use_gzip:
+            return "none"
+        return "pigz" if shutil.which("pigz") else "gzip"
+    if compression not in COMPRESSIONS:
+        raise TapeBackupError(f"Unknown compression {compression!r} (expected one of {', '.join(COMPRESSIONS)})")
+    if compression in ("pigz", "zstd") and not shutil.which(compression):
+        raise TapeBackupError(f"Required command not found: {compression}")
+    return compression
+
+
+def _compression_args(compression: str) -> list[str]:
+    """tar options for a resolved compression."""
+    if compression == "gzip":
+        return ["-z"]
+    if compression == "pigz":
+        return [f"--use-compress-program=pigz -p {os.cpu_count() or 1}"]
+    if compression == "zstd":
+        return ["--use-compress-program=zstd -T0 -3"]
+    return []
+
+
+def _iter_line_blocks(stream: BinaryIO) -> Iterator[list[bytes]]:
+    """
+    Read a binary pipe in blocks of up to READ_BLOCK_SIZE and yield the complete lines
+    of each block (without the newline). An unterminated last line is yielded at EOF.
+    """
+    buf = bytearray()
+    while True:
+        chunk = stream.read1(READ_BLOCK_SIZE)
+        if not chunk:
+            break
+        buf += chunk
+        idx = buf.rfind(b"\n")
+        if idx < 0:
+            continue
+        lines = bytes(buf[:idx]).split(b"\n")
+        del buf[: idx + 1]
+        yield lines
+    if buf:
+        yield [bytes(buf)]
+
+
+def _poll_line_blocks(stream: BinaryIO, timeout: float) -> Iterator[list[bytes]]:
+    """
+    Like _iter_line_blocks, but waits for the pipe in the calling thread with a selector
+    and yields [] whenever nothing arrived within timeout, so the caller can poll for cancel
+    between reads. For consumers that keep up with the pipe without a reader thread.
+    """
+    fd = stream.fileno()
+    buf = bytearray()
+    with selectors.DefaultSelector() as sel:
+        sel.register(fd, selectors.EVENT_READ)
+        while True:
+            if not sel.select(timeout):
+                yield []
+                continue
+            chunk = os.read(fd, READ_BLOCK_SIZE)
+            if not chunk:
+                break
+            buf += chunk
+            idx = buf.rfind(b"\n")
+            if idx < 0:
+                continue
+            lines = bytes(buf[:idx]).split(b"\n")
+            del buf[: idx + 1]
+            yield lines
+    if buf:
+        yield [bytes(buf)]
+
+
+def _drain_popen(
+    proc: subprocess.Popen, stream: Optional[BinaryIO] = None
+) -> "queue.Queue[Optional[list[bytes]]]":
+    """
+    Start a daemon thread that reads proc.stdout (or stream, e.g. proc.stderr) in line
+    blocks into a bounded queue, so tar's pipe keeps draining while the consumer runs
+    callbacks. None marks EOF. Used where a stalled tar would stall the tape (backup);
+    elsewhere _poll_line_blocks reads in the consumer's own thread.
+    """
+    stdout = stream if stream is not None else proc.stdout
+    assert stdout is not None
+    block_queue: "queue.Queue[Optional[list[bytes]]]" = queue.Queue(maxsize=DRAIN_QUEUE_BLOCKS)
+
+    def reader() -> None:
+        try:
+            for lines in _iter_line_blocks(stdout):
+                block_queue.put(lines)
+        finally:
+            block_queue.put(None)
+
+    threading.Thread(target=reader, daemon=True).start()
+    return block_queue
+
 
-def _run_mt(device: str, command: str) -> tuple[int, str, str]:
-    """Run mt -f <device> <command>. Returns (returncode, stdout, stderr)."""
-    r = subprocess.run(
-        ["mt", "-f", device, command],
-        capture_output=True,
-        text=True,
-        timeout=60,
+def _throttle_cancel(cancel_check: Optional[Callable[[], bool]]) -> Callable[[], bool]:
+    """
+    Wrap cancel_check so it is called at most once per CANCEL_POLL_SECONDS (it reads
+    UI state from the worker thread); in between, and without cancel_check, returns False.
+    """
+    next_poll = 0.0
+
+    def cancelled() -> bool:
+        nonlocal next_poll
+        if cancel_check is None:
+            return False
+        now = time.monotonic()
+        if now < next_poll:
+            return False
+        next_poll = now + CANCEL_POLL_SECONDS
+        return cancel_check()
+
+    return cancelled
+
+
+class LogBatcher:
+    """
+    Collects log lines and hands them to on_batch as one list, when LOG_BATCH_LINES have
+    accumulated or LOG_BATCH_SECONDS have passed since the last flush. Lets a GUI marshal
+    one event per batch instead of one per archive member. Call flush() at the end.
+    """
+
+    def __init__(self, on_batch: Callable[[list[str]], None]) -> None:
+        self._on_batch = on_batch
+        self._lines: list[str] = []
+        self._last_flush = time.monotonic()
+
+    def push(self, line: str) -> None:
+        self._lines.append(line)
+        if len(self._lines) >= LOG_BATCH_LINES:
+            self.flush()
+        else:
+            self.flush_if_due()
+
+    def flush_if_due(self) -> None:
+        """Flush if LOG_BATCH_SECONDS have passed, so the last lines of a burst don't linger."""
+        if self._lines and time.monotonic() - self._last_flush >= LOG_BATCH_SECONDS:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if self._lines:
+            lines, self._lines = self._lines, []
+            self._on_batch(lines)
+
+
+def _decode_line(line: bytes) -> str:
+    """Decode a tar/mt output line for the log."""
+    return line.decode("utf-8", errors="replace")
+
+
+def _run_mt(device: str, command: str, timeout: float = MT_TIMEOUT_SEC) -> tuple[int, str, str]:
+    """
+    Run mt -f <device> <command> (command may carry a count, e.g. "seek 123"). Returns
+    (returncode, stdout, stderr).
+    Both pipes are drained as output arrives, but only the first MT_OUTPUT_CAP bytes of
+    each are kept. Raises subprocess.TimeoutExpired (mt killed) after timeout seconds.
+    """
+    args = ["mt", "-f", device] + command.split()
+    proc = subprocess.Popen(
+        spawn_argv(args),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False,
     )
-    return r.returncode, r.stdout or "", r.stderr or ""
+    assert proc.stdout is not None and proc.stderr is not None
+    out, err = bytearray(), bytearray()
+    captured = {proc.stdout.fileno(): out, proc.stderr.fileno(): err}
+    deadline = time.monotonic() + timeout
+    try:
+        with selectors.DefaultSelector() as sel:
+            for fd in captured:
+                sel.register(fd, selectors.EVENT_READ)
+            while sel.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                for key, _events in sel.select(remaining):
+                    chunk = os.read(key.fd, READ_BLOCK_SIZE)
+                    if not chunk:
+                        sel.unregister(key.fd)
+                        continue
+                    buf = captured[key.fd]
+                    room = MT_OUTPUT_CAP - len(buf)
+                    if room > 0:
+                        buf += chunk[:room]
+        proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise
+    finally:
+        proc.stdout.close()
+        proc.stderr.close()
+    return proc.returncode, _decode_line(bytes(out)), _decode_line(bytes(err))
 
 
 def rewind(device: str) -> None:
@@ -37,6 +274,32 @@ def rewind(device: str) -> None:
         raise TapeBackupError(f"mt rewind failed: {err or out or f'exit {code}'}")
 
 
+# mt tell: "At block 1234."
+_MT_TELL_BLOCK = re.compile(r"At block (\d+)")
+
+
+def tell(device: str) -> int:
+    """Return the tape's current block number (0 at BOT). Raises TapeBackupError on failure."""
+    try:
+        code, out, err = _run_mt(device, "tell")
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        raise TapeBackupError(f"mt tell failed: {e}") from e
+    match = _MT_TELL_BLOCK.search(out)
+    if code != 0 or not match:
+        raise TapeBackupError(f"mt tell failed: {err or out or f'exit {code}'}")
+    return int(match.group(1))
+
+
+def seek(device: str, block: int) -> None:
+    """Position the tape at block (as returned by tell). Raises TapeBackupError on failure."""
+    try:
+        code, out, err = _run_mt(device, f"seek {block}")
+    except (FileNotFoundError, subprocess.TimeoutExpired) as e:
+        raise TapeBackupError(f"mt seek {block} failed: {e}") from e
+    if code != 0:
+        raise TapeBackupError(f"mt seek {block} failed: {err or out or f'exit {code}'}")
+
+
 def erase(
     device: str,
     *,
@@ -52,35 +315,42 @@ def erase(
             on_log(line)
 
     log("Erase started (this can take several hours and cannot be aborted).")
-    proc = subprocess.Popen(
-        ["mt", "-f", device, "erase"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-    )
-    assert proc.stdout is not None
-    read_done = threading.Event()
-
-    def read_stdout() -> None:
-        try:
-            for line in proc.stdout:
-                log(line.rstrip())
-        finally:
-            read_done.set()
-
-    reader = threading.Thread(target=read_stdout, daemon=True)
-    reader.start()
+    args = ["mt", "-f", device, "erase"]
     try:
-        proc.wait(timeout=timeout)
-    except subprocess.TimeoutExpired:
-        proc.kill()
-        proc.wait()
-        read_done.wait(timeout=5)
-        raise TapeBackupError("mt erase timed out (tape may still be erasing on the drive).")
-    read_done.wait(timeout=5)
+        # mt erase prints nothing while it runs; stderr (error text, if any) is read after exit.
+        proc = subprocess.Popen(
+            spawn_argv(args),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            close_fds=False,
+        )
+    except FileNotFoundError as e:
+        raise TapeBackupError(f"Required command not found (mt): {e}") from e
+    except OSError as e:
+        raise TapeBackupError(f"mt erase could not be started: {e}") from e
+    assert proc.stderr is not None
+    start = time.monotonic()
+    while True:
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            proc.kill()
+            proc.wait()
+            raise TapeBackupError("mt erase timed out (tape may still be erasing on the drive).")
+        try:
+            proc.wait(timeout=min(ERASE_HEARTBEAT_SEC, remaining))
+            break
+        except subprocess.TimeoutExpired:
+            elapsed = int(time.monotonic() - start)
+            log(f"Erase still running… {elapsed // 3600}h{elapsed // 60 % 60:02d}m elapsed")
+    err = _decode_line(proc.stderr.read()).strip()
+    proc.stderr.close()
+    invalidate_capacity_cache(device)
     if proc.returncode != 0:
-        raise TapeBackupError(f"mt erase failed with exit code {proc.returncode}")
+        raise TapeBackupError(
+            f"mt erase failed with exit code {proc.returncode}" + (f": {err}" if err else "")
+        )
+    if err:
+        log(err)
     log("Erase completed.")
 
 
@@ -103,7 +373,7 @@ def forward_space_files(device: str, n: int) -> None:
 
 # GNU tar -tv output: -rw-r--r-- user/group 12345 2024-01-15 12:00 path/to/file
 _TAR_LIST_LINE = re.compile(
-    r"^(.{10})\s+\S+/\S+\s+(\d+)\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}\s+(.*)$"
+    rb"^(.{10})\s+\S+/\S+\s+(\d+)\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}\s+(.*)$"
 )
 
 
@@ -115,73 +385,80 @@ class TapeEntry:
     is_dir: bool
 
 
+def _parse_tar_list_line(line: bytes) -> Optional[TapeEntry]:
+    """
+    Parse one tar -tv line into a TapeEntry, or None if it is not a member line.
+    Splits the fixed leading columns directly; lines that don't look like the usual
+    GNU layout (other locales, device entries) go through _TAR_LIST_LINE instead.
+    """
+    parts = line[10:].split(None, 4)
+    if (
+        len(parts) == 5
+        and parts[1].isdigit()
+        and len(parts[2]) == 10
+        and parts[2][4:5] == b"-"
+        and len(parts[3]) == 5
+        and parts[3][2:3] == b":"
+    ):
+        size, path = int(parts[1]), parts[4]
+    else:
+        match = _TAR_LIST_LINE.match(line)
+        if not match:
+            return None
+        size, path = int(match.group(2)), match.group(3)
+    return TapeEntry(
+        path=path.rstrip().decode("utf-8", errors="surrogateescape"),
+        size=size,
+        is_dir=line[:1] == b"d",
+    )
+
+
 def list_tape_contents(
     device: str,
     *,
     use_gzip: bool = False,
+    compression: Optional[str] = None,
     skip_rewind: bool = False,
     on_progress: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
 ) -> list[TapeEntry]:
     """
     List contents of the tar archive on the tape. Rewinds first unless skip_rewind.
-    Returns list of TapeEntry (path, size, is_dir). Runs tar -tvf (or -tzvf).
+    Returns list of TapeEntry (path, size, is_dir). Runs tar -tvf (plus the compression option).
+    compression: one of COMPRESSIONS, as used for the backup; overrides use_gzip.
     Raises TapeBackupError on mt/tar failure. cancel_check() stops reading if True.
     """
+    compression = _resolve_compression(compression, use_gzip)
     if not skip_rewind:
         rewind(device)
 
-    cmd = ["tar", "-tvf", device]
-    if use_gzip:
-        cmd = ["tar", "-tzvf", device]
+    cmd = ["tar", "-tvf", device] + _compression_args(compression)
 
     entries: list[TapeEntry] = []
     proc: Optional[subprocess.Popen] = None
     count = 0
 
-    line_queue: "queue.Queue[Optional[str]]" = queue.Queue()
-
-    def reader() -> None:
-        assert proc is not None and proc.stdout is not None
-        try:
-            for line in proc.stdout:
-                line_queue.put(line)
-        finally:
-            line_queue.put(None)
-
     try:
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            bufsize=PIPE_BUFSIZE,
         )
         assert proc.stdout is not None
-        reader_thread = threading.Thread(target=reader, daemon=True)
-        reader_thread.start()
-        cancel_poll_seconds = 0.5
-        while True:
-            try:
-                line = line_queue.get(timeout=cancel_poll_seconds)
-            except queue.Empty:
-                if cancel_check and cancel_check():
-                    proc.terminate()
-                    proc.wait(timeout=10)
-                    raise TapeBackupError("List tape contents cancelled by user")
-                continue
-            if line is None:
-                break
-            line = line.rstrip()
-            match = _TAR_LIST_LINE.match(line)
-            if match:
-                perms, size_str, path = match.group(1), match.group(2), match.group(3)
-                size = int(size_str)
-                is_dir = perms.startswith("d")
-                entries.append(TapeEntry(path=path, size=size, is_dir=is_dir))
-                count += 1
-                if on_progress and count % 100 == 0:
-                    on_progress(f"Reading… {count} entries")
+        cancelled = _throttle_cancel(cancel_check)
+        for lines in _poll_line_blocks(proc.stdout, CANCEL_POLL_SECONDS):
+            if cancelled():
+                proc.terminate()
+                proc.wait(timeout=10)
+                raise TapeBackupError("List tape contents cancelled by user")
+            for line in lines:
+                entry = _parse_tar_list_line(line)
+                if entry is not None:
+                    entries.append(entry)
+            if on_progress and len(entries) // 100 > count // 100:
+                on_progress(f"Reading… {len(entries)} entries")
+            count = len(entries)
         proc.wait()
         if proc.returncode != 0:
             raise TapeBackupError(f"tar list exited with code {proc.returncode}")
@@ -199,33 +476,430 @@ def list_tape_contents(
     return entries
 
 
-# Regex to parse bytes written from tar checkpoint line: "W: 512000 (...)"
-_CHECKPOINT_W_BYTES = re.compile(r"W:\s*(\d+)")
-# Regex to parse bytes read from tar checkpoint line (extract): "R: 512000 (...)"
-_CHECKPOINT_R_BYTES = re.compile(r"R:\s*(\d+)")
+# tar prints our checkpoint action on stderr as "tar: CHECKPOINT <records> W: <bytes> (...)"
+# (R: instead of W: when extracting). %u is the record number, not the checkpoint index.
+_CHECKPOINT_ARGS = [
+    f"--checkpoint={CHECKPOINT_EVERY}",
+    "--checkpoint-action=echo=CHECKPOINT %u %T",
+]
+_CHECKPOINT_PREFIX = b"tar: CHECKPOINT "
+_WRITING_PROGRESS = "Writing… {} records written".format
+_EXTRACTING_PROGRESS = "Extracting… {} records".format
+# Fallback regexes if the checkpoint line does not split as expected
+_CHECKPOINT_RECORDS = re.compile(rb"CHECKPOINT\s+(\d+)")
+_CHECKPOINT_BYTES = re.compile(rb"[WR]:\s*(\d+)")
 
 
-def _compute_total_size(paths: list[str]) -> int:
-    """Return total byte size of paths (sum of du -sb). Returns 0 on error or if unavailable."""
-    if not paths:
+def _parse_checkpoint(line: bytes) -> Optional[tuple[Optional[int], Optional[int]]]:
+    """
+    Parse a tar checkpoint line into (records, bytes); either may be None if missing.
+    Returns None for any other line (the common case), after a single prefix check.
+    """
+    if not line.startswith(_CHECKPOINT_PREFIX):
+        return None
+    toks = line.split(None, 5)
+    try:
+        if toks[3] in (b"W:", b"R:"):
+            return int(toks[2]), int(toks[4])
+    except (IndexError, ValueError):
+        pass
+    records = _CHECKPOINT_RECORDS.search(line)
+    nbytes = _CHECKPOINT_BYTES.search(line)
+    return (
+        int(records.group(1)) if records else None,
+        int(nbytes.group(1)) if nbytes else None,
+    )
+
+
+# Upper bound on threads walking top-level backup paths concurrently
+SIZE_WALK_MAX_WORKERS = 8
+# Threads listing directories within one walk (I/O bound, so more than the CPU count)
+SIZE_WALK_THREADS = min(32, (os.cpu_count() or 1) * 4)
+# Entries a sampled size walk looks at before extrapolating (see _sample_size)
+SIZE_SAMPLE_ENTRIES = 10000
+
+
+def _list_dir(
+    path: str, on_error: Optional[Callable[[str, OSError], None]] = None
+) -> Iterator[tuple[str, os.stat_result]]:
+    """
+    Yield (name, lstat result) for each entry of directory path; entries that cannot be
+    stat'ed are skipped, after on_error(name, error) if given. The directory is opened once and its entries are stat'ed relative
+    to that fd (fstatat), so the kernel does not resolve every component of path again for
+    each entry, which adds up in deep trees. Raises OSError if path cannot be listed.
+    """
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        with os.scandir(fd) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError as e:
+                    if on_error:
+                        on_error(entry.name, e)
+                    continue
+                yield entry.name, st
+    finally:
+        os.close(fd)
+
+
+def _walk_size(top: str, threads: int = SIZE_WALK_THREADS) -> int:
+    """
+    Return the apparent size in bytes of top and everything below it, like du -sb:
+    symlinks are not followed and hard-linked files are counted once.
+    Directories are listed (_list_dir) by up to threads threads at once (scandir and stat
+    release the GIL, so cold-cache metadata reads overlap). Unreadable entries are skipped; returns 0
+    if top itself cannot be stat'ed.
+    """
+    try:
+        st = os.lstat(top)
+    except OSError:
         return 0
+    if not stat.S_ISDIR(st.st_mode):
+        return st.st_size
+    totals = [st.st_size]
+    seen_links: set[tuple[int, int]] = set()
+    lock = threading.Lock()
+    dirs: "queue.Queue[Optional[str]]" = queue.Queue()
+    dirs.put(top)
+
+    def work() -> None:
+        total = 0
+        while True:
+            path = dirs.get()
+            if path is None:
+                break
+            try:
+                for name, st in _list_dir(path):
+                    if stat.S_ISDIR(st.st_mode):
+                        dirs.put(os.path.join(path, name))
+                    elif st.st_nlink > 1:
+                        key = (st.st_dev, st.st_ino)
+                        with lock:
+                            if key in seen_links:
+                                continue
+                            seen_links.add(key)
+                    total += st.st_size
+            except OSError:
+                pass
+            finally:
+                dirs.task_done()
+        with lock:
+            totals.append(total)
+
+    workers = [threading.Thread(target=work, daemon=True) for _ in range(max(1, threads))]
+    for t in workers:
+        t.start()
+    dirs.join()  # every queued directory listed, including those queued while listing
+    for _ in workers:
+        dirs.put(None)
+    for t in workers:
+        t.join()
+    return sum(totals)
+
+
+def _sample_size(
+    top: str,
+    max_entries: int = SIZE_SAMPLE_ENTRIES,
+    cache: Optional[_SizeCache] = None,
+) -> tuple[int, bool]:
+    """
+    Return (size, is_estimate) for top like _walk_size, but stop after max_entries entries.
+    The walk is breadth-first; when it stops early, the directories still queued are assumed
+    to hold as much as the average directory listed so far. Hard links are not deduplicated.
+    With a cache, unchanged directories are taken from it (costing one lstat, not counted
+    against max_entries) and listed ones are added, so repeated runs converge on a full
+    walk; any cache hit makes the result an estimate.
+    Good enough for a progress bar, not for a capacity check.
+    """
     try:
-        r = subprocess.run(
-            ["du", "-sb"] + paths,
-            capture_output=True,
-            text=True,
-            timeout=3600,
+        st = os.lstat(top)
+    except OSError:
+        return 0, False
+    total = st.st_size
+    if not stat.S_ISDIR(st.st_mode):
+        return total, False
+    pending = deque([top])
+    listed = entries = 0
+    estimate = False
+    while pending:
+        if entries >= max_entries:
+            return total + total * len(pending) // listed, True
+        path = pending.popleft()
+        dir_st = None
+        if cache is not None:
+            try:
+                dir_st = os.lstat(path)
+            except OSError:
+                continue
+            hit = cache.lookup(path, dir_st)
+            if hit is not None:
+                nbytes, subdirs = hit
+                total += nbytes
+                pending.extend(os.path.join(path, name) for name in subdirs)
+                listed += 1
+                estimate = True
+                continue
+        nbytes = 0
+        subdirs = []
+        try:
+            for name, st in _list_dir(path):
+                if stat.S_ISDIR(st.st_mode):
+                    pending.append(os.path.join(path, name))
+                    subdirs.append(name)
+                nbytes += st.st_size
+                entries += 1
+        except OSError:
+            continue
+        total += nbytes
+        listed += 1
+        if dir_st is not None:
+            cache.store(path, dir_st, nbytes, subdirs)
+    return total, estimate
+
+
+def _size_pool(paths: list[str]) -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=max(1, min(SIZE_WALK_MAX_WORKERS, len(paths))),
+        thread_name_prefix="tape-size",
+    )
+
+
+# Sampled sizes (progress-bar only) measured within this many seconds are reused, e.g. when
+# the same sources are backed up to several drives at once
+SIZE_REUSE_SECONDS = 60.0
+# (path, exact, sample) -> (time.monotonic() when measured, result of _measure_path_size)
+_recent_sizes: dict[tuple[str, bool, bool], tuple[float, tuple[int, bool]]] = {}
+_size_locks: dict[tuple[str, bool, bool], threading.Lock] = {}
+_size_locks_guard = threading.Lock()
+
+
+def _path_size(path: str, exact: bool = False, sample: bool = False) -> tuple[int, bool]:
+    """
+    Return (size, is_estimate) for one backup path (see _measure_path_size). Concurrent
+    calls for the same path share one walk: the later ones wait for it and take its result.
+    Sampled sizes are also reused for SIZE_REUSE_SECONDS; other sizes can feed a capacity
+    check, so they are always measured after the call started.
+    """
+    key = (os.path.abspath(path), exact, sample)
+    started = time.monotonic()
+    with _size_locks_guard:
+        lock = _size_locks.setdefault(key, threading.Lock())
+    with lock:
+        recent = _recent_sizes.get(key)
+        if recent is not None and (
+            recent[0] >= started or (sample and started - recent[0] <= SIZE_REUSE_SECONDS)
+        ):
+            return recent[1]
+        result = _measure_path_size(path, exact, sample)
+        _recent_sizes[key] = (time.monotonic(), result)
+        return result
+
+
+# Octal escapes (space, tab, newline, backslash) in /proc/self/mountinfo paths
+_MOUNTINFO_ESCAPE = re.compile(rb"\\([0-7]{3})")
+
+
+def _mount_points_below(path: str) -> Optional[list[str]]:
+    """Mount points strictly below path, from /proc/self/mountinfo; None if it can't be read."""
+    prefix = path.rstrip("/") + "/"
+    try:
+        with open("/proc/self/mountinfo", "rb") as f:
+            fields = [line.split(b" ", 5) for line in f]
+    except OSError:
+        return None
+    # Field 5 is the mount point
+    points = (
+        _MOUNTINFO_ESCAPE.sub(lambda m: bytes([int(m.group(1), 8)]), f[4])
+        for f in fields
+        if len(f) > 4
+    )
+    return [p for p in map(os.fsdecode, points) if p.startswith(prefix) and p != path]
+
+
+def _used_bytes(path: str) -> int:
+    """Used blocks of the file system mounted at path (statvfs). Raises OSError."""
+    st = os.statvfs(path)
+    return (st.f_blocks - st.f_bfree) * st.f_frsize
+
+
+def _measure_path_size(path: str, exact: bool, sample: bool) -> tuple[int, bool]:
+    """
+    Return (size, is_estimate) for one backup path. Unless exact, a mount point is sized
+    from the used blocks (statvfs, constant time) of its file system and of every file
+    system mounted below it (tar descends into those too) instead of being walked.
+    That is an estimate: it includes metadata, and bind mounts are counted whole.
+    sample: other directories are sized with a bounded sampled walk (_sample_size) that
+    reuses and extends the on-disk directory cache (see size_cache; call .save() afterwards).
+    """
+    if not exact and os.path.ismount(path):
+        nested = _mount_points_below(os.path.abspath(path))
+        if nested is not None:
+            try:
+                return sum(_used_bytes(p) for p in [path] + nested), True
+            except OSError:
+                pass
+    if sample and not exact:
+        return _sample_size(path, cache=size_cache())
+    return _walk_size(path), False
+
+
+def _compute_total_size(paths: list[str], exact: bool = False) -> tuple[int, bool]:
+    """
+    Return (total bytes, is_estimate) for paths, sizing top-level paths in parallel.
+    Exact totals match du -sb; is_estimate is True if any mount point was sized with
+    statvfs (see _measure_path_size). Returns (0, False) if empty.
+    """
+    if not paths:
+        return 0, False
+    with _size_pool(paths) as pool:
+        sizes = list(pool.map(lambda p: _path_size(p, exact), paths))
+    return sum(size for size, _ in sizes), any(estimate for _, estimate in sizes)
+
+
+class _TapeWriter:
+    """
+    Copies tar's archive stream (tar -cf -) to the tape device through a RAM buffer:
+    mbuffer if installed, else an in-process StreamBuffer. Either way the tape is written
+    in tar-sized records, so it reads back exactly like tar -cf <device>.
+    """
+
+    def __init__(self, archive: BinaryIO, device: str) -> None:
+        self._device = device
+        self._proc: Optional[subprocess.Popen] = None
+        self._buffer: Optional[StreamBuffer] = None
+        grow_pipe(archive.fileno())  # lets tar run further ahead of the reader
+        if mbuffer_available():
+            self._proc = subprocess.Popen(
+                mbuffer_write_cmd(device),
+                stdin=archive,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+            )
+            archive.close()  # mbuffer holds the pipe now; tar gets EPIPE if it dies
+            return
+        try:
+            tape_fd = open_for_write(device)
+        except OSError as e:
+            raise TapeBackupError(f"Cannot open {device} for writing: {e}") from e
+        archive_fd = os.dup(archive.fileno())
+        archive.close()
+        self._buffer = StreamBuffer(
+            archive_fd, tape_fd, read_size=PIPE_READ_SIZE, write_size=TAPE_RECORD_SIZE
         )
-        if r.returncode != 0:
-            return 0
-        total = 0
-        for line in (r.stdout or "").strip().splitlines():
-            parts = line.split(None, 1)
-            if parts:
-                total += int(parts[0])
-        return total
-    except (FileNotFoundError, ValueError, subprocess.TimeoutExpired):
-        return 0
+        self._buffer.start()
+
+    def abort(self) -> None:
+        """Stop writing (cancel or error); whatever is still buffered is dropped."""
+        if self._proc is not None and self._proc.poll() is None:
+            self._proc.terminate()
+            self._proc.wait(timeout=10)
+        if self._buffer is not None:
+            self._buffer.abort()
+            self._buffer.join(timeout=10)
+
+    def finish(self) -> None:
+        """Wait until the buffer has been written out. Raises TapeBackupError if writing failed."""
+        if self._proc is not None:
+            assert self._proc.stderr is not None
+            err = self._proc.stderr.read()  # -q: only errors are printed
+            self._proc.wait()
+            if self._proc.returncode != 0:
+                raise TapeBackupError(
+                    f"mbuffer exited with code {self._proc.returncode}: {_decode_line(err).strip()}"
+                )
+        if self._buffer is not None:
+            self._buffer.join()
+            if self._buffer.error is not None:
+                raise TapeBackupError(f"Writing to {self._device} failed: {self._buffer.error}")
+
+
+def _check_size_limit(total_bytes: Optional[int], max_tape_bytes: Optional[int]) -> None:
+    """Raise TapeBackupError if total_bytes exceeds max_tape_bytes (when both are known)."""
+    if max_tape_bytes is not None and max_tape_bytes > 0 and total_bytes is not None:
+        if total_bytes > max_tape_bytes:
+            raise TapeBackupError(
+                f"Backup size ({total_bytes:,} bytes, ~{total_bytes / (1024**3):.1f} GB) "
+                f"exceeds tape capacity limit ({max_tape_bytes:,} bytes, ~{max_tape_bytes / (1024**3):.1f} GB). "
+                "Increase the tape capacity setting or remove directories."
+            )
+
+
+def _is_tar_image(paths: list[str], compression: str) -> bool:
+    """True if paths is a single uncompressed .tar file that can go to tape as-is (see run_backup_raw)."""
+    return (
+        compression == "none"
+        and len(paths) == 1
+        and paths[0].endswith(".tar")
+        and os.path.isfile(paths[0])
+    )
+
+
+def run_backup_raw(
+    device: str,
+    src_path: str,
+    *,
+    skip_rewind: bool = False,
+    max_tape_bytes: Optional[int] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+    on_progress_update: Optional[Callable[[int, Optional[int], float], None]] = None,
+    on_log: Optional[Callable[[str], None]] = None,
+    on_log_batch: Optional[Callable[[list[str]], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+) -> None:
+    """
+    Rewind tape (unless skip_rewind), then copy the file src_path (e.g. a pre-built .tar
+    image) to the tape unchanged, without running tar. Data goes through a StreamBuffer in
+    tar-sized records, so a tar image reads back with tar -f <device> like any backup.
+    Callbacks and errors are as for run_backup; "records" are TAPE_RECORD_SIZE blocks.
+    """
+    try:
+        total_bytes: Optional[int] = os.stat(src_path).st_size or None
+    except OSError as e:
+        raise TapeBackupError(f"Cannot read {src_path}: {e}") from e
+    _check_size_limit(total_bytes, max_tape_bytes)
+    if not skip_rewind:
+        rewind(device)
+    message = f"Writing {src_path} to tape as-is (no tar)."
+    if on_log:
+        on_log(message)
+    if on_log_batch:
+        on_log_batch([message])
+    if on_progress_update:
+        on_progress_update(0, total_bytes, 0.0)
+
+    try:
+        src_fd = os.open(src_path, os.O_RDONLY)
+    except OSError as e:
+        raise TapeBackupError(f"Cannot read {src_path}: {e}") from e
+    try:
+        tape_fd = open_for_write(device)
+    except OSError as e:
+        os.close(src_fd)
+        raise TapeBackupError(f"Cannot open {device} for writing: {e}") from e
+
+    stream_buffer = StreamBuffer(src_fd, tape_fd, read_size=TAPE_READ_SIZE, write_size=TAPE_RECORD_SIZE)
+    start_time = time.monotonic()
+    cancelled = _throttle_cancel(cancel_check)
+    stream_buffer.start()
+    try:
+        while True:
+            done = stream_buffer.join(timeout=CANCEL_POLL_SECONDS)
+            if not done and cancelled():
+                raise TapeBackupError("Backup cancelled by user")
+            written = stream_buffer.bytes_written
+            if on_progress_update:
+                on_progress_update(written, total_bytes, time.monotonic() - start_time)
+            if on_progress:
+                on_progress(f"Writing… {written // TAPE_RECORD_SIZE} records written")
+            if done:
+                break
+        if stream_buffer.error is not None:
+            raise TapeBackupError(f"Writing to {device} failed: {stream_buffer.error}")
+        if on_progress:
+            on_progress(f"Completed. {stream_buffer.bytes_written // TAPE_RECORD_SIZE} records written.")
+    finally:
+        stream_buffer.abort()
 
 
 def run_backup(
@@ -233,92 +907,147 @@ def run_backup(
     paths: list[str],
     *,
     use_gzip: bool = False,
+    compression: Optional[str] = None,
     skip_rewind: bool = False,
     max_tape_bytes: Optional[int] = None,
     on_progress: Optional[Callable[[str], None]] = None,
     on_progress_update: Optional[Callable[[int, Optional[int], float], None]] = None,
     on_log: Optional[Callable[[str], None]] = None,
+    on_log_batch: Optional[Callable[[list[str]], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
 ) -> None:
     """
     Rewind tape (unless skip_rewind), then write paths to tape as a single tar archive.
+    A single uncompressed .tar file is written as-is instead (run_backup_raw). The total source size is computed while the tape rewinds (mount points are estimated
+    from file system usage, and logged as such). tar writes the archive to a
+    pipe and _TapeWriter buffers it in RAM, so the drive keeps streaming when tar stalls.
+    compression: one of COMPRESSIONS; overrides use_gzip (which means gzip format, via pigz if installed).
     max_tape_bytes: if set, backup is aborted when total source size exceeds this (safety check).
     on_progress(message): e.g. "Writing…", "1234 records written"
     on_progress_update(bytes_written, total_bytes, elapsed_sec): optional; for progress bar and ETA.
     on_log(line): raw tar/checkpoint lines for the log.
+    on_log_batch(lines): the same lines in batches (see LogBatcher); cheaper for a GUI.
     cancel_check(): if returns True, backup is aborted (subprocess killed).
     skip_rewind: set True for testing (e.g. writing to a file instead of tape).
     Raises TapeBackupError on mt or tar failure, or when size exceeds max_tape_bytes.
     """
-    total_bytes: Optional[int] = _compute_total_size(paths)
+    compression = _resolve_compression(compression, use_gzip)
+    if _is_tar_image(paths, compression):
+        # Already a tar archive: write it to tape as-is instead of archiving the archive
+        return run_backup_raw(
+            device,
+            paths[0],
+            skip_rewind=skip_rewind,
+            max_tape_bytes=max_tape_bytes,
+            on_progress=on_progress,
+            on_progress_update=on_progress_update,
+            on_log=on_log,
+            on_log_batch=on_log_batch,
+            cancel_check=cancel_check,
+        )
+    batcher = LogBatcher(on_log_batch) if on_log_batch else None
+
+    def emit(text: str) -> None:
+        if on_log:
+            on_log(text)
+        if batcher:
+            batcher.push(text)
+
+    # Size the source tree while the tape rewinds; both are slow and independent.
+    size_pool = _size_pool(paths)
+    try:
+        size_futures = [size_pool.submit(_path_size, p) for p in paths]
+        if not skip_rewind:
+            rewind(device)
+        sizes = [f.result() for f in size_futures]
+    finally:
+        size_pool.shutdown(wait=False, cancel_futures=True)
+    total_bytes: Optional[int] = sum(size for size, _ in sizes)
+    size_is_estimate = any(estimate for _, estimate in sizes)
+    if size_is_estimate and max_tape_bytes and total_bytes > max_tape_bytes:
+        # Don't refuse a backup on an estimate; walk the mount points exactly first.
+        total_bytes, size_is_estimate = _compute_total_size(paths, exact=True)
+    if size_is_estimate:
+        emit(
+            f"Source size ~{total_bytes / (1024**3):.1f} GB estimated from file system usage "
+            "of mount point(s); progress percentage is approximate."
+        )
+        if batcher:
+            batcher.flush()
     if total_bytes == 0:
         total_bytes = None
     if on_progress_update:
         on_progress_update(0, total_bytes, 0.0)
 
-    if max_tape_bytes is not None and max_tape_bytes > 0 and total_bytes is not None:
-        if total_bytes > max_tape_bytes:
-            raise TapeBackupError(
-                f"Backup size ({total_bytes:,} bytes, ~{total_bytes / (1024**3):.1f} GB) "
-                f"exceeds tape capacity limit ({max_tape_bytes:,} bytes, ~{max_tape_bytes / (1024**3):.1f} GB). "
-                "Increase the tape capacity setting or remove directories."
-            )
-
-    if not skip_rewind:
-        rewind(device)
+    _check_size_limit(total_bytes, max_tape_bytes)
 
-    # tar -cvf /dev/nst0 [paths] or -z for gzip
-    cmd = ["tar", "-cvf", device] + paths
-    if use_gzip:
-        cmd = ["tar", "-zcvf", device] + paths
+    # tar -cvf - [compression] [paths]; with the archive on stdout, tar prints the
+    # verbose listing and checkpoints on stderr.
+    cmd = ["tar", "-cvf", "-"] + _compression_args(compression) + paths
 
     # Checkpoint with %T for bytes written (W: NNNN)
-    cmd.extend([
-        f"--checkpoint={CHECKPOINT_EVERY}",
-        "--checkpoint-action=echo=CHECKPOINT %u %T",
-    ])
+    cmd.extend(_CHECKPOINT_ARGS)
 
     proc: Optional[subprocess.Popen] = None
     file_count = 0
     bytes_written = 0
     start_time = time.monotonic()
 
-    def log(line: str) -> None:
+    # Hoisted out of log(), which runs once per archive member
+    parse_checkpoint = _parse_checkpoint
+    checkpoint_prefix = _CHECKPOINT_PREFIX
+    decode = _decode_line
+    monotonic = time.monotonic
+    progress_message = _WRITING_PROGRESS
+    logging = on_log is not None or batcher is not None
+
+    def log(line: bytes) -> None:
         nonlocal file_count, bytes_written
-        if "CHECKPOINT " in line:
-            try:
-                parts = line.split("CHECKPOINT ", 1)[1].split(None, 1)
-                n = int(parts[0])
-                file_count = n * CHECKPOINT_EVERY
-            except (IndexError, ValueError):
-                pass
-            match = _CHECKPOINT_W_BYTES.search(line)
-            if match:
-                bytes_written = int(match.group(1))
-            elapsed = time.monotonic() - start_time
+        # Prefix test inline: most lines are member names, and they skip the parser call
+        if line.startswith(checkpoint_prefix):
+            records, nbytes = parse_checkpoint(line)
+            if records is not None:
+                file_count = records
+            if nbytes is not None:
+                bytes_written = nbytes
             if on_progress_update:
-                on_progress_update(bytes_written, total_bytes, elapsed)
+                on_progress_update(bytes_written, total_bytes, monotonic() - start_time)
             if on_progress:
-                on_progress(f"Writing… {file_count} records written")
-        if on_log:
-            on_log(line)
+                on_progress(progress_message(file_count))
+        if logging:
+            emit(decode(line))
 
+    writer: Optional[_TapeWriter] = None
     try:
         proc = subprocess.Popen(
             cmd,
             stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+            stderr=subprocess.PIPE,
+            bufsize=PIPE_BUFSIZE,
         )
         assert proc.stdout is not None
-        for line in proc.stdout:
-            if cancel_check and cancel_check():
+        writer = _TapeWriter(proc.stdout, device)
+        block_queue = _drain_popen(proc, proc.stderr)
+        cancelled = _throttle_cancel(cancel_check)
+        while True:
+            try:
+                lines = block_queue.get(timeout=CANCEL_POLL_SECONDS)
+            except queue.Empty:
+                lines = []
+            if cancelled():
                 proc.terminate()
                 proc.wait(timeout=10)
+                writer.abort()
                 raise TapeBackupError("Backup cancelled by user")
-            log(line)
+            if lines is None:
+                break
+            for line in lines:
+                log(line)
+            if batcher:
+                batcher.flush_if_due()
         proc.wait()
+        # A tape write error makes tar fail with EPIPE; report the write error instead.
+        writer.finish()
         if proc.returncode != 0:
             raise TapeBackupError(f"tar exited with code {proc.returncode}")
         if on_progress:
@@ -326,11 +1055,18 @@ def run_backup(
     except FileNotFoundError as e:
         raise TapeBackupError(f"Required command not found (mt/tar): {e}") from e
     except TapeBackupError:
+        if proc and proc.poll() is None:
+            proc.terminate()
         raise
     except Exception as e:
         if proc and proc.poll() is None:
             proc.terminate()
+        if writer is not None:
+            writer.abort()
         raise TapeBackupError(str(e)) from e
+    finally:
+        if batcher:
+            batcher.flush()
 
 
 def run_restore(
@@ -338,23 +1074,29 @@ def run_restore(
     destination: str,
     *,
     use_gzip: bool = False,
+    compression: Optional[str] = None,
     skip_rewind: bool = False,
     archive_number: int = 1,
     on_progress: Optional[Callable[[str], None]] = None,
     on_progress_update: Optional[Callable[[int, Optional[int], float], None]] = None,
     on_log: Optional[Callable[[str], None]] = None,
+    on_log_batch: Optional[Callable[[list[str]], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
 ) -> None:
     """
     Rewind tape (unless skip_rewind), then optionally skip to archive_number (1-based),
-    then extract from tape to destination.
+    then extract from tape to destination. The tape is read through a StreamBuffer into
+    tar -xf -, so extraction stalls don't stop the drive.
     archive_number: 1 = first archive (default); N > 1 = rewind then fsf(N-1) then extract.
+    compression: one of COMPRESSIONS, as used for the backup; overrides use_gzip.
     on_progress(message): e.g. "Extracting… N records"
     on_progress_update(bytes_read, total_bytes, elapsed_sec): optional; total_bytes is always None.
     on_log(line): raw tar/checkpoint lines for the log.
+    on_log_batch(lines): the same lines in batches (see LogBatcher); cheaper for a GUI.
     cancel_check(): if returns True, restore is aborted.
     Raises TapeBackupError on mt or tar failure.
     """
+    compression = _resolve_compression(compression, use_gzip)
     if on_progress_update:
         on_progress_update(0, None, 0.0)
     if not skip_rewind:
@@ -362,64 +1104,107 @@ def run_restore(
     if archive_number > 1:
         forward_space_files(device, archive_number - 1)
 
-    cmd = ["tar", "-xvf", device, "-C", destination]
-    if use_gzip:
-        cmd = ["tar", "-xzvf", device, "-C", destination]
-    cmd.extend([
-        f"--checkpoint={CHECKPOINT_EVERY}",
-        "--checkpoint-action=echo=CHECKPOINT %u %T",
-    ])
+    cmd = ["tar", "-xvf", "-", "-C", destination] + _compression_args(compression)
+    cmd.extend(_CHECKPOINT_ARGS)
+    batcher = LogBatcher(on_log_batch) if on_log_batch else None
+
+    def emit(text: str) -> None:
+        if on_log:
+            on_log(text)
+        if batcher:
+            batcher.push(text)
 
     proc: Optional[subprocess.Popen] = None
     file_count = 0
     bytes_read = 0
     start_time = time.monotonic()
 
-    def log(line: str) -> None:
+    # Hoisted out of log(), which runs once per archive member
+    parse_checkpoint = _parse_checkpoint
+    checkpoint_prefix = _CHECKPOINT_PREFIX
+    decode = _decode_line
+    monotonic = time.monotonic
+    progress_message = _EXTRACTING_PROGRESS
+    logging = on_log is not None or batcher is not None
+
+    def log(line: bytes) -> None:
         nonlocal file_count, bytes_read
-        if "CHECKPOINT " in line:
-            try:
-                parts = line.split("CHECKPOINT ", 1)[1].split(None, 1)
-                n = int(parts[0])
-                file_count = n * CHECKPOINT_EVERY
-            except (IndexError, ValueError):
-                pass
-            match = _CHECKPOINT_R_BYTES.search(line)
-            if match:
-                bytes_read = int(match.group(1))
-            elapsed = time.monotonic() - start_time
+        # Prefix test inline: most lines are member names, and they skip the parser call
+        if line.startswith(checkpoint_prefix):
+            records, nbytes = parse_checkpoint(line)
+            if records is not None:
+                file_count = records
+            if nbytes is not None:
+                bytes_read = nbytes
             if on_progress_update:
-                on_progress_update(bytes_read, None, elapsed)
+                on_progress_update(bytes_read, None, monotonic() - start_time)
             if on_progress:
-                on_progress(f"Extracting… {file_count} records")
-        if on_log:
-            on_log(line)
+                on_progress(progress_message(file_count))
+        if logging:
+            emit(decode(line))
 
+    stream_buffer: Optional[StreamBuffer] = None
     try:
-        proc = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,
+        try:
+            tape_fd = os.open(device, os.O_RDONLY)
+        except OSError as e:
+            raise TapeBackupError(f"Cannot open {device} for reading: {e}") from e
+        # Read whole tape blocks (any block size up to TAPE_READ_SIZE) into tar's stdin pipe.
+        archive_fd, pipe_write_fd = os.pipe()
+        grow_pipe(pipe_write_fd)
+        # The drive is the side that must not stall here, and only the buffer's capacity
+        # protects it; tar is fed as soon as data arrives (unlike backup, where the drive
+        # drains the buffer and waits for it to fill), so extraction and progress don't
+        # move in jumps of most of the buffer.
+        stream_buffer = StreamBuffer(
+            tape_fd, pipe_write_fd, read_size=TAPE_READ_SIZE, start_fill_percent=0
         )
+        stream_buffer.start()
+        try:
+            proc = subprocess.Popen(
+                cmd,
+                stdin=archive_fd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                bufsize=PIPE_BUFSIZE,
+            )
+        finally:
+            os.close(archive_fd)
         assert proc.stdout is not None
-        for line in proc.stdout:
-            if cancel_check and cancel_check():
+        cancelled = _throttle_cancel(cancel_check)
+        # tar reads from the RAM buffer, so a brief wait on its output doesn't stop the drive
+        for lines in _poll_line_blocks(proc.stdout, CANCEL_POLL_SECONDS):
+            if cancelled():
                 proc.terminate()
                 proc.wait(timeout=10)
                 raise TapeBackupError("Restore cancelled by user")
-            log(line)
+            for line in lines:
+                log(line)
+            if batcher:
+                batcher.flush_if_due()
         proc.wait()
+        # tar may stop at the end-of-archive blocks before the filemark: stop reading.
+        stream_buffer.abort()
+        stream_buffer.join()
         if proc.returncode != 0:
+            error = stream_buffer.error
+            if error is not None and not isinstance(error, BrokenPipeError):
+                raise TapeBackupError(f"Reading {device} failed: {error}")
             raise TapeBackupError(f"tar exited with code {proc.returncode}")
         if on_progress:
             on_progress(f"Completed. {file_count} records extracted.")
     except FileNotFoundError as e:
         raise TapeBackupError(f"Required command not found (mt/tar): {e}") from e
     except TapeBackupError:
+        if proc and proc.poll() is None:
+            proc.terminate()
         raise
     except Exception as e:
         if proc and proc.poll() is None:
             proc.terminate()
         raise TapeBackupError(str(e)) from e
+    finally:
+        if stream_buffer is not None:
+            stream_buffer.abort()
+        if batcher:
+            batcher.flush()
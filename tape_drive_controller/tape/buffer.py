@@ -0,0 +1,244 @@
+"""
+RAM buffer between tar and the tape device, so short stalls on the source side don't stop
+the drive (shoe-shining: stop, reverse, re-accelerate). Uses mbuffer when installed for
+backup; otherwise (and for restore) a pair of Python threads moving data through a
+bounded in-memory queue.
+"""
+import fcntl
+import os
+import shutil
+import stat
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+# tar's default record size (blocking factor 20). On a variable-block tape each write() is
+# one tape block, so data is written exactly one record per write: the tape looks as if tar
+# had written it directly and tar -f <device> (Browse tape, Restore) reads it unchanged.
+TAPE_RECORD_SIZE = 10240
+# Read size when pulling blocks off the tape; must be >= the tape block size (st fails
+# the read with ENOMEM otherwise), so use a generous upper bound.
+TAPE_READ_SIZE = 1 << 20
+# Read size for pipes (tar's archive stream)
+PIPE_READ_SIZE = 256 * 1024
+# Kernel pipe size requested for the archive pipe (default 64 KiB): tar can run this far
+# ahead of the buffer's reader thread, and each read moves up to this much at once
+PIPE_KERNEL_BYTES = 1024 * 1024
+# fcntl.F_SETPIPE_SZ only exists from Python 3.10
+_F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+
+# RAM buffer size bounds (see buffer_bytes), and the fill level (percent) the buffer waits
+# for before it starts (or, after running dry, restarts) writing. BUFFER_MAX_BYTES is ~5 s
+# of LTO-9 at its 400 MB/s native rate, so even a long source-side stall doesn't stop the drive.
+BUFFER_BYTES = 512 * 1024 * 1024
+BUFFER_MAX_BYTES = 2 * 1024 * 1024 * 1024
+BUFFER_MEM_DIVISOR = 4
+START_FILL_PERCENT = 80
+
+
+def buffer_bytes() -> int:
+    """
+    RAM buffer size for a tape copy: a quarter of MemAvailable from /proc/meminfo, between
+    BUFFER_BYTES and BUFFER_MAX_BYTES (BUFFER_BYTES if it can't be read).
+    """
+    try:
+        with open("/proc/meminfo", "rb") as f:
+            for line in f:
+                if line.startswith(b"MemAvailable:"):
+                    available = int(line.split()[1]) * 1024  # kB
+                    break
+            else:
+                return BUFFER_BYTES
+    except (OSError, ValueError, IndexError):
+        return BUFFER_BYTES
+    return max(BUFFER_BYTES, min(BUFFER_MAX_BYTES, available // BUFFER_MEM_DIVISOR))
+
+
+def grow_pipe(fd: int, size: int = PIPE_KERNEL_BYTES) -> None:
+    """Ask the kernel for a size-byte pipe buffer on fd; keeps the default if refused (e.g. pipe-max-size)."""
+    try:
+        fcntl.fcntl(fd, _F_SETPIPE_SZ, size)
+    except OSError:
+        pass
+
+
+def mbuffer_available() -> bool:
+    """Return True if mbuffer is available in PATH."""
+    return shutil.which("mbuffer") is not None
+
+
+def mbuffer_write_cmd(device: str) -> list[str]:
+    """mbuffer command that reads tar's archive on stdin and writes it to device in tar records."""
+    return [
+        "mbuffer", "-q",
+        "-m", "%dM" % (buffer_bytes() // (1024 * 1024)),
+        "-s", str(TAPE_RECORD_SIZE),
+        "-P", str(START_FILL_PERCENT),
+        "-o", device,
+    ]
+
+
+def open_for_write(path: str) -> int:
+    """
+    Open a tape device for writing and return the fd. A path that is not a character
+    device (e.g. a file when testing with skip_rewind) is created/truncated like tar -f does.
+    """
+    try:
+        is_char_device = stat.S_ISCHR(os.stat(path).st_mode)
+    except FileNotFoundError:
+        is_char_device = False
+    if is_char_device:
+        return os.open(path, os.O_WRONLY)
+    return os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+
+
+class StreamBuffer:
+    """
+    Copy src_fd to dst_fd through a bounded RAM buffer on two daemon threads: one reads
+    src_fd into the buffer, the other drains it into dst_fd. The writer waits until the
+    buffer is start_fill_percent full (or the source has ended) before it starts, and again
+    each time it runs dry, so the destination is written in long uninterrupted bursts.
+
+    read_size: bytes per read from src_fd. write_size: if set, data is written in exactly
+    this many bytes per write (one tape record); otherwise in the chunks that were read.
+    capacity: buffer size in bytes, buffer_bytes() by default. start_fill_percent=0 writes
+    whatever has arrived at once: the buffer then only absorbs stalls of the destination.
+    Both fds are owned by the buffer: src_fd is closed when the reader stops (a producer
+    writing into it gets EPIPE instead of blocking), dst_fd when the writer stops (closing a
+    tape fd writes the filemark; closing a pipe gives the consumer EOF).
+    The first OSError from either side is kept in .error and stops both threads.
+    """
+
+    def __init__(
+        self,
+        src_fd: int,
+        dst_fd: int,
+        *,
+        read_size: int,
+        write_size: Optional[int] = None,
+        capacity: Optional[int] = None,
+        start_fill_percent: int = START_FILL_PERCENT,
+    ) -> None:
+        self._src_fd = src_fd
+        self._dst_fd = dst_fd
+        # Reads of whole records pass to the writer without being copied (see _read_loop)
+        if write_size and read_size > write_size:
+            read_size -= read_size % write_size
+        self._read_size = read_size
+        self._write_size = write_size
+        if capacity is None:
+            capacity = buffer_bytes()
+        self._capacity = capacity
+        self._start_level = capacity * start_fill_percent // 100
+        self._chunks: "deque[bytes]" = deque()
+        self._buffered = 0
+        self._eof = False
+        self._aborted = False
+        self._cond = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._read_loop, daemon=True),
+            threading.Thread(target=self._write_loop, daemon=True),
+        ]
+        self.bytes_written = 0
+        self.error: Optional[OSError] = None
+
+    def start(self) -> None:
+        for t in self._threads:
+            t.start()
+
+    def abort(self) -> None:
+        """Stop both threads without writing what is still buffered."""
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for both threads (up to timeout seconds overall). Returns True once both have finished."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for t in self._threads:
+            t.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        return not any(t.is_alive() for t in self._threads)
+
+    def _fail(self, error: OSError) -> None:
+        with self._cond:
+            if self.error is None:
+                self.error = error
+            self._cond.notify_all()
+
+    def _put(self, data: bytes) -> bool:
+        """Queue data, waiting while the buffer is full. Returns False if the copy was stopped."""
+        with self._cond:
+            while self._buffered >= self._capacity and not self._aborted and self.error is None:
+                self._cond.wait()
+            if self._aborted or self.error is not None:
+                return False
+            self._chunks.append(data)
+            self._buffered += len(data)
+            self._cond.notify_all()
+            return True
+
+    def _read_loop(self) -> None:
+        # With write_size set, only whole records are queued; a partial one waits for the next
+        # read. A read of whole records with nothing pending (the usual case) is queued as is.
+        pending = bytearray()
+        try:
+            while True:
+                data = os.read(self._src_fd, self._read_size)
+                if not data:
+                    break
+                if self._write_size and (pending or len(data) % self._write_size):
+                    pending += data
+                    usable = len(pending) - len(pending) % self._write_size
+                    if not usable:
+                        continue
+                    data = bytes(pending[:usable])
+                    del pending[:usable]
+                if not self._put(data):
+                    return
+            if pending:
+                self._put(bytes(pending))
+        except OSError as e:
+            self._fail(e)
+        finally:
+            os.close(self._src_fd)
+            with self._cond:
+                self._eof = True
+                self._cond.notify_all()
+
+    def _write_loop(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    if not self._chunks:
+                        # Start, or ran dry: let the buffer refill before writing again
+                        while not (
+                            self._aborted
+                            or self.error is not None
+                            or self._eof
+                            or (self._chunks and self._buffered >= self._start_level)
+                        ):
+                            self._cond.wait()
+                    if self._aborted or self.error is not None or not self._chunks:
+                        return
+                    data = self._chunks.popleft()
+                    self._buffered -= len(data)
+                    self._cond.notify_all()
+                self._write(data)
+        except OSError as e:
+            self._fail(e)
+        finally:
+            try:
+                os.close(self._dst_fd)
+            except OSError as e:
+                self._fail(e)
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        step = self._write_size or len(view)
+        for offset in range(0, len(view), step):
+            block = view[offset:offset + step]
+            while block:
+                n = os.write(self._dst_fd, block)
+                block = block[n:]
+                self.bytes_written += n
@@ -3,21 +3,28 @@ Query tape capacity via sg3-utils (sg_read_attr or sg_logs).
 Uses maximum (total) capacity only, since the app rewinds and overwrites the whole tape.
 Optional: requires system package sg3-utils.
 """
+import functools
 import os
 import re
 import subprocess
+import threading
+import time
 from typing import Optional
 
+from .spawn import run_captured
+
 # sg_read_attr: "Maximum capacity in partition [MiB]: 18874368"
 _SG_READ_ATTR_MAXIMUM_RE = re.compile(
-    r"Maximum capacity in partition\s*\[MiB\]\s*:\s*(\d+)",
+    rb"Maximum capacity in partition\s*\[MiB\]\s*:\s*(\d+)",
     re.IGNORECASE,
 )
 # sg_logs: "Main partition maximum capacity (in MiB): ..." or similar
 _SG_LOGS_MAXIMUM_RE = re.compile(
-    r"(?:Main partition )?maximum capacity\s*\(?\s*in MiB\)?\s*:?\s*(\d+)",
+    rb"(?:Main partition )?maximum capacity\s*\(?\s*in MiB\)?\s*:?\s*(\d+)",
     re.IGNORECASE,
 )
+# Both patterns only match on lines containing this (compared lowercased)
+_MAXIMUM_CAPACITY = b"maximum capacity"
 
 # Some LTO-9 drives report maximum as ~1/161 of actual (e.g. 120 GB instead of ~18 TB).
 # When reported capacity is in this range, scale by LTO9_MISREPORT_FACTOR to correct.
@@ -25,9 +32,24 @@ LTO9_MISREPORT_MIN_GB = 50
 LTO9_MISREPORT_MAX_GB = 500
 LTO9_MISREPORT_FACTOR = 161
 
+# Capacity results are cached per device while the same kind of cartridge stays loaded.
+# Identity = density code from mt status (the cartridge generation, which is what the
+# maximum capacity depends on); no identity (no tape, unknown mt) means no caching.
+# mt status itself is reused for TAPE_IDENTITY_TTL_SEC.
+TAPE_IDENTITY_TTL_SEC = 1.0
+_MT_DENSITY_RE = re.compile(rb"Density code (0x[0-9a-fA-F]+)")
+
+_CAPACITY_CACHE: dict[str, tuple[Optional[str], int]] = {}
+_identity_cache: dict[str, tuple[float, Optional[str]]] = {}
+_cache_lock = threading.Lock()
+
 
+@functools.lru_cache(maxsize=32)
 def _nst_to_sg(device: str) -> Optional[str]:
-    """Resolve /dev/nst0 to /dev/sgN using sysfs. Returns None if not found."""
+    """
+    Resolve /dev/nst0 to /dev/sgN using sysfs. Returns None if not found.
+    Cached: the mapping only changes on a SCSI rescan (see list_tape_devices(force_refresh=True)).
+    """
     if not device.startswith("/dev/nst"):
         return None
     name = os.path.basename(device)  # e.g. nst0
@@ -48,22 +70,33 @@ def nst_to_sg(device: str) -> Optional[str]:
     return _nst_to_sg(device)
 
 
+def _find_capacity_mib(output: bytes, pattern: "re.Pattern[bytes]") -> Optional[int]:
+    """
+    Return the MiB value from the first line of output that pattern matches. Candidate
+    lines are found with one case-insensitive substring scan; only they go through the regex.
+    """
+    lowered = output.lower()
+    pos = lowered.find(_MAXIMUM_CAPACITY)
+    while pos >= 0:
+        start = output.rfind(b"\n", 0, pos) + 1
+        end = output.find(b"\n", pos)
+        if end < 0:
+            end = len(output)
+        match = pattern.search(output, start, end)
+        if match:
+            return int(match.group(1))
+        pos = lowered.find(_MAXIMUM_CAPACITY, end)
+    return None
+
+
 def _query_sg_read_attr(device: str) -> Optional[int]:
     """Run sg_read_attr and parse maximum capacity in partition [MiB]. Returns bytes or None."""
     try:
-        r = subprocess.run(
-            ["sg_read_attr", device],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+        r = run_captured(["sg_read_attr", device], timeout=10)
         if r.returncode != 0:
             return None
-        match = _SG_READ_ATTR_MAXIMUM_RE.search(r.stdout or "")
-        if match:
-            mib = int(match.group(1))
-            return mib * 1024 * 1024
-        return None
+        mib = _find_capacity_mib(r.stdout, _SG_READ_ATTR_MAXIMUM_RE)
+        return mib * 1024 * 1024 if mib is not None else None
     except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
         return None
 
@@ -71,19 +104,13 @@ def _query_sg_read_attr(device: str) -> Optional[int]:
 def _query_sg_logs(device: str) -> Optional[int]:
     """Run sg_logs -a and parse maximum capacity in partition [MiB]. Returns bytes or None."""
     try:
-        r = subprocess.run(
-            ["sg_logs", "-a", device],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
+        r = run_captured(["sg_logs", "-a", device], timeout=10)
         if r.returncode != 0:
             return None
-        text = (r.stdout or "") + (r.stderr or "")
-        match = _SG_LOGS_MAXIMUM_RE.search(text)
-        if match:
-            mib = int(match.group(1))
-            return mib * 1024 * 1024
+        for output in (r.stdout, r.stderr):
+            mib = _find_capacity_mib(output, _SG_LOGS_MAXIMUM_RE)
+            if mib is not None:
+                return mib * 1024 * 1024
         return None
     except (FileNotFoundError, subprocess.TimeoutExpired, ValueError):
         return None
@@ -97,17 +124,67 @@ def _apply_lto9_misreport_correction(bytes_val: int) -> int:
     return bytes_val
 
 
+def _tape_identity(device: str) -> Optional[str]:
+    """
+    Return the loaded cartridge's density code from mt status (e.g. "0x5c"), or None if
+    no tape is online or the output can't be parsed. Reused for TAPE_IDENTITY_TTL_SEC.
+    """
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _identity_cache.get(device)
+        if cached is not None and now - cached[0] < TAPE_IDENTITY_TTL_SEC:
+            return cached[1]
+    identity = None
+    try:
+        r = run_captured(["mt", "-f", device, "status"], timeout=10)
+        match = _MT_DENSITY_RE.search(r.stdout)
+        if r.returncode == 0 and match and b"ONLINE" in r.stdout:
+            identity = match.group(1).decode().lower()
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass
+    with _cache_lock:
+        _identity_cache[device] = (now, identity)
+    return identity
+
+
+def invalidate_capacity_cache(device: Optional[str] = None) -> None:
+    """Forget cached capacity (and tape identity) for device, or for all devices if None."""
+    with _cache_lock:
+        if device is None:
+            _CAPACITY_CACHE.clear()
+            _identity_cache.clear()
+        else:
+            _CAPACITY_CACHE.pop(device, None)
+            _identity_cache.pop(device, None)
+
+
 def query_remaining_capacity_bytes(device: str) -> Optional[int]:
     """
-    Query tape capacity on the device (e.g. /dev/nst0).
+    Query tape capacity on the device (e.g. /dev/nst0), reusing the last result while
+    the same kind of cartridge is loaded (see _tape_identity).
 
     Returns **maximum (total) capacity** in bytes, not remaining. The backup app
     rewinds and overwrites the whole tape, so the safety check uses total capacity.
-    Uses sg3-utils: sg_logs first, then sg_read_attr. Tries /dev/nst* first,
-    then /dev/sgN if resolved from sysfs.
-
     Returns None if the query fails (tool missing, device doesn't support it, or parse error).
     """
+    identity = _tape_identity(device)
+    if identity is not None:
+        with _cache_lock:
+            cached = _CAPACITY_CACHE.get(device)
+        if cached is not None and cached[0] == identity:
+            return cached[1]
+    result = _query_capacity_bytes(device)
+    if result is not None and identity is not None:
+        with _cache_lock:
+            _CAPACITY_CACHE[device] = (identity, result)
+    return result
+
+
+def _query_capacity_bytes(device: str) -> Optional[int]:
+    """
+    Query maximum capacity with sg3-utils (uncached): sg_logs first, then sg_read_attr.
+    Tries /dev/nst* first, then /dev/sgN if resolved from sysfs. Returns bytes or None.
+    """
     devices_to_try = [device]
     sg_dev = _nst_to_sg(device)
     if sg_dev:
@@ -2,20 +2,102 @@
 Run OS-side diagnostics for a tape device (e.g. who has the sg device open, mounts, dmesg).
 Used when format fails with device busy or on demand via "Tape diagnostics" button.
 """
+import errno
+import os
 import subprocess
-from typing import Callable
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
 
 from .capacity import nst_to_sg
+from .spawn import run_captured
+
+# Kernel log records shown (like dmesg | tail -40)
+DMESG_TAIL_LINES = 40
+
+
+def _run_cmd_lines(args: list, header: str, timeout: int) -> list[str]:
+    """Run one diagnostic command and return the lines to log (output or an error note)."""
+    try:
+        r = run_captured(args, timeout=timeout)
+        out = r.stdout.decode(errors="replace").strip()
+        err = r.stderr.decode(errors="replace").strip()
+        lines = out.splitlines() if out else []
+        if err:
+            lines.extend(err.splitlines())
+        return lines or ["(no output)"]
+    except FileNotFoundError:
+        return ["%s: command not found" % header]
+    except subprocess.TimeoutExpired:
+        return ["%s: timed out after %s s" % (header, timeout)]
+    except Exception as e:
+        return ["%s: %s" % (header, e)]
+
+
+def _read_mounts() -> list[str]:
+    """Return the /proc/mounts lines of FUSE/LTFS mounts (fstype or source mentions fuse/ltfs)."""
+    lines = []
+    try:
+        with open("/proc/mounts", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) > 2 and any("fuse" in p or "ltfs" in p for p in parts[:3]):
+                    lines.append(line.rstrip("\n"))
+    except OSError as e:
+        return ["/proc/mounts: %s" % e]
+    return lines or ["(no output)"]
+
+
+def _tail_dmesg(n: int = DMESG_TAIL_LINES, timeout: int = 5) -> list[str]:
+    """
+    Return the last n kernel log messages, read from /dev/kmsg without blocking
+    (one record per read, until EAGAIN), formatted like dmesg. Falls back to
+    journalctl -k -n <n> when /dev/kmsg can't be read (e.g. dmesg_restrict).
+    """
+    records: deque[str] = deque(maxlen=n)
+    try:
+        fd = os.open("/dev/kmsg", os.O_RDONLY | os.O_NONBLOCK)
+    except OSError:
+        return _run_cmd_lines(["journalctl", "-k", "-n", str(n), "--no-pager"], "journalctl -k", timeout)
+    try:
+        while True:
+            try:
+                record = os.read(fd, 8192)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EPIPE:  # oldest records were overwritten while reading
+                    continue
+                if not records:
+                    return _run_cmd_lines(
+                        ["journalctl", "-k", "-n", str(n), "--no-pager"], "journalctl -k", timeout
+                    )
+                break
+            if not record:
+                break
+            # "<prio>,<seq>,<usec>,<flags>[,...];<message>\n[ continuation lines]"
+            prefix, _, message = record.decode(errors="replace").partition(";")
+            fields = prefix.split(",")
+            usec = int(fields[2]) if len(fields) > 2 and fields[2].isdigit() else 0
+            records.append("[%5d.%06d] %s" % (usec // 1000000, usec % 1000000, message.split("\n", 1)[0]))
+    finally:
+        os.close(fd)
+    return list(records) or ["(no output)"]
 
 
 def run_tape_diagnostics(
     device: str,
     on_log: Callable[[str], None],
     *,
+    on_log_batch: Optional[Callable[[list[str]], None]] = None,
     timeout: int = 5,
 ) -> None:
     """
-    Run fuser, lsof, mount grep, and dmesg for the tape's sg device and log output via on_log.
+    Run fuser and lsof for the tape's sg device, list FUSE/LTFS mounts and the tail of the
+    kernel log, and log output via on_log. The sections are collected concurrently and
+    logged in a fixed order.
+    on_log_batch(lines): if given, receives each section (header and output) as one list
+    instead of on_log receiving it line by line (one GUI event per section).
     If device cannot be resolved to sg, log a message and return. No UI dependency.
     """
     sg = nst_to_sg(device)
@@ -23,35 +105,22 @@ def run_tape_diagnostics(
         on_log("Tape diagnostics: could not resolve tape device to sg (e.g. /dev/sg0).")
         return
 
-    def run_cmd(args: list, description: str = "") -> None:
-        header = description or " ".join(args)
-        on_log("--- %s ---" % header)
-        try:
-            r = subprocess.run(
-                args,
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-            )
-            out = (r.stdout or "").strip()
-            err = (r.stderr or "").strip()
-            if out:
-                for line in out.splitlines():
-                    on_log(line)
-            if err:
-                for line in err.splitlines():
+    sections: list[tuple[str, Callable[[], list[str]]]] = [
+        ("fuser -v %s" % sg, lambda: _run_cmd_lines(["fuser", "-v", sg], "fuser -v %s" % sg, timeout)),
+        ("lsof %s" % sg, lambda: _run_cmd_lines(["lsof", sg], "lsof %s" % sg, timeout)),
+        ("fuse/ltfs mounts (/proc/mounts)", _read_mounts),
+        ("kernel log (last %d)" % DMESG_TAIL_LINES, lambda: _tail_dmesg(DMESG_TAIL_LINES, timeout)),
+    ]
+    # The sections are independent: collect them concurrently (wall time ~ one timeout, not four)
+    # but log their output in the fixed order above so sections don't interleave.
+    with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+        futures = [pool.submit(collect) for _header, collect in sections]
+        for (header, _collect), future in zip(sections, futures):
+            lines = ["--- %s ---" % header]
+            lines.extend(future.result())
+            if on_log_batch:
+                on_log_batch(lines)
+            else:
+                for line in lines:
                     on_log(line)
-            if not out and not err:
-                on_log("(no output)")
-        except FileNotFoundError:
-            on_log("%s: command not found" % header)
-        except subprocess.TimeoutExpired:
-            on_log("%s: timed out after %s s" % (header, timeout))
-        except Exception as e:
-            on_log("%s: %s" % (header, e))
-
-    run_cmd(["fuser", "-v", sg], description="fuser -v %s" % sg)
-    run_cmd(["lsof", sg], description="lsof %s" % sg)
-    run_cmd(["sh", "-c", "mount | grep -E 'ltfs|fuse' || true"], description="mount | grep -E 'ltfs|fuse'")
-    run_cmd(["sh", "-c", "dmesg | tail -40"], description="dmesg | tail -40")
     on_log("--- end tape diagnostics ---")
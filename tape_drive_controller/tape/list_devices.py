@@ -1,13 +1,24 @@
 """
 Discover SCSI tape devices on Linux (/dev/nst*, optionally with lsscsi labels).
 """
-import glob
 import os
+import re
 import stat
 import subprocess
+import threading
+import time
 from dataclasses import dataclass
 from typing import Optional
 
+from .capacity import _nst_to_sg, invalidate_capacity_cache
+from .spawn import forget_tool_paths, run_captured
+
+# lsscsi output is reused for this long unless list_tape_devices(force_refresh=True)
+LSSCSI_CACHE_TTL_SEC = 30.0
+
+_lsscsi_cache: Optional[tuple[float, dict[str, str]]] = None
+_lsscsi_cache_lock = threading.Lock()
+
 
 @dataclass
 class TapeDevice:
@@ -22,52 +33,78 @@ class TapeDevice:
         return self.path
 
 
-def _is_tape_char_device(path: str) -> bool:
+def _scan_nst_devices() -> list[str]:
+    """
+    Return /dev/nstN character devices (mode variants like nst0a are skipped), sorted by N.
+    One scandir pass over /dev; the entry's stat is only fetched for nstN names.
+    """
+    found: list[tuple[int, str]] = []
     try:
-        mode = os.stat(path).st_mode
-        return stat.S_ISCHR(mode)
+        with os.scandir("/dev") as it:
+            for entry in it:
+                name = entry.name
+                if not name.startswith("nst") or not name[3:].isdigit():
+                    continue
+                try:
+                    if stat.S_ISCHR(entry.stat(follow_symlinks=False).st_mode):
+                        found.append((int(name[3:]), entry.path))
+                except OSError:
+                    continue
     except OSError:
-        return False
+        return []
+    return [path for _n, path in sorted(found)]
+
+
+# lsscsi tape line: [2:0:0:0]    tape    HP       Ultrium 2-SCSI   F6CH    /dev/st0
+_LSSCSI_TAPE_LINE = re.compile(rb"^\[\d+:\d+:\d+:\d+\]\s+tape\s+(.+?)\s+/dev/st(\d+)\s*$", re.MULTILINE)
+
+
+def _parse_lsscsi_labels(output: bytes) -> dict[str, str]:
+    """Map /dev/nst* to the vendor/model text of each tape line in lsscsi output."""
+    result: dict[str, str] = {}
+    for m in _LSSCSI_TAPE_LINE.finditer(output):
+        # Everything between "tape" and /dev/ is vendor/model (column padding collapsed)
+        result[f"/dev/nst{m.group(2).decode()}"] = " ".join(m.group(1).decode(errors="replace").split())
+    return result
 
 
 def _get_lsscsi_labels() -> dict[str, str]:
     """Run lsscsi and return mapping from /dev/nst* path to model string (e.g. HP Ultrium 2-SCSI)."""
-    result: dict[str, str] = {}
     try:
-        out = subprocess.run(
-            ["lsscsi"],
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        if out.returncode != 0:
-            return result
-        # Lines like: [2:0:0:0]    tape    HP       Ultrium 2-SCSI   F6CH    /dev/st0
-        for line in out.stdout.splitlines():
-            parts = line.split()
-            if len(parts) >= 4 and "tape" in parts:
-                dev = parts[-1]
-                if dev.startswith("/dev/st") and dev[7:].isdigit():
-                    nst = f"/dev/nst{dev[7:]}"
-                    idx_tape = next((i for i, p in enumerate(parts) if p == "tape"), None)
-                    if idx_tape is not None and idx_tape + 1 < len(parts):
-                        # Everything between "tape" and /dev/ is vendor/model
-                        rest = parts[idx_tape + 1 : -1]
-                        if rest:
-                            result[nst] = " ".join(rest)
+        out = run_captured(["lsscsi"], timeout=5)
     except (FileNotFoundError, subprocess.TimeoutExpired):
-        pass
-    return result
+        return {}
+    if out.returncode != 0:
+        return {}
+    return _parse_lsscsi_labels(out.stdout)
+
+
+def _get_cached_lsscsi_labels(force_refresh: bool = False) -> dict[str, str]:
+    """Return _get_lsscsi_labels(), reusing the last result for LSSCSI_CACHE_TTL_SEC."""
+    global _lsscsi_cache
+    with _lsscsi_cache_lock:
+        now = time.monotonic()
+        if (
+            not force_refresh
+            and _lsscsi_cache is not None
+            and now - _lsscsi_cache[0] < LSSCSI_CACHE_TTL_SEC
+        ):
+            return _lsscsi_cache[1]
+        labels = _get_lsscsi_labels()
+        _lsscsi_cache = (now, labels)
+        return labels
 
 
-def list_tape_devices() -> list[TapeDevice]:
+def list_tape_devices(force_refresh: bool = False) -> list[TapeDevice]:
     """
-    List available tape devices (non-rewind /dev/nst*).
-    Optionally enriches with model name from lsscsi if available.
+    List available tape devices (non-rewind /dev/nstN), in numeric order.
+    Optionally enriches with model name from lsscsi if available (cached for a short time).
+    force_refresh: re-run lsscsi and drop cached nst -> sg mappings, capacities and command
+    paths (e.g. after a SCSI rescan, a cartridge change or installing ltfs).
     """
-    labels = _get_lsscsi_labels()
-    devices: list[TapeDevice] = []
-    for path in sorted(glob.glob("/dev/nst*")):
-        if _is_tape_char_device(path):
-            devices.append(TapeDevice(path=path, label=labels.get(path)))
-    return devices
+    if force_refresh:
+        _nst_to_sg.cache_clear()
+        forget_tool_paths()
+        invalidate_capacity_cache()
+    labels = _get_cached_lsscsi_labels(force_refresh)
+    return [TapeDevice(path=path, label=labels.get(path)) for path in _scan_nst_devices()]
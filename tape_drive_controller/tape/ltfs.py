@@ -3,61 +3,116 @@ LTFS (Linear Tape File System) support: format tape for LTFS using mkltfs,
 mount/tape detection (tape_has_ltfs), and rsync backup to LTFS (run_ltfs_rsync).
 Requires LTFS to be installed (e.g. build from LinearTapeFileSystem/ltfs or use IBM/Quantum packages).
 """
+import errno
 import os
 import re
-import shutil
+import select
+import stat
 import subprocess
 import tempfile
 import threading
 import time
 from typing import Callable, Optional
 
-try:
-    import pty
-except ImportError:
-    pty = None  # type: ignore[assignment]
-
 from .capacity import nst_to_sg
-from .backup import TapeBackupError
+from .size_cache import size_cache
+from .spawn import run_quiet, spawn_argv, which as _have
+from .backup import (
+    CANCEL_POLL_SECONDS,
+    TapeBackupError,
+    _list_dir,
+    _path_size,
+    _size_pool,
+    _throttle_cancel,
+    rewind,
+    seek,
+    tell,
+)
+from .buffer import TAPE_READ_SIZE
 
 
-def _compute_total_size(paths: list[str], timeout: int = 3600) -> int:
-    """Return total byte size of paths (sum of du -sb). Returns 0 on error or if unavailable."""
-    if not paths:
-        return 0
+# Polling this file reports EPOLLPRI | EPOLLERR whenever a mount is added or removed
+_MOUNTINFO = "/proc/self/mountinfo"
+# Poll interval where mount table / process exit events are not available
+MOUNT_POLL_SECONDS = 0.5
+
+
+def _wait_for_mount(mount_point: str, proc: subprocess.Popen, timeout: float) -> bool:
+    """
+    Wait up to timeout seconds for mount_point to become a mount point. Returns True once
+    mounted; False on timeout or as soon as proc (ltfs) has exited without the mount (when
+    it daemonizes, the mount is already in place by the time it exits).
+    Sleeps on the mount table (and a pidfd for proc) with epoll instead of polling. (inotify
+    on the parent directory would not help: mounting creates no directory entry.)
+    """
+    deadline = time.monotonic() + timeout
+    ep = None
+    fds: list[int] = []
+    hangup_fd = None
+    poll_cap: Optional[float] = MOUNT_POLL_SECONDS
     try:
-        r = subprocess.run(
-            ["du", "-sb"] + paths,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-        )
-        if r.returncode != 0:
-            return 0
-        total = 0
-        for line in (r.stdout or "").strip().splitlines():
-            parts = line.split(None, 1)
-            if parts:
-                total += int(parts[0])
-        return total
-    except (FileNotFoundError, ValueError, subprocess.TimeoutExpired):
-        return 0
+        while True:
+            if os.path.ismount(mount_point):
+                return True
+            if proc.poll() is not None:
+                return os.path.ismount(mount_point)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if ep is None:
+                try:
+                    ep = select.epoll()
+                    fds.append(os.open(_MOUNTINFO, os.O_RDONLY))
+                    ep.register(fds[-1], select.EPOLLPRI | select.EPOLLERR)
+                    try:
+                        fds.append(os.pidfd_open(proc.pid))
+                        ep.register(fds[-1], select.EPOLLIN)
+                        poll_cap = None
+                    except (AttributeError, OSError):
+                        # No pidfd (kernel < 5.3): ltfs exiting also hangs up its stderr pipe
+                        # (a daemonizing ltfs detaches the child's stdio). Register for no
+                        # events; epoll always reports the hangup. Otherwise poll for the exit.
+                        if proc.stderr is not None:
+                            hangup_fd = proc.stderr.fileno()
+                            ep.register(hangup_fd, 0)
+                            poll_cap = None
+                except OSError:
+                    ep = False  # no epoll on mountinfo: poll ismount
+                continue  # re-check: the mount may have appeared before epoll was set up
+            wait = remaining if poll_cap is None else min(remaining, poll_cap)
+            if ep:
+                for fd, _events in ep.poll(wait):
+                    if fd == hangup_fd:
+                        # Reported until unregistered; ltfs is exiting, so poll for that
+                        ep.unregister(fd)
+                        hangup_fd = None
+                        poll_cap = MOUNT_POLL_SECONDS
+            else:
+                time.sleep(wait)
+    finally:
+        if ep:
+            ep.close()
+        for fd in fds:
+            os.close(fd)
 
 
 def is_ltfs_available() -> bool:
     """Return True if mkltfs (and optionally mount.ltfs) are available in PATH."""
-    return shutil.which("mkltfs") is not None
+    return _have("mkltfs") is not None
 
 
 def format_ltfs(
     device: str,
     *,
     on_log: Optional[Callable[[str], None]] = None,
+    on_log_batch: Optional[Callable[[list[str]], None]] = None,
     force: bool = False,
 ) -> None:
     """
     Format the tape for LTFS using mkltfs. The device (e.g. /dev/nst0) is resolved to the
     corresponding SCSI generic device (e.g. /dev/sg0) which mkltfs requires.
+    on_log_batch(lines): the same lines as on_log, as one list per read of mkltfs's output
+    (one GUI event instead of one per line).
     Raises TapeBackupError if mkltfs is not installed or format fails.
     """
     if not is_ltfs_available():
@@ -76,23 +131,41 @@ def format_ltfs(
     def log(line: str) -> None:
         if on_log:
             on_log(line)
+        if on_log_batch:
+            on_log_batch([line])
 
     log("Formatting tape for LTFS (device: %s)…" % sg_device)
     cmd = ["mkltfs", "-d", sg_device]
     if force:
         cmd.append("-f")
 
-    proc = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        bufsize=1,
-    )
-    assert proc.stdout is not None
+    # Unbuffered: each read returns whatever mkltfs has written so far, so progress lines
+    # (including \r-terminated ones) reach the log as soon as they are printed. Without
+    # a log callback nobody reads them, so the output goes straight to /dev/null.
+    read_output = bool(on_log or on_log_batch)
+    output = _LineBuffer()
     try:
-        for line in proc.stdout:
-            log(line.rstrip())
+        proc = subprocess.Popen(
+            spawn_argv(cmd),
+            close_fds=False,
+            stdout=subprocess.PIPE if read_output else subprocess.DEVNULL,
+            stderr=subprocess.STDOUT,
+            bufsize=0,
+        )
+        while read_output:
+            chunk = proc.stdout.read(OUTPUT_READ_SIZE)
+            lines = [
+                line.rstrip().decode("utf-8", errors="replace")
+                for line in output.feed(chunk if chunk else b"\n")
+            ]
+            if lines:
+                if on_log:
+                    for line in lines:
+                        on_log(line)
+                if on_log_batch:
+                    on_log_batch(lines)
+            if not chunk:
+                break
         proc.wait()
     except FileNotFoundError:
         raise TapeBackupError(
@@ -105,43 +178,83 @@ def format_ltfs(
 
 def is_ltfs_mount_available() -> bool:
     """Return True if ltfs (mount) and rsync are available in PATH."""
-    return bool(shutil.which("ltfs") and shutil.which("rsync"))
+    return bool(_have("ltfs") and _have("rsync"))
+
+
+# Both LTFS partitions start with an 80-byte ANSI VOL1 label whose implementation
+# identifier (bytes 24-36) is "LTFS" (LTFS Format Specification, Volume Label)
+_VOL1_LABEL = b"VOL1"
+_LTFS_IMPLEMENTATION_ID = b"LTFS"
+
+
+def _ltfs_label_present(device: str, only_at_bot: bool = False) -> Optional[bool]:
+    """
+    Read device's first block and check for the LTFS VOL1 label, then put the tape back where
+    it was (mt tell / mt seek). Returns True/False when a block was read, None if it couldn't
+    be (no tape, blank tape, drive busy, position unknown, ...) so the caller has to find out
+    another way. The tape is not moved at all if its position can't be read, or if
+    only_at_bot is set and it is not at BOT.
+    Raises TapeBackupError if the tape was moved and could not be put back.
+    """
+    try:
+        start = tell(device)
+    except TapeBackupError:
+        return None
+    if start and only_at_bot:
+        return None
+    block = b""
+    try:
+        if start:
+            rewind(device)
+        fd = os.open(device, os.O_RDONLY)
+        try:
+            block = os.read(fd, TAPE_READ_SIZE)
+        finally:
+            os.close(fd)
+    except (TapeBackupError, OSError):
+        pass
+    finally:
+        if start:
+            seek(device, start)
+        else:
+            rewind(device)
+    if not block:
+        return None
+    return block.startswith(_VOL1_LABEL) and block[24:28] == _LTFS_IMPLEMENTATION_ID
 
 
 def tape_has_ltfs(device: str) -> bool:
     """
     Return True if the tape in the drive appears to be LTFS-formatted.
-    Tries to mount the tape with ltfs; if mount succeeds, unmounts and returns True.
+    Reads the tape's first block for the LTFS volume label; only if that can't be read,
+    tries to mount the tape with ltfs (if mount succeeds, unmounts and returns True).
     Returns False if device cannot be resolved to sg, ltfs not in PATH, or mount fails/timeout.
+    Raises TapeBackupError if reading the label moved the tape and it could not be put back.
     """
+    label = _ltfs_label_present(device)
+    if label is not None:
+        return label
     sg_device = nst_to_sg(device)
-    if not sg_device or not shutil.which("ltfs"):
+    if not sg_device or not _have("ltfs"):
         return False
     mount_point = None
     ltfs_proc = None
     try:
         mount_point = tempfile.mkdtemp(prefix="ltfs_detect_")
         ltfs_proc = subprocess.Popen(
-            ["ltfs", "-o", "devname=" + sg_device, mount_point],
+            spawn_argv(["ltfs", "-o", "devname=" + sg_device, mount_point]),
+            close_fds=False,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
-        timeout = 20
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            if ltfs_proc.poll() is not None:
-                # Process may have daemonized; keep waiting for mount to appear
-                if os.path.ismount(mount_point):
-                    break
-            elif os.path.ismount(mount_point):
-                break
-            time.sleep(0.5)
-        if not os.path.ismount(mount_point):
+        if not _wait_for_mount(mount_point, ltfs_proc, timeout=20):
             return False
         # Unmount
         for cmd in (["fusermount", "-u", mount_point], ["umount", mount_point]):
+            if not _have(cmd[0]):
+                continue
             try:
-                subprocess.run(cmd, capture_output=True, timeout=10)
+                run_quiet(cmd, timeout=10)
                 break
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 continue
@@ -157,48 +270,98 @@ def tape_has_ltfs(device: str) -> bool:
                 ltfs_proc.kill()
         if mount_point and os.path.exists(mount_point):
             try:
-                if os.path.ismount(mount_point):
-                    subprocess.run(
-                        ["fusermount", "-u", mount_point],
-                        capture_output=True,
-                        timeout=5,
-                    )
+                if os.path.ismount(mount_point) and _have("fusermount"):
+                    run_quiet(["fusermount", "-u", mount_point], timeout=5)
                 os.rmdir(mount_point)
             except Exception:
                 pass
 
 
 # rsync --info=progress2: "105.45M 13% 602.83kB/s 0:02:50" or "1,234,567  12%" or similar
-_RSYNC_PROGRESS2 = re.compile(r"^\s*([\d.,]+\s*[KMG]?)\s+(\d+)%")
+# Groups: number, unit suffix (may be empty), percentage
+_RSYNC_PROGRESS2 = re.compile(rb"\s*([\d.,]+)\s*([KMG]?)\s+(\d+)%")
+_SIZE_SUFFIX_MULT = {b"": 1, b"K": 1024, b"M": 1024 * 1024, b"G": 1024 * 1024 * 1024}
+# Stripped progress2 lines start with a digit; anything else can skip the regex
+_DIGITS = frozenset(b"0123456789")
+_PERCENT = ord("%")
 
 
-def _parse_rsync_progress2(line: str) -> tuple[Optional[int], Optional[int]]:
-    """Parse rsync progress2 line; return (bytes_approx, percentage) or (None, None)."""
-    line = line.strip().replace("\r", "")
-    m = _RSYNC_PROGRESS2.search(line)
-    if not m:
-        return None, None
-    size_str, pct_str = m.group(1).strip(), m.group(2)
+def _progress2_size(m: "re.Match[bytes]") -> Optional[int]:
+    """Byte count from a _RSYNC_PROGRESS2 match (105.45M, 123, 1,234,567), or None."""
+    number = m.group(1).replace(b",", b"")
+    mult = _SIZE_SUFFIX_MULT[m.group(2)]
     try:
-        pct = int(pct_str)
+        if b"." in number:
+            return int(float(number) * mult)
+        return int(number) * mult
     except ValueError:
+        return None
+
+
+def _match_progress2(line: bytes) -> "Optional[re.Match[bytes]]":
+    """
+    Match a stripped, non-empty line against _RSYNC_PROGRESS2. Lines that do not start with
+    a digit or contain no '%' are rejected without the regex; that includes flist2's
+    "12000 files..." counters, on which the regex backtracks (about 8x slower than the checks).
+    """
+    if line[0] in _DIGITS and _PERCENT in line:
+        return _RSYNC_PROGRESS2.match(line)
+    return None
+
+
+def _parse_rsync_progress2(line: bytes) -> tuple[Optional[int], Optional[int]]:
+    """Parse rsync progress2 line; return (bytes_approx, percentage) or (None, None)."""
+    line = line.lstrip()
+    m = _match_progress2(line) if line else None
+    if not m:
         return None, None
-    # Parse size: 105.45M, 602.83k, 123, 1,234,567
-    size_str = size_str.upper().replace(" ", "").replace(",", "")
-    mult = 1
-    if size_str.endswith("K"):
-        mult = 1024
-        size_str = size_str[:-1]
-    elif size_str.endswith("M"):
-        mult = 1024 * 1024
-        size_str = size_str[:-1]
-    elif size_str.endswith("G"):
-        mult = 1024 * 1024 * 1024
-        size_str = size_str[:-1]
-    try:
-        return int(float(size_str) * mult), pct
-    except ValueError:
-        return None, pct
+    return _progress2_size(m), int(m.group(3))
+
+
+# Consumed output is only cut off the front of a _LineBuffer once there is this much of it
+LINE_BUFFER_COMPACT_BYTES = 64 * 1024
+# Largest read of a child's output pipe (mkltfs, rsync) fed to a _LineBuffer
+OUTPUT_READ_SIZE = 64 * 1024
+
+
+class _LineBuffer:
+    """
+    Accumulates process output and splits off complete lines, ended by \\r or \\n
+    (progress2 updates end in \\r). Every byte is searched for terminators once, even
+    while a long line is still unterminated. Consumed bytes stay in place (a head offset)
+    until LINE_BUFFER_COMPACT_BYTES of them have piled up.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._head = 0  # start of the first incomplete line
+        self._scanned = 0  # everything before this has been searched for terminators
+
+    def feed(self, data: bytes) -> list[bytes]:
+        """Append data and return the lines it completed, skipping empty ones."""
+        buf = self._buf
+        buf += data
+        lines = []
+        head = self._head
+        nl = buf.find(b"\n", self._scanned)
+        cr = buf.find(b"\r", self._scanned)
+        while nl >= 0 or cr >= 0:
+            if cr < 0 or 0 <= nl < cr:
+                end = nl
+                nl = buf.find(b"\n", end + 1)
+            else:
+                end = cr
+                cr = buf.find(b"\r", end + 1)
+            if end > head:
+                lines.append(bytes(buf[head:end]))
+            head = end + 1
+        self._scanned = len(buf)
+        if head > LINE_BUFFER_COMPACT_BYTES:
+            del buf[:head]
+            self._scanned -= head
+            head = 0
+        self._head = head
+        return lines
 
 
 def unmount_leftover_ltfs_mounts(on_log: Optional[Callable[[str], None]] = None) -> int:
@@ -206,26 +369,41 @@ def unmount_leftover_ltfs_mounts(on_log: Optional[Callable[[str], None]] = None)
     Find and unmount any leftover LTFS mounts under /tmp/ltfs_tape_* (e.g. from a crashed run).
     Returns the number of mounts unmounted. Optional on_log is called for each log line.
     """
-    count = 0
+    # A directory in /tmp is a mount point iff it is on another device than /tmp (what
+    # os.path.ismount checks); /tmp is stat'ed once and d_type from scandir filters the rest.
     try:
-        candidates = list(os.path.join("/tmp", d) for d in os.listdir("/tmp") if d.startswith("ltfs_tape_"))
+        tmp_dev = os.stat("/tmp").st_dev
+        with os.scandir("/tmp") as it:
+            candidates = [
+                e.path for e in it
+                if e.name.startswith("ltfs_tape_") and e.is_dir(follow_symlinks=False)
+            ]
     except OSError:
         return 0
+
+    def is_mounted(path: str) -> bool:
+        try:
+            return os.lstat(path).st_dev != tmp_dev
+        except OSError as e:
+            # ltfs died without unmounting: the FUSE mount is still there but dead
+            return e.errno == errno.ENOTCONN
+
+    count = 0
     for path in candidates:
-        if not os.path.isdir(path):
-            continue
-        if not os.path.ismount(path):
+        if not is_mounted(path):
             continue
         if on_log:
             on_log("Unmounting leftover LTFS mount: %s" % path)
         for cmd in (["fusermount", "-u", path], ["umount", path]):
-            if not os.path.ismount(path):
+            if not is_mounted(path):
                 break
+            if not _have(cmd[0]):
+                continue
             try:
-                subprocess.run(cmd, capture_output=True, timeout=10)
+                run_quiet(cmd, timeout=10)
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 continue
-        if not os.path.ismount(path):
+        if not is_mounted(path):
             count += 1
             try:
                 os.rmdir(path)
@@ -234,6 +412,68 @@ def unmount_leftover_ltfs_mounts(on_log: Optional[Callable[[str], None]] = None)
     return count
 
 
+def detect_ltfs(
+    device: str,
+    on_log: Optional[Callable[[str], None]] = None,
+    unmount_leftovers: bool = True,
+    keep_position: bool = False,
+) -> bool:
+    """
+    unmount_leftover_ltfs_mounts() followed by tape_has_ltfs(device), overlapped: the
+    leftover mounts are unmounted on a second thread while the tape's label is read. Only if
+    the label is inconclusive (a leftover mount can keep the drive busy) does detection wait
+    for the unmount and then check again, falling back to a test mount.
+    Returns once both are done, so the drive is free for the caller either way.
+    unmount_leftovers=False is just tape_has_ltfs(device), for callers that already swept.
+    keep_position=True (appending to the tape) never moves the tape: the label is read only
+    when the tape is at BOT, and there is no test mount; anything else returns False.
+    Raises TapeBackupError as tape_has_ltfs does.
+    """
+    if keep_position:
+        if unmount_leftovers:
+            unmount_leftover_ltfs_mounts(on_log)
+        return bool(_ltfs_label_present(device, only_at_bot=True))
+    if not unmount_leftovers:
+        return tape_has_ltfs(device)
+    unmounting = threading.Thread(
+        target=unmount_leftover_ltfs_mounts, args=(on_log,), daemon=True
+    )
+    unmounting.start()
+    try:
+        label = _ltfs_label_present(device)
+    finally:
+        unmounting.join()
+    if label is not None:
+        return label
+    return tape_has_ltfs(device)
+
+
+def _teardown_mount(mount_point: str, known_mounted: bool = False) -> None:
+    """
+    Unmount mount_point (fusermount -u, else umount) and remove the directory.
+    known_mounted: the caller saw the mount come up, so unmount without checking; otherwise
+    one lstat of the directory and its parent decides (same device = not a mount point).
+    """
+    if not known_mounted:
+        try:
+            parent_dev = os.lstat(os.path.dirname(mount_point)).st_dev
+            known_mounted = os.lstat(mount_point).st_dev != parent_dev
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            known_mounted = e.errno == errno.ENOTCONN  # ltfs died without unmounting
+    if known_mounted:
+        cmd = ["fusermount", "-u", mount_point] if _have("fusermount") else ["umount", mount_point]
+        try:
+            run_quiet(cmd, timeout=10)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            pass
+    try:
+        os.rmdir(mount_point)
+    except OSError:
+        pass
+
+
 def unmount_ltfs(
     mount_point: str,
     ltfs_proc: Optional[subprocess.Popen] = None,
@@ -254,8 +494,10 @@ def unmount_ltfs(
     if os.path.ismount(mount_point):
         log("Unmounting LTFS: %s" % mount_point)
         for cmd in (["fusermount", "-u", mount_point], ["umount", mount_point]):
+            if not _have(cmd[0]):
+                continue
             try:
-                subprocess.run(cmd, capture_output=True, timeout=10)
+                run_quiet(cmd, timeout=10)
                 break
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 continue
@@ -284,7 +526,7 @@ def mount_ltfs_only(
     run ltfs -o devname=<sg> <mount_point>, wait for mount, set mount_point_holder[0]
     and append ltfs_proc to process_holder. Raise TapeBackupError on failure.
     """
-    if not shutil.which("ltfs"):
+    if not _have("ltfs"):
         raise TapeBackupError(
             "LTFS (ltfs) not installed. Install LTFS to mount tape as LTFS."
         )
@@ -302,39 +544,34 @@ def mount_ltfs_only(
     mount_point = tempfile.mkdtemp(prefix="ltfs_tape_")
     log("Mounting LTFS at %s" % mount_point)
     ltfs_proc = subprocess.Popen(
-        ["ltfs", "-o", "devname=" + sg_device, mount_point],
+        spawn_argv(["ltfs", "-o", "devname=" + sg_device, mount_point]),
+        close_fds=False,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.PIPE,
         text=True,
     )
     if process_holder is not None:
         process_holder.append(ltfs_proc)
-    timeout = 30
-    deadline = time.monotonic() + timeout
+    mounted = False
     try:
-        while time.monotonic() < deadline:
-            if ltfs_proc.poll() is not None:
-                if os.path.ismount(mount_point):
-                    break
+        mounted = _wait_for_mount(mount_point, ltfs_proc, timeout=30)
+        if not mounted and ltfs_proc.poll() is not None:
+            err = ""
+            if ltfs_proc.stderr:
+                try:
+                    err = ltfs_proc.stderr.read()
+                except (OSError, ValueError):
+                    pass
+            err = (err or "").strip()
+            if err:
+                lines = err.splitlines()
+                if len(lines) > 30:
+                    lines = lines[-30:]
+                err = "\nltfs stderr: " + "\n".join(lines)
+            else:
                 err = ""
-                if ltfs_proc.stderr:
-                    try:
-                        err = ltfs_proc.stderr.read()
-                    except (OSError, ValueError):
-                        pass
-                err = (err or "").strip()
-                if err:
-                    lines = err.splitlines()
-                    if len(lines) > 30:
-                        lines = lines[-30:]
-                    err = "\nltfs stderr: " + "\n".join(lines)
-                else:
-                    err = ""
-                raise TapeBackupError("LTFS mount failed (ltfs exited early)." + err)
-            if os.path.ismount(mount_point):
-                break
-            time.sleep(0.5)
-        if not os.path.ismount(mount_point):
+            raise TapeBackupError("LTFS mount failed (ltfs exited early)." + err)
+        if not mounted:
             ltfs_proc.terminate()
             ltfs_proc.wait(timeout=5)
             err = ""
@@ -349,24 +586,7 @@ def mount_ltfs_only(
             mount_point_holder[0] = mount_point
         log("LTFS mounted at %s" % mount_point)
     except Exception:
-        if mount_point and os.path.exists(mount_point):
-            if os.path.ismount(mount_point):
-                try:
-                    subprocess.run(
-                        ["fusermount", "-u", mount_point],
-                        capture_output=True,
-                        timeout=10,
-                    )
-                except FileNotFoundError:
-                    subprocess.run(
-                        ["umount", mount_point],
-                        capture_output=True,
-                        timeout=10,
-                    )
-            try:
-                os.rmdir(mount_point)
-            except OSError:
-                pass
+        _teardown_mount(mount_point, known_mounted=mounted)
         if ltfs_proc.poll() is None:
             ltfs_proc.terminate()
             try:
@@ -378,6 +598,296 @@ def mount_ltfs_only(
         raise
 
 
+# Longest gap between progress updates during an rsync backup
+PROGRESS_REFRESH_SECONDS = 1.0
+# Shortest gap between progress updates, unless the whole-percent value changed
+PROGRESS_MIN_SECONDS = 0.1
+# Bytes per copy_file_range/sendfile call when copying without rsync; cancel and progress
+# are checked between calls
+LTFS_COPY_CHUNK = 8 * 1024 * 1024
+
+
+class _ProgressThrottle:
+    """
+    Publishes (copied, total_bytes, elapsed) to on_progress_update: on new progress at most
+    every PROGRESS_MIN_SECONDS unless the whole-percent value moved (each update is a
+    GLib.idle_add and a redraw in the UI), and at least every PROGRESS_REFRESH_SECONDS so
+    elapsed time and ETA keep moving while the copy is quiet.
+    """
+
+    def __init__(
+        self,
+        on_progress_update: Optional[Callable[[int, Optional[int], float], None]],
+        total_bytes: Optional[int],
+    ) -> None:
+        self._callback = on_progress_update
+        self._total = total_bytes
+        self._start = time.monotonic()
+        self._last_emit = self._start
+        self._last_percent = 0
+        self._next_refresh = self._start + PROGRESS_REFRESH_SECONDS
+        self._copied = 0
+
+    def update(self, copied: Optional[int]) -> None:
+        """Record copied bytes (None if there is no new progress) and publish if due."""
+        if self._callback is None:
+            return
+        now = time.monotonic()
+        percent = self._last_percent
+        due = now >= self._next_refresh
+        if copied is not None:
+            self._copied = copied
+            if self._total:
+                percent = copied * 100 // self._total
+            if percent != self._last_percent or now - self._last_emit >= PROGRESS_MIN_SECONDS:
+                due = True
+            else:
+                # Held back; published as a refresh once the interval has passed
+                self._next_refresh = min(self._next_refresh, self._last_emit + PROGRESS_MIN_SECONDS)
+        if due:
+            self._callback(self._copied, self._total, now - self._start)
+            self._last_emit = now
+            self._last_percent = percent
+            self._next_refresh = now + PROGRESS_REFRESH_SECONDS
+
+    def finish(self) -> None:
+        """Publish 100% (when the total is known)."""
+        if self._callback and self._total:
+            self._callback(self._total, self._total, time.monotonic() - self._start)
+
+
+def _rsync_to_mount(
+    paths: list[str],
+    mount_point: str,
+    total_bytes: Optional[int],
+    progress: "_ProgressThrottle",
+    cancelled: Callable[[], bool],
+    *,
+    on_progress: Optional[Callable[[str], None]],
+    on_log: Optional[Callable[[str], None]],
+    process_holder: Optional[list],
+) -> None:
+    """
+    rsync paths into mount_point with one rsync (see run_ltfs_rsync). Unless it succeeds,
+    rsync is terminated if still running; its pipe is closed either way.
+    """
+    # --whole-file: every file on the tape is new, so rsync's delta algorithm only costs CPU.
+    # --no-inc-recursive: the whole file list is built first, so progress2's percentage
+    # is of the real total from the start instead of of the files found so far.
+    cmd = [
+        "rsync", "-a", "--partial", "--whole-file", "--no-inc-recursive",
+        "--outbuf=L",
+        "--info=progress2,flist2,stats2",
+    ] + paths + [mount_point + "/"]
+    # progress2/flist2/stats2 go to stdout (line-buffered by --outbuf=L), errors to
+    # stderr; both are read from one pipe.
+    proc = subprocess.Popen(
+        spawn_argv(cmd),
+        close_fds=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        bufsize=0,
+    )
+    output = _LineBuffer()
+    error: Optional[str] = None  # last "rsync: ..." / "rsync error: ..." line
+    seen_progress2 = False  # first progress2 -> set "Copying to tape…"
+    seen_non_progress2 = False  # first other line -> set "Building file list…"
+    try:
+        if process_holder is not None:
+            process_holder.append(proc)
+        if on_log:
+            on_log(" ".join(cmd))
+        while True:
+            if cancelled():
+                raise TapeBackupError("Backup to LTFS cancelled by user")
+            # The timeout bounds how long a cancel waits while rsync is quiet
+            ready, _, _ = select.select([proc.stdout], [], [], CANCEL_POLL_SECONDS)
+            if not ready:
+                progress.update(None)
+                continue
+            chunk = proc.stdout.read(OUTPUT_READ_SIZE)
+            # At EOF a final newline pushes out whatever is left unterminated
+            lines = output.feed(chunk if chunk else b"\n")
+            # Progress lines arrive far faster than anyone can read them. Only the last
+            # one per read is used, so only that one goes through the regex; the others
+            # are told apart by _match_progress2's cheap checks alone (rsync's other
+            # output never starts with a digit and contains a '%').
+            latest = None
+            for segment in lines:
+                seg = segment.strip()
+                if not seg:
+                    continue
+                if seg[0] in _DIGITS and _PERCENT in seg:
+                    latest = seg
+                    if not seen_progress2 and on_progress:
+                        seen_progress2 = True
+                        on_progress("Copying to tape…")
+                else:
+                    if not seen_non_progress2 and on_progress:
+                        seen_non_progress2 = True
+                        on_progress("Building file list…")
+                    if seg.startswith(b"rsync"):
+                        error = seg.decode("utf-8", errors="replace")
+                    if on_log:
+                        on_log(seg.decode("utf-8", errors="replace"))
+            copied = None
+            if latest is not None:
+                m = _RSYNC_PROGRESS2.match(latest)
+                if m:
+                    # The percentage is of everything rsync copies, i.e. of all paths
+                    copied = total_bytes * int(m.group(3)) // 100 if total_bytes else _progress2_size(m)
+                elif on_log:
+                    on_log(latest.decode("utf-8", errors="replace"))
+            progress.update(copied)
+            if not chunk:
+                break
+        proc.wait()
+    finally:
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+        proc.stdout.close()
+    if proc.returncode != 0:
+        detail = ": " + error if error else ""
+        raise TapeBackupError("rsync failed with exit code %s%s" % (proc.returncode, detail))
+
+
+def _copy_attrs(dst: str, st: os.stat_result) -> None:
+    """Give dst the mode and timestamps of st, as far as the file system supports them."""
+    if not stat.S_ISLNK(st.st_mode):
+        try:
+            os.chmod(dst, stat.S_IMODE(st.st_mode))
+        except OSError:
+            pass
+    try:
+        os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns), follow_symlinks=False)
+    except OSError:
+        pass
+
+
+def _copy_to_mount(
+    paths: list[str],
+    mount_point: str,
+    progress: _ProgressThrottle,
+    cancelled: Callable[[], bool],
+    log: Callable[[str], None],
+) -> None:
+    """
+    Copy paths into mount_point without rsync, laid out as rsync -a would: each path becomes
+    mount_point/<basename>, or with a trailing slash its contents go into mount_point. Regular files are copied with copy_file_range, or sendfile where
+    the kernel cannot copy between the two file systems (e.g. into the FUSE mount); symlinks
+    are recreated; files and directories get their source mode and times. A file already on
+    the tape with the same size and mtime is skipped, like rsync's quick check. Everything is
+    written from this thread in walk order: the tape is sequential, so more writers would only
+    interleave files. Entries that cannot be copied are logged and skipped, then reported by a
+    TapeBackupError at the end; a full tape or a cancel raises right away.
+    """
+    copied = 0
+    failures = 0
+    use_copy_file_range = True
+
+    def copy_file(src: str, dst: str) -> None:
+        nonlocal copied, use_copy_file_range
+        src_fd = os.open(src, os.O_RDONLY | os.O_NOFOLLOW)
+        try:
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            try:
+                while True:
+                    if cancelled():
+                        raise TapeBackupError("Backup to LTFS cancelled by user")
+                    if use_copy_file_range:
+                        try:
+                            n = os.copy_file_range(src_fd, dst_fd, LTFS_COPY_CHUNK)
+                        except OSError as e:
+                            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+                                raise
+                            # Both fds keep their offsets, so sendfile carries on where it stopped
+                            use_copy_file_range = False
+                            continue
+                    else:
+                        n = os.sendfile(dst_fd, src_fd, None, LTFS_COPY_CHUNK)
+                    if not n:
+                        break
+                    copied += n
+                    progress.update(copied)
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+
+    def failed(src: str, e: OSError) -> None:
+        nonlocal failures
+        failures += 1
+        log("%s: %s" % (src, e.strerror or e))
+
+    for path in paths:
+        top = path.rstrip("/") or "/"
+        # rsync's rule: "dir/" copies what is in dir, "dir" copies dir itself
+        dst_top = mount_point if path.endswith("/") else os.path.join(mount_point, os.path.basename(top))
+        try:
+            stack = [(top, dst_top, os.lstat(top))]
+        except OSError as e:
+            failed(top, e)
+            continue
+        made_dirs: list[tuple[str, os.stat_result]] = []
+        while stack:
+            src, dst, st = stack.pop()
+            try:
+                if stat.S_ISDIR(st.st_mode):
+                    try:
+                        os.mkdir(dst, 0o700)
+                    except FileExistsError:
+                        pass
+                    made_dirs.append((dst, st))
+                    # Sorted, reversed for the stack: files come off the tape in name order
+                    # An entry that can't be stat'ed is a failure, as rsync reports it (exit 23)
+                    children = sorted(
+                        _list_dir(src, lambda name, e: failed(os.path.join(src, name), e)),
+                        key=lambda c: c[0],
+                        reverse=True,
+                    )
+                    stack.extend((os.path.join(src, name), os.path.join(dst, name), cst) for name, cst in children)
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    try:
+                        dst_st = os.lstat(dst)
+                    except FileNotFoundError:
+                        dst_st = None
+                    if (
+                        dst_st is not None
+                        and dst_st.st_size == st.st_size
+                        and int(dst_st.st_mtime) == int(st.st_mtime)
+                    ):
+                        copied += st.st_size
+                        progress.update(copied)
+                        continue
+                    copy_file(src, dst)
+                elif stat.S_ISLNK(st.st_mode):
+                    target = os.readlink(src)
+                    try:
+                        os.unlink(dst)
+                    except FileNotFoundError:
+                        pass
+                    os.symlink(target, dst)
+                else:
+                    log("Skipped %s (not a regular file, directory or symlink)" % src)
+                    continue
+                _copy_attrs(dst, st)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise TapeBackupError("Tape is full (%s)" % dst)
+                failed(src, e)
+        # Directory times last: creating their entries changed them
+        for dst, st in reversed(made_dirs):
+            _copy_attrs(dst, st)
+    if failures:
+        raise TapeBackupError("%d file(s) could not be copied to LTFS; see the log" % failures)
+
+
 def run_ltfs_rsync(
     device: str,
     paths: list[str],
@@ -388,6 +898,8 @@ def run_ltfs_rsync(
     cancel_check: Optional[Callable[[], bool]] = None,
     process_holder: Optional[list] = None,
     mount_point_holder: Optional[list] = None,
+    use_rsync: bool = True,
+    size_sources: bool = True,
 ) -> None:
     """
     Mount the tape as LTFS, rsync the given paths to the mount, then unmount.
@@ -397,12 +909,16 @@ def run_ltfs_rsync(
     terminate them on exit (e.g. when closing the app).
     If mount_point_holder is provided (e.g. [None]), it is set to the mount path when mounted
     and cleared in finally so the caller can unmount cleanly before terminating (e.g. on close).
+    use_rsync=False copies in-process instead (_copy_to_mount): no rsync needed, and no
+    per-file protocol overhead, which dominates for many small files.
+    size_sources=False skips sizing the sources up front (see _path_size): progress then
+    reports bytes copied without a total or ETA, and the sources are only read by the copy.
     """
-    if not shutil.which("ltfs"):
+    if not _have("ltfs"):
         raise TapeBackupError(
             "LTFS (ltfs) not installed. Install LTFS to use Backup to LTFS (rsync)."
         )
-    if not shutil.which("rsync"):
+    if use_rsync and not _have("rsync"):
         raise TapeBackupError(
             "rsync not found. Install rsync to use Backup to LTFS (rsync)."
         )
@@ -411,10 +927,14 @@ def run_ltfs_rsync(
         raise TapeBackupError(
             "Cannot resolve tape device to SCSI generic device (e.g. /dev/sg0). LTFS requires the sg device."
         )
-    total_bytes = _compute_total_size(paths)
-    if total_bytes == 0:
-        total_bytes = None
+    # Size the sources while leftovers are unmounted and LTFS mounts; the walk and the mount
+    # use different devices. The leftover unmount itself has to finish before ltfs starts,
+    # since a stale mount keeps the drive busy. The sizes only scale the progress bar
+    # (there is no capacity check here), so large trees are sampled rather than walked.
+    size_pool = _size_pool(paths) if size_sources else None
+    size_futures = [size_pool.submit(_path_size, p, sample=True) for p in paths] if size_pool else []
     mount_point = None
+    mounted = False
     ltfs_proc = None
 
     def log(line: str) -> None:
@@ -427,38 +947,32 @@ def run_ltfs_rsync(
         if on_progress:
             on_progress("Mounting LTFS…")
         ltfs_proc = subprocess.Popen(
-            ["ltfs", "-o", "devname=" + sg_device, mount_point],
+            spawn_argv(["ltfs", "-o", "devname=" + sg_device, mount_point]),
+            close_fds=False,
             stdout=subprocess.DEVNULL,
             stderr=subprocess.PIPE,
             text=True,
         )
         if process_holder is not None:
             process_holder.append(ltfs_proc)
-        timeout = 30
-        deadline = time.monotonic() + timeout
-        while time.monotonic() < deadline:
-            if ltfs_proc.poll() is not None:
-                if os.path.ismount(mount_point):
-                    break  # daemonized; mount is valid
+        mounted = _wait_for_mount(mount_point, ltfs_proc, timeout=30)
+        if not mounted and ltfs_proc.poll() is not None:
+            err = ""
+            if ltfs_proc.stderr:
+                try:
+                    err = ltfs_proc.stderr.read()
+                except (OSError, ValueError):
+                    pass
+            err = (err or "").strip()
+            if err:
+                lines = err.splitlines()
+                if len(lines) > 30:
+                    lines = lines[-30:]
+                err = "\nltfs stderr: " + "\n".join(lines)
+            else:
                 err = ""
-                if ltfs_proc.stderr:
-                    try:
-                        err = ltfs_proc.stderr.read()
-                    except (OSError, ValueError):
-                        pass
-                err = (err or "").strip()
-                if err:
-                    lines = err.splitlines()
-                    if len(lines) > 30:
-                        lines = lines[-30:]
-                    err = "\nltfs stderr: " + "\n".join(lines)
-                else:
-                    err = ""
-                raise TapeBackupError("LTFS mount failed (ltfs exited early)." + err)
-            if os.path.ismount(mount_point):
-                break
-            time.sleep(0.5)
-        if not os.path.ismount(mount_point):
+            raise TapeBackupError("LTFS mount failed (ltfs exited early)." + err)
+        if not mounted:
             ltfs_proc.terminate()
             ltfs_proc.wait(timeout=5)
             err = ""
@@ -471,179 +985,38 @@ def run_ltfs_rsync(
             raise TapeBackupError("LTFS mount timed out." + err)
         if mount_point_holder is not None:
             mount_point_holder[0] = mount_point
+        if size_futures:
+            sizes = [f.result()[0] for f in size_futures]
+            size_cache().save()
+        else:
+            sizes = [0] * len(paths)
+        total_bytes = sum(sizes) or None
         if on_progress_update:
             on_progress_update(0, total_bytes, 0.0)
         if on_progress:
             on_progress("Copying to tape…")
-        log("Running rsync to %s" % mount_point)
-        cmd = [
-            "rsync", "-a", "--partial", "--append-verify",
-            "--outbuf=L",
-            "--info=progress2,flist2,stats2",
-        ] + paths + [mount_point + "/"]
-        log(" ".join(cmd))
-        use_pty = pty is not None
-        master_fd = None
-        slave_fd = None
-        try:
-            if use_pty:
-                master_fd, slave_fd = pty.openpty()
-        except OSError:
-            use_pty = False
-            if master_fd is not None:
-                try:
-                    os.close(master_fd)
-                except OSError:
-                    pass
-                master_fd = None
-            slave_fd = None
-
-        if use_pty and master_fd is not None:
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=slave_fd,
+        progress = _ProgressThrottle(on_progress_update, total_bytes)
+        # Also bounds how long a cancel can wait while rsync is quiet (the select timeout)
+        cancelled = _throttle_cancel(cancel_check)
+        if use_rsync:
+            log("Running rsync to %s" % mount_point)
+            _rsync_to_mount(
+                paths, mount_point, total_bytes, progress, cancelled,
+                on_progress=on_progress, on_log=on_log, process_holder=process_holder,
             )
-            try:
-                os.close(slave_fd)
-            except OSError:
-                pass
-            slave_fd = -1
         else:
-            if master_fd is not None:
-                try:
-                    os.close(master_fd)
-                except OSError:
-                    pass
-            proc = subprocess.Popen(
-                cmd,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-            )
-
-        if process_holder is not None:
-            process_holder.append(proc)
-        start_time = time.monotonic()
-        bytes_ref = [0]  # mutable so timer thread and read loop can share
-        seen_progress2 = [False]  # first progress2 -> set "Copying to tape…"
-        seen_non_progress2 = [False]  # first other line -> set "Building file list…"
-        stop_timer = threading.Event()
-
-        def timer_tick():
-            while not stop_timer.wait(1.0):
-                if proc.poll() is not None:
-                    return
-                elapsed = time.monotonic() - start_time
-                if mount_point:
-                    dest_size = _compute_total_size([mount_point], timeout=10)
-                    if dest_size > 0:
-                        bytes_ref[0] = max(bytes_ref[0], dest_size)
-                    if total_bytes and total_bytes > 0:
-                        bytes_ref[0] = min(bytes_ref[0], total_bytes)
-                if on_progress_update:
-                    on_progress_update(bytes_ref[0], total_bytes, elapsed)
-
-        timer_thread = threading.Thread(target=timer_tick, daemon=True)
-        timer_thread.start()
-        try:
-            stderr_buffer = ""
-            chunk_size = 4096
-            while True:
-                if cancel_check and cancel_check():
-                    proc.terminate()
-                    proc.wait(timeout=10)
-                    raise TapeBackupError("Backup to LTFS cancelled by user")
-                if use_pty and master_fd is not None:
-                    try:
-                        chunk_bytes = os.read(master_fd, chunk_size)
-                    except OSError:
-                        chunk_bytes = b""
-                    chunk = chunk_bytes.decode("utf-8", errors="replace") if chunk_bytes else ""
-                else:
-                    chunk = proc.stderr.read(chunk_size) if proc.stderr else ""
-                if chunk:
-                    stderr_buffer += chunk
-                parts = re.split(r"[\r\n]+", stderr_buffer)
-                if chunk or proc.poll() is not None:
-                    stderr_buffer = parts.pop() if parts else ""
-                else:
-                    continue
-                for segment in parts:
-                    seg = segment.strip()
-                    if not seg:
-                        continue
-                    parsed_bytes, pct = _parse_rsync_progress2(segment)
-                    elapsed = time.monotonic() - start_time
-                    if pct is not None or parsed_bytes is not None:
-                        if not seen_progress2[0] and on_progress:
-                            seen_progress2[0] = True
-                            on_progress("Copying to tape…")
-                        if pct is not None and total_bytes and total_bytes > 0:
-                            bytes_ref[0] = int(total_bytes * pct / 100)
-                        elif parsed_bytes is not None:
-                            bytes_ref[0] = parsed_bytes
-                        if on_progress_update:
-                            on_progress_update(bytes_ref[0], total_bytes, elapsed)
-                    else:
-                        if not seen_non_progress2[0] and on_progress:
-                            seen_non_progress2[0] = True
-                            on_progress("Building file list…")
-                        if on_log:
-                            log(seg)
-                if not chunk and proc.poll() is not None:
-                    if stderr_buffer.strip():
-                        parsed_bytes, pct = _parse_rsync_progress2(stderr_buffer)
-                        if pct is not None or parsed_bytes is not None:
-                            if pct is not None and total_bytes and total_bytes > 0:
-                                bytes_ref[0] = int(total_bytes * pct / 100)
-                            elif parsed_bytes is not None:
-                                bytes_ref[0] = parsed_bytes
-                            if on_progress_update:
-                                on_progress_update(
-                                    bytes_ref[0], total_bytes,
-                                    time.monotonic() - start_time,
-                                )
-                        elif on_log:
-                            log(stderr_buffer.strip())
-                    break
-            proc.wait()
-        finally:
-            stop_timer.set()
-            timer_thread.join(timeout=2.0)
-            if master_fd is not None:
-                try:
-                    os.close(master_fd)
-                except OSError:
-                    pass
-        if proc.returncode != 0:
-            raise TapeBackupError("rsync failed with exit code %s" % proc.returncode)
-        if on_progress_update and total_bytes:
-            on_progress_update(total_bytes, total_bytes, time.monotonic() - start_time)
+            log("Copying to %s" % mount_point)
+            _copy_to_mount(paths, mount_point, progress, cancelled, log)
+        progress.finish()
         if on_progress:
             on_progress("Backup to LTFS completed.")
     finally:
+        if size_pool:
+            size_pool.shutdown(wait=False, cancel_futures=True)
         if mount_point_holder is not None:
             mount_point_holder[0] = None
-        if mount_point and os.path.exists(mount_point):
-            if os.path.ismount(mount_point):
-                try:
-                    subprocess.run(
-                        ["fusermount", "-u", mount_point],
-                        capture_output=True,
-                        timeout=10,
-                    )
-                except FileNotFoundError:
-                    subprocess.run(
-                        ["umount", mount_point],
-                        capture_output=True,
-                        timeout=10,
-                    )
-            try:
-                os.rmdir(mount_point)
-            except OSError:
-                pass
+        if mount_point:
+            _teardown_mount(mount_point, known_mounted=mounted)
         if ltfs_proc and ltfs_proc.poll() is None:
             ltfs_proc.terminate()
             try:
@@ -0,0 +1,100 @@
+"""
+On-disk cache of directory listings for sizing backup sources (like duc's index): for each
+directory, its mtime/inode and the bytes and subdirectories found in it the last time it
+was listed. A directory whose mtime and inode are unchanged is not listed again.
+A file that changed size in place does not touch its directory's mtime, so sizes from the
+cache are estimates: fine for a progress bar, not for a capacity check.
+"""
+import json
+import os
+import threading
+from typing import Optional
+
+# Directory entries kept in the cache file; entries not used in the current session are
+# dropped first when there are more.
+SIZE_CACHE_MAX_ENTRIES = 200_000
+_CACHE_VERSION = 1
+
+
+def _default_path() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tape-drive-controller", "sizes.json")
+
+
+class _SizeCache:
+    """
+    Map of directory path -> (st_mtime_ns, st_ino, bytes, subdirectory names), where bytes is
+    the apparent size of the entries directly in the directory (files, links, subdirectory
+    inodes). Loaded lazily from path; thread-safe, since sources are sized in parallel.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._entries: Optional[dict[str, list]] = None
+        self._used: set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, list]:
+        if self._entries is None:
+            try:
+                with open(self._path, encoding="utf-8") as f:
+                    data = json.load(f)
+                entries = data["entries"] if data.get("version") == _CACHE_VERSION else {}
+            except (OSError, ValueError, KeyError, AttributeError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def lookup(self, path: str, st: os.stat_result) -> Optional[tuple[int, list[str]]]:
+        """Return (bytes, subdirectory names) recorded for path if st shows it unchanged, else None."""
+        with self._lock:
+            entry = self._load().get(path)
+            if entry is None or entry[0] != st.st_mtime_ns or entry[1] != st.st_ino:
+                return None
+            self._used.add(path)
+            return entry[2], entry[3]
+
+    def store(self, path: str, st: os.stat_result, nbytes: int, subdirs: list[str]) -> None:
+        """Record a fresh listing of path; st must be from before the listing was taken."""
+        with self._lock:
+            self._load()[path] = [st.st_mtime_ns, st.st_ino, nbytes, subdirs]
+            self._used.add(path)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the cache back if anything was stored (atomically; errors are ignored)."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            entries = self._entries
+            if len(entries) > SIZE_CACHE_MAX_ENTRIES:
+                keep = [p for p in entries if p in self._used][:SIZE_CACHE_MAX_ENTRIES]
+                rest = SIZE_CACHE_MAX_ENTRIES - len(keep)
+                keep += [p for p in entries if p not in self._used][:rest]
+                entries = self._entries = {p: entries[p] for p in keep}
+            tmp = "%s.%d.tmp" % (self._path, os.getpid())
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"version": _CACHE_VERSION, "entries": entries}, f, separators=(",", ":"))
+                os.replace(tmp, self._path)
+                self._dirty = False
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+
+_size_cache: Optional[_SizeCache] = None
+_size_cache_lock = threading.Lock()
+
+
+def size_cache() -> _SizeCache:
+    """The process-wide cache, stored under $XDG_CACHE_HOME (default ~/.cache)."""
+    global _size_cache
+    with _size_cache_lock:
+        if _size_cache is None:
+            _size_cache = _SizeCache(_default_path())
+        return _size_cache
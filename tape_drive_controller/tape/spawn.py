@@ -0,0 +1,57 @@
+"""
+Start short-lived helper commands (mt, sg_logs, lsscsi, fuser, ...) without forking the
+whole process. subprocess only takes its posix_spawn (vfork) path when, among other
+conditions, the executable has a directory part and close_fds is False; otherwise it
+fork()s, which copies the page tables of this (large, GTK) process on every call.
+close_fds=False is safe here: Python creates its own fds non-inheritable (PEP 446).
+"""
+import functools
+import shutil
+import subprocess
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=None)
+def which(name: str) -> Optional[str]:
+    """shutil.which(name), cached until forget_tool_paths() (each lookup stats every PATH entry)."""
+    return shutil.which(name)
+
+
+def forget_tool_paths() -> None:
+    """Drop cached command paths, e.g. after the user installed a missing tool and rescans."""
+    which.cache_clear()
+
+
+def spawn_argv(args: list[str]) -> list[str]:
+    """
+    args with the command replaced by its absolute path, so Popen can use posix_spawn.
+    A command not in PATH is left unchanged (Popen then searches/raises).
+    """
+    return [which(args[0]) or args[0]] + list(args[1:])
+
+
+def run_captured(args: list[str], timeout: float) -> subprocess.CompletedProcess:
+    """
+    subprocess.run(args, capture_output=True, timeout=timeout) on the posix_spawn path.
+    stdout/stderr are bytes; raises FileNotFoundError / TimeoutExpired like subprocess.run.
+    """
+    return subprocess.run(
+        spawn_argv(args),
+        capture_output=True,
+        timeout=timeout,
+        close_fds=False,
+    )
+
+
+def run_quiet(args: list[str], timeout: float) -> subprocess.CompletedProcess:
+    """
+    Like run_captured, for commands whose output is never looked at (umount, fusermount):
+    stdout/stderr go to /dev/null, so no pipes are created or read.
+    """
+    return subprocess.run(
+        spawn_argv(args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        timeout=timeout,
+        close_fds=False,
+    )
@@ -1,7 +1,10 @@
 """GTK 3 application: main window with device selector, directory list, backup controls, and log."""
+import queue
 import subprocess
 import sys
 import threading
+import time
+from collections import deque
 from typing import Optional
 
 import gi
@@ -20,11 +23,12 @@ from ..tape.backup import (
 )
 from ..tape.capacity import query_remaining_capacity_bytes
 from ..tape.diagnostics import run_tape_diagnostics
+from ..tape.spawn import run_quiet
 from ..tape.ltfs import (
     format_ltfs,
     is_ltfs_available,
     is_ltfs_mount_available,
-    tape_has_ltfs,
+    detect_ltfs,
     run_ltfs_rsync,
     mount_ltfs_only,
     unmount_ltfs,
@@ -43,51 +47,176 @@ def _on_activate(app: Gtk.Application) -> None:
     win.show_all()
 
 
+_BYTE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+_BYTE_DIVISORS = tuple(1024 ** i for i in range(len(_BYTE_UNITS)))
+
+
 def _format_bytes(num_bytes: int) -> str:
     """Format byte count as human-readable (e.g. 1.23 GB)."""
-    for unit in ("B", "KB", "MB", "GB", "TB"):
-        if num_bytes < 1024:
-            return f"{num_bytes:.2f} {unit}" if unit != "B" else f"{num_bytes} B"
-        num_bytes /= 1024
-    return f"{num_bytes:.2f} PB"
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    # Unit from the bit length: each unit is 2**10 times the previous one
+    i = (num_bytes.bit_length() - 1) // 10
+    if i > 5:
+        i = 5
+    return f"{num_bytes / _BYTE_DIVISORS[i]:.2f} {_BYTE_UNITS[i]}"
 
 
 def _format_elapsed(sec: float) -> str:
     """Format seconds as e.g. 5m 23s or 1h 2m 3s."""
+    sec = int(sec)
     if sec < 60:
-        return f"{int(sec)}s"
-    if sec < 3600:
-        return f"{int(sec // 60)}m {int(sec % 60)}s"
-    return f"{int(sec // 3600)}h {int((sec % 3600) // 60)}m {int(sec % 60)}s"
+        return f"{sec}s"
+    m, s = divmod(sec, 60)
+    if m < 60:
+        return f"{m}m {s}s"
+    h, m = divmod(m, 60)
+    return f"{h}h {m}m {s}s"
 
 
 LOG_MAX_LINES = 500
+# Shortest interval between progress bar redraws; samples in between are dropped
+PROGRESS_UI_SECONDS = 0.1
 DEFAULT_TAPE_CAPACITY_GB = 18000  # LTO-9 native; ensures backup fits on one standard tape
+# Threads shared by short background tasks (diagnostics, LTFS checks)
+UI_TASK_THREADS = 4
+# Longest wait for each unmount command when the window is closed with LTFS mounted
+SHUTDOWN_UNMOUNT_SECONDS = 5
+# MainWindow attributes holding the _Task of a running operation (None when idle)
+_OPERATION_THREADS = (
+    "_backup_thread",
+    "_restore_thread",
+    "_erase_thread",
+    "_format_ltfs_thread",
+    "_browse_thread",
+    "_ltfs_rsync_thread",
+    "_ltfs_mount_thread",
+)
+# Operations the Cancel button stops: task attribute -> attribute of its cancel Event
+_CANCEL_EVENTS = {
+    "_backup_thread": "_cancel_requested",
+    "_restore_thread": "_cancel_restore_requested",
+    "_ltfs_rsync_thread": "_cancel_ltfs_rsync_requested",
+}
+
+
+class _Task:
+    """A function submitted to _TaskRunner; is_alive() and join() work like a Thread's."""
+
+    def __init__(self, fn, args: tuple) -> None:
+        self.fn = fn
+        self.args = args
+        self._done = threading.Event()
+
+    def is_alive(self) -> bool:
+        return not self._done.is_set()
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        self._done.wait(timeout)
+
+
+class _TaskRunner:
+    """
+    Runs background work on reused daemon threads, started as needed. Short tasks
+    (diagnostics, LTFS checks) use up to `threads` of them and queue beyond that; operations
+    (submit_operation: backup, restore, rsync, ...) always get a thread at once, so one is
+    never left waiting behind a slow check with its Cancel button lit.
+    Unlike ThreadPoolExecutor's workers these are daemon threads, so closing the app never
+    waits for a tape command that is still running.
+    """
+
+    def __init__(self, threads: int = UI_TASK_THREADS) -> None:
+        self._tasks: "queue.Queue" = queue.Queue()
+        self._max_threads = threads
+        self._threads = 0
+        self._idle = 0  # threads waiting for a task that no queued task has claimed yet
+        self._backlog = 0  # queued tasks that no thread has claimed yet
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args) -> _Task:
+        return self._submit(_Task(fn, args), operation=False)
+
+    def submit_operation(self, fn, *args) -> _Task:
+        """submit, but on an idle or new thread even when all `threads` are busy."""
+        return self._submit(_Task(fn, args), operation=True)
+
+    def _submit(self, task: _Task, operation: bool) -> _Task:
+        # Each queued task is claimed under the lock, by an idle thread or as backlog, so two
+        # submits in a row can't both count on the same idle thread
+        with self._lock:
+            if self._idle:
+                self._idle -= 1
+                self._tasks.put(task)
+                return task
+            if self._threads >= self._max_threads and not operation:
+                self._backlog += 1
+                self._tasks.put(task)
+                return task
+            self._threads += 1
+        threading.Thread(
+            target=self._work, args=(task,), name="tape-ui-%d" % self._threads, daemon=True
+        ).start()
+        return task
+
+    def _work(self, task: _Task) -> None:
+        while True:
+            try:
+                task.fn(*task.args)
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+            finally:
+                task._done.set()
+            with self._lock:
+                if self._backlog:
+                    self._backlog -= 1
+                else:
+                    self._idle += 1
+            task = self._tasks.get()
 
 
 class MainWindow(Gtk.ApplicationWindow):
     def __init__(self, **kwargs) -> None:
         super().__init__(title="Tape Backup", default_width=700, default_height=500, **kwargs)
 
-        self._cancel_requested = False
-        self._cancel_restore_requested = False
+        # Set by Cancel; workers get .is_set as their cancel_check
+        self._cancel_requested = threading.Event()
+        self._cancel_restore_requested = threading.Event()
         self._backup_thread = None
         self._restore_thread = None
         self._erase_thread = None
         self._format_ltfs_thread = None
         self._browse_thread = None
-        self._cancel_browse_requested = False
+        self._cancel_browse_requested = threading.Event()
         self._ltfs_rsync_thread = None
-        self._cancel_ltfs_rsync_requested = False
+        self._cancel_ltfs_rsync_requested = threading.Event()
         self._ltfs_rsync_process_holder: list = []  # [ltfs_proc, rsync_proc] when backup; [ltfs_proc] when standalone mount
         self._ltfs_mount_point_holder: list = [None]  # current LTFS mount path when mounted (backup or standalone)
         self._ltfs_standalone_mount = False  # True when mount was created by "Mount LTFS" (so Unmount is offered)
         self._ltfs_mode = False
         self._ltfs_mount_thread = None  # thread for standalone Mount LTFS
         self._ltfs_startup_check_pending = True
+        self._ltfs_leftovers_swept = False  # set by the first LTFS check; cleared by Refresh
+        self._device_changed_handler: Optional[int] = None  # connected once the window is built
         self._restore_destination: Optional[str] = None
         self._progress_is_restore = False
         self._device_list = []
+        # Log lines from any thread; drained into the TextView by one idle callback at a time
+        self._log_queue: deque = deque()
+        self._log_lock = threading.Lock()
+        self._log_drain_scheduled = False
+        self._log_lines = 0  # complete lines in the log buffer
+        self._tasks = _TaskRunner()
+        # Latest progress sample from the worker thread, drawn by _apply_progress. A one-slot
+        # deque: append replaces the sample and popleft takes it, each atomic without a lock.
+        self._progress_slot: "deque[tuple]" = deque(maxlen=1)
+        self._progress_scheduled = False
+        self._progress_lock = threading.Lock()  # guards the progress text
+        self._progress_shown_at = 0.0
+        self._progress_text: Optional[str] = None
+        self._progress_text_scheduled = False
+        self._pulse_source: Optional[int] = None  # timeout animating the bar while no total is known
+        self._sensitivity: dict = {}  # widget -> sensitivity last set by _apply_start_sensitivity
+        self._sensitivity_scheduled = False
 
         box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         box.set_margin_start(12)
@@ -135,12 +264,7 @@ class MainWindow(Gtk.ApplicationWindow):
         )
         self._erase_btn.connect("clicked", self._on_erase)
         self._format_ltfs_btn = Gtk.Button(label="Format for LTFS")
-        _fmt_tt = "Format the tape for LTFS so it can be mounted as a filesystem."
-        if not is_ltfs_available():
-            _fmt_tt += " LTFS is not installed (build from source or use IBM/Quantum packages)."
-        else:
-            _fmt_tt += " Requires LTFS to be installed."
-        self._format_ltfs_btn.set_tooltip_text(_fmt_tt)
+        self._update_format_ltfs_tooltip()
         self._format_ltfs_btn.connect("clicked", self._on_format_ltfs)
         prep_row.pack_start(self._rewind_btn, False, False, 0)
         prep_row.pack_start(self._erase_btn, False, False, 0)
@@ -150,14 +274,11 @@ class MainWindow(Gtk.ApplicationWindow):
         # Directories to backup
         dir_label = Gtk.Label(label="Directories to backup:", xalign=0)
         box.pack_start(dir_label, False, False, 0)
-        self._dir_store = Gtk.ListStore(str)
-        dir_tree = Gtk.TreeView(model=self._dir_store)
-        col = Gtk.TreeViewColumn("Path", Gtk.CellRendererText(), text=0)
-        dir_tree.append_column(col)
-        dir_tree.set_headers_visible(False)
-        dir_tree.set_headers_clickable(False)
+        # One label per path; _dir_paths holds the paths in row order
+        self._dir_paths: list[str] = []
+        self._dir_list = Gtk.ListBox(selection_mode=Gtk.SelectionMode.SINGLE)
         dir_sw = Gtk.ScrolledWindow(min_content_height=80)
-        dir_sw.add(dir_tree)
+        dir_sw.add(self._dir_list)
         box.pack_start(dir_sw, True, True, 0)
         dir_buttons = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
         add_btn = Gtk.Button(label="Add directory…")
@@ -220,41 +341,18 @@ class MainWindow(Gtk.ApplicationWindow):
             "For LTFS-formatted tapes: mount tape and rsync added directories. Tape must be formatted for LTFS first. Requires ltfs and rsync."
         )
         self._ltfs_rsync_btn.connect("clicked", self._on_start_ltfs_rsync)
-        self._exit_ltfs_mode_btn = Gtk.Button(label="Exit LTFS mode")
-        self._exit_ltfs_mode_btn.set_tooltip_text(
-            "Leave LTFS mode and re-enable tape preparation and raw backup."
-        )
-        self._exit_ltfs_mode_btn.connect("clicked", self._on_exit_ltfs_mode)
-        self._mount_ltfs_btn = Gtk.Button(label="Mount LTFS")
-        self._mount_ltfs_btn.set_tooltip_text(
-            "Mount the selected tape as LTFS so you can browse or copy files. No backup is run."
-        )
-        self._mount_ltfs_btn.connect("clicked", self._on_mount_ltfs)
-        self._unmount_ltfs_btn = Gtk.Button(label="Unmount LTFS")
-        self._unmount_ltfs_btn.set_tooltip_text(
-            "Unmount the current LTFS mount (only when you mounted via Mount LTFS, not during backup)."
-        )
-        self._unmount_ltfs_btn.connect("clicked", self._on_unmount_ltfs)
-        self._browse_ltfs_btn = Gtk.Button(label="Browse mount")
-        self._browse_ltfs_btn.set_tooltip_text(
-            "Open the file manager at the current LTFS mount point."
-        )
-        self._browse_ltfs_btn.connect("clicked", self._on_browse_ltfs)
         btn_row.pack_start(self._start_btn, False, False, 0)
         btn_row.pack_start(self._cancel_btn, False, False, 0)
         btn_row.pack_start(self._status_btn, False, False, 0)
         btn_row.pack_start(self._browse_btn, False, False, 0)
         btn_row.pack_start(self._ltfs_rsync_btn, False, False, 0)
         box.pack_start(btn_row, False, False, 0)
-        ltfs_mode_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
-        ltfs_mode_row.pack_start(Gtk.Label(label="LTFS mode:", xalign=0), False, False, 0)
-        ltfs_mode_row.pack_start(self._mount_ltfs_btn, False, False, 0)
-        ltfs_mode_row.pack_start(self._unmount_ltfs_btn, False, False, 0)
-        ltfs_mode_row.pack_start(self._browse_ltfs_btn, False, False, 0)
-        ltfs_mode_row.pack_start(self._exit_ltfs_mode_btn, False, False, 0)
-        self._ltfs_mode_row = ltfs_mode_row
-        box.pack_start(ltfs_mode_row, False, False, 0)
-        ltfs_mode_row.hide()
+        # The LTFS mode row is built on first use (_ensure_ltfs_mode_row); most sessions never
+        # enter LTFS mode. This box keeps its place in the layout and is shown in LTFS mode.
+        self._ltfs_mode_slot = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
+        self._ltfs_mode_slot.set_no_show_all(True)
+        self._ltfs_mode_row: Optional[Gtk.Box] = None
+        box.pack_start(self._ltfs_mode_slot, False, False, 0)
 
         # Restore
         restore_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
@@ -286,11 +384,8 @@ class MainWindow(Gtk.ApplicationWindow):
         log_sw.add(self._log_view)
         box.pack_start(log_sw, True, True, 0)
 
-        self._dir_tree = dir_tree
         self._update_start_sensitivity()
-        self._device_combo.connect("changed", self._on_device_changed)
-        self._dir_store.connect("row-deleted", lambda *a: self._update_start_sensitivity())
-        self._dir_store.connect("row-inserted", lambda *a: self._update_start_sensitivity())
+        self._device_changed_handler = self._device_combo.connect("changed", self._on_device_changed)
         self.connect("destroy", self._on_destroy)
         GLib.idle_add(self._maybe_check_ltfs_after_show)
 
@@ -313,23 +408,39 @@ class MainWindow(Gtk.ApplicationWindow):
         self._main_box.set_sensitive(False)
         self.add(overlay)
 
-    def _refresh_devices(self) -> None:
-        self._device_list = list_tape_devices()
-        self._device_store.clear()
-        if self._device_list:
-            for d in self._device_list:
-                self._device_store.append([d.display_name()])
+    def _refresh_devices(self, force_refresh: bool = False) -> bool:
+        """
+        Rescan tape devices. The combo is rebuilt (and the first device selected) only if the
+        list changed; returns whether it did. Otherwise the store and selection are left alone.
+        """
+        self._device_list = list_tape_devices(force_refresh=force_refresh)
+        names = [d.display_name() for d in self._device_list] or ["No tape device found"]
+        changed = names != [row[0] for row in self._device_store]
+        if changed:
+            # Clearing the store deselects (a "changed" emission for no device); only the
+            # final set_active should reach _on_device_changed
+            if self._device_changed_handler is not None:
+                self._device_combo.handler_block(self._device_changed_handler)
+            try:
+                self._device_store.clear()
+                for name in names:
+                    self._device_store.append([name])
+            finally:
+                if self._device_changed_handler is not None:
+                    self._device_combo.handler_unblock(self._device_changed_handler)
             self._device_combo.set_active(0)
-        else:
-            self._device_store.append(["No tape device found"])
+        elif self._device_combo.get_active() < 0:
             self._device_combo.set_active(0)
+        if not self._device_list:
             self._log(
                 "Tip: Load SCSI tape driver: sudo modprobe st. "
                 "Then rescan: echo \"- - -\" | sudo tee /sys/class/scsi_host/host*/scan. "
                 "Check: ls -l /dev/nst* and dmesg | tail -30"
             )
+        self._selected_device_path = self._read_selected_device_path()
+        return changed
 
-    def _get_selected_device_path(self):
+    def _read_selected_device_path(self):
         if not self._device_list:
             return None
         idx = self._device_combo.get_active()
@@ -337,22 +448,49 @@ class MainWindow(Gtk.ApplicationWindow):
             return None
         return self._device_list[idx].path
 
+    def _update_format_ltfs_tooltip(self) -> None:
+        tooltip = "Format the tape for LTFS so it can be mounted as a filesystem."
+        if not is_ltfs_available():
+            tooltip += " LTFS is not installed (build from source or use IBM/Quantum packages)."
+        else:
+            tooltip += " Requires LTFS to be installed."
+        self._format_ltfs_btn.set_tooltip_text(tooltip)
+
     def _on_refresh_devices(self, _btn):
-        self._refresh_devices()
+        # Also forgets cached tool paths, so LTFS/rsync installed since startup are found
+        self._ltfs_leftovers_swept = False
+        if not self._refresh_devices(force_refresh=True):
+            # Same devices, so no "changed" signal: check the (possibly swapped) tape here
+            self._run_ltfs_check_if_needed()
+        self._update_format_ltfs_tooltip()
         self._update_start_sensitivity()
 
     def _on_tape_diagnostics(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
         self._log("=== Tape diagnostics (selected device: %s) ===" % device)
         def run_diag():
-            run_tape_diagnostics(device, lambda line: GLib.idle_add(self._log, line))
-        threading.Thread(target=run_diag, daemon=True).start()
+            run_tape_diagnostics(device, self._log, on_log_batch=self._log_batch)
+        self._tasks.submit(run_diag)
+
+    def _detect_ltfs(self, device: str) -> bool:
+        """
+        detect_ltfs for the LTFS checks. Leftover mounts come from an earlier run that
+        crashed, so they are swept on the first check only (and again after Refresh).
+        """
+        sweep = not self._ltfs_leftovers_swept
+        try:
+            has_ltfs = detect_ltfs(device, on_log=self._log, unmount_leftovers=sweep)
+        except TapeBackupError as e:
+            self._log("LTFS check: %s" % e)
+            has_ltfs = False
+        self._ltfs_leftovers_swept = True
+        return has_ltfs
 
     def _on_check_ltfs(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -364,13 +502,14 @@ class MainWindow(Gtk.ApplicationWindow):
             self._on_ltfs_check_done(has_ltfs)
 
         def run():
-            unmount_leftover_ltfs_mounts(on_log=lambda line: GLib.idle_add(self._log, line))
-            has_ltfs = tape_has_ltfs(device)
+            has_ltfs = self._detect_ltfs(device)
             GLib.idle_add(completion, has_ltfs)
 
-        threading.Thread(target=run, daemon=True).start()
+        self._tasks.submit(run)
 
     def _on_device_changed(self, combo):
+        # The selection only changes here (and in _refresh_devices), so handlers read the cached path
+        self._selected_device_path = self._read_selected_device_path()
         self._update_start_sensitivity()
         self._run_ltfs_check_if_needed()
 
@@ -383,32 +522,32 @@ class MainWindow(Gtk.ApplicationWindow):
 
     def _on_destroy(self, _widget) -> None:
         """On window close: clean unmount LTFS if active, terminate child processes, then quit."""
-        self._cancel_ltfs_rsync_requested = True
+        self._cancel_ltfs_rsync_requested.set()
         mount_point = self._ltfs_mount_point_holder[0] if self._ltfs_mount_point_holder else None
         if mount_point:
+            # Output is ignored, so no pipes; if fusermount is missing or hangs, detach lazily
+            # (umount -l returns at once) rather than hold up closing the window
             try:
-                subprocess.run(
-                    ["fusermount", "-u", mount_point],
-                    capture_output=True,
-                    timeout=10,
-                )
+                run_quiet(["fusermount", "-u", mount_point], timeout=SHUTDOWN_UNMOUNT_SECONDS)
             except (FileNotFoundError, subprocess.TimeoutExpired):
                 try:
-                    subprocess.run(
-                        ["umount", mount_point],
-                        capture_output=True,
-                        timeout=10,
-                    )
-                except subprocess.TimeoutExpired:
+                    run_quiet(["umount", "-l", mount_point], timeout=SHUTDOWN_UNMOUNT_SECONDS)
+                except (FileNotFoundError, subprocess.TimeoutExpired):
                     pass
-        # Terminate in reverse order: rsync first, then ltfs (stops writes before killing mount)
-        for proc in reversed(self._ltfs_rsync_process_holder):
-            try:
-                if proc.poll() is None:
+        # rsync first, then ltfs (stops writes before killing mount)
+        procs = self._ltfs_rsync_process_holder
+        for group in (procs[1:], procs[:1]):
+            running = [proc for proc in group if proc.poll() is None]
+            for proc in running:
+                try:
                     proc.terminate()
+                except OSError:
+                    pass
+            for proc in running:
+                try:
                     proc.wait(timeout=5)
-            except (OSError, ValueError):
-                pass
+                except subprocess.TimeoutExpired:
+                    pass
         if self._ltfs_rsync_thread is not None and self._ltfs_rsync_thread.is_alive():
             self._ltfs_rsync_thread.join(timeout=3.0)
         app = self.get_application()
@@ -417,17 +556,8 @@ class MainWindow(Gtk.ApplicationWindow):
 
     def _maybe_check_ltfs_after_show(self):
         """Called once after window is shown to detect LTFS tape on initial device."""
-        device = self._get_selected_device_path()
-        any_busy = (
-            self._backup_thread is not None
-            or self._restore_thread is not None
-            or self._erase_thread is not None
-            or self._format_ltfs_thread is not None
-            or self._browse_thread is not None
-            or self._ltfs_rsync_thread is not None
-            or self._ltfs_mount_thread is not None
-        )
-        if not device or self._ltfs_mode or any_busy:
+        device = self._selected_device_path
+        if not device or self._ltfs_mode or self._any_busy():
             self._ltfs_startup_check_pending = False
             self._apply_ready_after_ltfs_check()
             return False
@@ -437,26 +567,15 @@ class MainWindow(Gtk.ApplicationWindow):
 
     def _run_ltfs_check_if_needed(self):
         """If a device is selected and not in LTFS mode and no operation running, check tape for LTFS in background."""
-        device = self._get_selected_device_path()
-        if not device or self._ltfs_mode:
-            return
-        if (
-            self._backup_thread is not None
-            or self._restore_thread is not None
-            or self._erase_thread is not None
-            or self._format_ltfs_thread is not None
-            or self._browse_thread is not None
-            or self._ltfs_rsync_thread is not None
-            or self._ltfs_mount_thread is not None
-        ):
+        device = self._selected_device_path
+        if not device or self._ltfs_mode or self._any_busy():
             return
 
         def check():
-            unmount_leftover_ltfs_mounts(on_log=lambda line: GLib.idle_add(self._log, line))
-            has_ltfs = tape_has_ltfs(device)
+            has_ltfs = self._detect_ltfs(device)
             GLib.idle_add(self._on_ltfs_check_done, has_ltfs)
 
-        threading.Thread(target=check, daemon=True).start()
+        self._tasks.submit(check)
 
     def _on_ltfs_check_done(self, has_ltfs: bool):
         self._ltfs_startup_check_pending = False
@@ -474,15 +593,34 @@ class MainWindow(Gtk.ApplicationWindow):
             "Tape appears to be LTFS-formatted. Use LTFS mode? "
             "(Raw backup will be disabled to avoid overwriting the tape.)"
         )
-        response = dialog.run()
-        dialog.destroy()
-        if response == Gtk.ResponseType.YES:
-            self._ltfs_mode = True
-            self._update_start_sensitivity()
-            self._log("LTFS mode enabled (raw backup and tape preparation disabled).")
+
+        def on_response(response):
+            if response == Gtk.ResponseType.YES:
+                self._ltfs_mode = True
+                self._update_start_sensitivity()
+                self._log("LTFS mode enabled (raw backup and tape preparation disabled).")
+
+        self._show_dialog(dialog, on_response)
+
+    def _show_dialog(self, dialog: Gtk.Dialog, on_response) -> None:
+        """
+        Show dialog modally without dialog.run()'s nested main loop, so logging and progress
+        keep updating behind it. on_response(response_id) is called with the dialog still
+        alive (e.g. to read a file chooser's filename); the dialog is destroyed after it.
+        """
+        dialog.set_modal(True)
+
+        def respond(d, response):
+            try:
+                on_response(response)
+            finally:
+                d.destroy()
+
+        dialog.connect("response", respond)
+        dialog.show()
 
     def _on_query_capacity(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -490,88 +628,134 @@ class MainWindow(Gtk.ApplicationWindow):
         def run():
             result = query_remaining_capacity_bytes(device)
             def apply():
+                gb = 0.0 if result is None else result / (1024 ** 3)
+                # The spin button shows (and backups use) whole GB and its adjustment clamps to
+                # its range, so only set a value that changes what it holds
+                if round(gb) != self._tape_capacity_spin.get_value_as_int():
+                    self._tape_capacity_spin.set_value(gb)
                 if result is None:
-                    self._tape_capacity_spin.set_value(0)
                     self._log(
                         "Could not query capacity. Install sg3-utils (sg_read_attr) and ensure the tape is loaded."
                     )
                 else:
-                    gb = result / (1024 ** 3)
-                    self._tape_capacity_spin.set_value(min(100000, max(0, gb)))
                     self._log("Tape capacity: %.2f GB" % gb)
                 return False
             GLib.idle_add(apply)
 
-        threading.Thread(target=run, daemon=True).start()
+        self._tasks.submit(run)
+
+    def _ensure_ltfs_mode_row(self) -> Gtk.Box:
+        if self._ltfs_mode_row is not None:
+            return self._ltfs_mode_row
+        self._exit_ltfs_mode_btn = Gtk.Button(label="Exit LTFS mode")
+        self._exit_ltfs_mode_btn.set_tooltip_text(
+            "Leave LTFS mode and re-enable tape preparation and raw backup."
+        )
+        self._exit_ltfs_mode_btn.connect("clicked", self._on_exit_ltfs_mode)
+        self._mount_ltfs_btn = Gtk.Button(label="Mount LTFS")
+        self._mount_ltfs_btn.set_tooltip_text(
+            "Mount the selected tape as LTFS so you can browse or copy files. No backup is run."
+        )
+        self._mount_ltfs_btn.connect("clicked", self._on_mount_ltfs)
+        self._unmount_ltfs_btn = Gtk.Button(label="Unmount LTFS")
+        self._unmount_ltfs_btn.set_tooltip_text(
+            "Unmount the current LTFS mount (only when you mounted via Mount LTFS, not during backup)."
+        )
+        self._unmount_ltfs_btn.connect("clicked", self._on_unmount_ltfs)
+        self._browse_ltfs_btn = Gtk.Button(label="Browse mount")
+        self._browse_ltfs_btn.set_tooltip_text(
+            "Open the file manager at the current LTFS mount point."
+        )
+        self._browse_ltfs_btn.connect("clicked", self._on_browse_ltfs)
+        ltfs_mode_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=8)
+        ltfs_mode_row.pack_start(Gtk.Label(label="LTFS mode:", xalign=0), False, False, 0)
+        ltfs_mode_row.pack_start(self._mount_ltfs_btn, False, False, 0)
+        ltfs_mode_row.pack_start(self._unmount_ltfs_btn, False, False, 0)
+        ltfs_mode_row.pack_start(self._browse_ltfs_btn, False, False, 0)
+        ltfs_mode_row.pack_start(self._exit_ltfs_mode_btn, False, False, 0)
+        self._ltfs_mode_slot.pack_start(ltfs_mode_row, True, True, 0)
+        ltfs_mode_row.show_all()
+        self._ltfs_mode_row = ltfs_mode_row
+        return ltfs_mode_row
+
+    def _any_busy(self) -> bool:
+        """
+        True while an operation is running. The finished callbacks clear the task attributes,
+        so this is mostly None checks; operations exclude each other, so at most one task is
+        asked is_alive() (to clear one that ended without its finished callback).
+        """
+        for name in _OPERATION_THREADS:
+            thread = getattr(self, name)
+            if thread is None:
+                continue
+            if thread.is_alive():
+                return True
+            setattr(self, name, None)
+        return False
 
     def _update_start_sensitivity(self):
-        # Clear thread refs if the thread has died (e.g. crash without calling _backup_finished)
-        if self._backup_thread is not None and not self._backup_thread.is_alive():
-            self._backup_thread = None
-        if self._restore_thread is not None and not self._restore_thread.is_alive():
-            self._restore_thread = None
-        if self._erase_thread is not None and not self._erase_thread.is_alive():
-            self._erase_thread = None
-        if self._format_ltfs_thread is not None and not self._format_ltfs_thread.is_alive():
-            self._format_ltfs_thread = None
-        if self._browse_thread is not None and not self._browse_thread.is_alive():
-            self._browse_thread = None
-        if self._ltfs_rsync_thread is not None and not self._ltfs_rsync_thread.is_alive():
-            self._ltfs_rsync_thread = None
-        device = self._get_selected_device_path()
-        backup_busy = self._backup_thread is not None
-        restore_busy = self._restore_thread is not None
-        erase_busy = self._erase_thread is not None
-        format_busy = self._format_ltfs_thread is not None
-        browse_busy = self._browse_thread is not None
-        ltfs_rsync_busy = self._ltfs_rsync_thread is not None
-        ltfs_mount_busy = self._ltfs_mount_thread is not None
-        any_busy = backup_busy or restore_busy or erase_busy or format_busy or browse_busy or ltfs_rsync_busy or ltfs_mount_busy
+        """
+        Refresh button sensitivity. Handlers often call this several times in a row, so the
+        work is done once, in a high-priority idle callback: before the next input event is
+        dispatched, so a button that is about to be disabled can't be clicked again.
+        """
+        if self._sensitivity_scheduled:
+            return
+        self._sensitivity_scheduled = True
+        GLib.idle_add(self._apply_start_sensitivity, priority=GLib.PRIORITY_HIGH)
+
+    def _apply_start_sensitivity(self):
+        self._sensitivity_scheduled = False
+        device = self._selected_device_path
+        any_busy = self._any_busy()
         mount_point = self._ltfs_mount_point_holder[0] if self._ltfs_mount_point_holder else None
+        # Everything below is computed once and shared by both modes' tables
+        ready = not any_busy and bool(device)  # idle, with a device selected
+        backup_ready = ready and bool(self._dir_paths)
+        ltfs_mount_ok = is_ltfs_mount_available()
         if self._ltfs_mode:
-            self._ltfs_mode_row.show()
-            self._start_btn.set_sensitive(False)
-            self._append_to_tape_cb.set_sensitive(False)
-            self._rewind_btn.set_sensitive(False)
-            self._erase_btn.set_sensitive(False)
-            self._format_ltfs_btn.set_sensitive(False)
-            self._browse_btn.set_sensitive(False)
-            self._ltfs_rsync_btn.set_sensitive(
-                not any_busy and bool(device and len(self._dir_store) > 0) and is_ltfs_mount_available()
-            )
-            self._mount_ltfs_btn.set_sensitive(
-                not any_busy and bool(device) and not mount_point and is_ltfs_mount_available()
-            )
-            self._unmount_ltfs_btn.set_sensitive(
-                not any_busy and self._ltfs_standalone_mount and bool(mount_point)
-            )
-            self._browse_ltfs_btn.set_sensitive(bool(mount_point))
-            self._status_btn.set_sensitive(not any_busy)
-            self._tape_diagnostics_btn.set_sensitive(not any_busy and bool(device))
-            self._check_ltfs_btn.set_sensitive(not any_busy and bool(device))
-            self._exit_ltfs_mode_btn.set_sensitive(not any_busy)
-            self._start_restore_btn.set_sensitive(False)
-            self._cancel_btn.set_sensitive(any_busy)
+            self._ensure_ltfs_mode_row()
+            self._ltfs_mode_slot.show()
+            sensitivity = {
+                self._start_btn: False,
+                self._append_to_tape_cb: False,
+                self._rewind_btn: False,
+                self._erase_btn: False,
+                self._format_ltfs_btn: False,
+                self._browse_btn: False,
+                self._ltfs_rsync_btn: backup_ready and ltfs_mount_ok,
+                self._mount_ltfs_btn: ready and not mount_point and ltfs_mount_ok,
+                self._unmount_ltfs_btn: not any_busy and self._ltfs_standalone_mount and bool(mount_point),
+                self._browse_ltfs_btn: bool(mount_point),
+                self._status_btn: not any_busy,
+                self._tape_diagnostics_btn: ready,
+                self._check_ltfs_btn: ready,
+                self._exit_ltfs_mode_btn: not any_busy,
+                self._start_restore_btn: False,
+                self._cancel_btn: any_busy,
+            }
         else:
-            self._ltfs_mode_row.hide()
-            self._start_btn.set_sensitive(
-                not any_busy and bool(device and len(self._dir_store) > 0)
-            )
-            self._append_to_tape_cb.set_sensitive(True)
-            self._start_restore_btn.set_sensitive(
-                not any_busy and bool(device and self._restore_destination)
-            )
-            self._cancel_btn.set_sensitive(any_busy)
-            self._status_btn.set_sensitive(not any_busy)
-            self._browse_btn.set_sensitive(not any_busy and bool(device))
-            self._rewind_btn.set_sensitive(not any_busy and bool(device))
-            self._erase_btn.set_sensitive(not any_busy and bool(device))
-            self._format_ltfs_btn.set_sensitive(not any_busy and bool(device))
-            self._tape_diagnostics_btn.set_sensitive(not any_busy and bool(device))
-            self._check_ltfs_btn.set_sensitive(not any_busy and bool(device))
-            self._ltfs_rsync_btn.set_sensitive(
-                not any_busy and bool(device and len(self._dir_store) > 0) and is_ltfs_mount_available()
-            )
+            self._ltfs_mode_slot.hide()
+            sensitivity = {
+                self._start_btn: backup_ready,
+                self._append_to_tape_cb: True,
+                self._start_restore_btn: ready and bool(self._restore_destination),
+                self._cancel_btn: any_busy,
+                self._status_btn: not any_busy,
+                self._browse_btn: ready,
+                self._rewind_btn: ready,
+                self._erase_btn: ready,
+                self._format_ltfs_btn: ready,
+                self._tape_diagnostics_btn: ready,
+                self._check_ltfs_btn: ready,
+                self._ltfs_rsync_btn: backup_ready and ltfs_mount_ok,
+            }
+        # Only write what changed: this runs on every device, directory and thread state change
+        for widget, sensitive in sensitivity.items():
+            if self._sensitivity.get(widget) != sensitive:
+                widget.set_sensitive(sensitive)
+                self._sensitivity[widget] = sensitive
+        return False
 
     def _on_add_directory(self, _btn):
         dialog = Gtk.FileChooserDialog(
@@ -580,70 +764,152 @@ class MainWindow(Gtk.ApplicationWindow):
             action=Gtk.FileChooserAction.SELECT_FOLDER,
         )
         dialog.add_buttons("_Cancel", Gtk.ResponseType.CANCEL, "_Open", Gtk.ResponseType.OK)
-        if dialog.run() == Gtk.ResponseType.OK:
-            path = dialog.get_filename()
-            if path:
-                self._dir_store.append([path])
-                if "/gvfs/" in path:
-                    self._log(
-                        "Warning: GVFS/network paths (e.g. smb-share:) often cause 'Cannot stat: Invalid argument' "
-                        "and incomplete backups. Prefer a CIFS mount (e.g. /mnt/something) instead."
-                    )
-        dialog.destroy()
+
+        def on_response(response):
+            path = dialog.get_filename() if response == Gtk.ResponseType.OK else None
+            if not path:
+                return
+            label = Gtk.Label(label=path, xalign=0)
+            label.show()
+            self._dir_list.add(label)
+            self._dir_paths.append(path)
+            self._update_start_sensitivity()
+            if "/gvfs/" in path:
+                self._log(
+                    "Warning: GVFS/network paths (e.g. smb-share:) often cause 'Cannot stat: Invalid argument' "
+                    "and incomplete backups. Prefer a CIFS mount (e.g. /mnt/something) instead."
+                )
+
+        self._show_dialog(dialog, on_response)
 
     def _on_remove_directory(self, _btn):
-        sel = self._dir_tree.get_selection()
-        _, tree_iter = sel.get_selected()
-        if tree_iter:
-            self._dir_store.remove(tree_iter)
+        row = self._dir_list.get_selected_row()
+        if row is not None:
+            del self._dir_paths[row.get_index()]
+            self._dir_list.remove(row)
+            self._update_start_sensitivity()
 
     def _log(self, text):
-        def do():
-            buf = self._log_buffer
-            line_count = buf.get_line_count()
-            if line_count >= LOG_MAX_LINES:
-                lines_to_remove = line_count - LOG_MAX_LINES + 1
-                start = buf.get_start_iter()
-                end = buf.get_iter_at_line(lines_to_remove)
-                buf.delete(start, end)
-            end_iter = buf.get_end_iter()
-            buf.insert(end_iter, text + "\n")
-            self._log_view.scroll_to_iter(buf.get_end_iter(), 0.0, True, 0.0, 1.0)
-            return False
-        GLib.idle_add(do)
+        """Append text to the log; safe from any thread. Lines are queued and written in batches."""
+        with self._log_lock:
+            self._log_queue.append(text)
+            if self._log_drain_scheduled:
+                return
+            self._log_drain_scheduled = True
+        # Below redraws and progress: under a flood of output the bar stays current and the
+        # log catches up in larger batches
+        GLib.idle_add(self._drain_log, priority=GLib.PRIORITY_LOW)
+
+    def _log_batch(self, lines: list[str]) -> None:
+        """on_log_batch for workers: queue a batch of lines as one log entry."""
+        self._log("\n".join(lines))
+
+    def _drain_log(self):
+        """Write all queued log lines with one insert, trim to LOG_MAX_LINES and scroll once."""
+        with self._log_lock:
+            batch, self._log_queue = self._log_queue, deque()
+            self._log_drain_scheduled = False
+        text = "\n".join(batch) + "\n"
+        buf = self._log_buffer
+        buf.insert(buf.get_end_iter(), text)
+        # Lines are counted as they are added rather than asking the buffer each time
+        self._log_lines += text.count("\n")
+        excess = self._log_lines - LOG_MAX_LINES
+        if excess > 0:
+            buf.delete(buf.get_start_iter(), buf.get_iter_at_line(excess))
+            self._log_lines = LOG_MAX_LINES
+        self._log_view.scroll_to_iter(buf.get_end_iter(), 0.0, True, 0.0, 1.0)
+        return False
 
     def _set_progress(self, text):
-        def do():
+        """Show text above the progress bar; safe from any thread. Only the latest text is drawn."""
+        with self._progress_lock:
+            self._progress_text = text
+            if self._progress_text_scheduled:
+                return
+            self._progress_text_scheduled = True
+        GLib.idle_add(self._apply_progress_text, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _apply_progress_text(self):
+        with self._progress_lock:
+            text, self._progress_text = self._progress_text, None
+            self._progress_text_scheduled = False
+        if text is not None:
             self._progress_activity_label.set_label(text)
-            return False
-        GLib.idle_add(do)
+        return False
 
     def _on_progress_update(
         self, bytes_written: int, total_bytes: Optional[int], elapsed_sec: float
     ) -> None:
-        """Update progress bar and label from backup thread (call via GLib.idle_add)."""
-        def do():
-            if total_bytes and total_bytes > 0:
-                self._progress_bar.set_fraction(bytes_written / total_bytes)
-                pct = 100.0 * bytes_written / total_bytes
-                msg = f"{_format_bytes(bytes_written)} / {_format_bytes(total_bytes)} ({pct:.1f}%)"
-                if bytes_written > 0 and total_bytes > bytes_written:
-                    eta_sec = elapsed_sec * (total_bytes - bytes_written) / bytes_written
-                    msg += f"  Elapsed: {_format_elapsed(elapsed_sec)}  ETA: {_format_elapsed(eta_sec)}"
-                else:
-                    msg += f"  Elapsed: {_format_elapsed(elapsed_sec)}"
-                self._progress_label.set_label(msg)
-            else:
-                self._progress_bar.set_pulse_step(0.1)
-                self._progress_bar.pulse()
-                verb = "read" if self._progress_is_restore else "written"
-                msg = f"{_format_bytes(bytes_written)} {verb}  Elapsed: {_format_elapsed(elapsed_sec)}"
-                self._progress_label.set_label(msg)
+        """
+        Show progress; safe to call from the worker thread. Only the latest sample is kept,
+        and it is drawn at most every PROGRESS_UI_SECONDS.
+        """
+        self._progress_slot.append((bytes_written, total_bytes, elapsed_sec))
+        # Single producer: _apply_progress clears the flag before taking the sample, so a
+        # sample stored while a draw is pending is either taken by it or schedules another
+        if self._progress_scheduled:
+            return
+        self._progress_scheduled = True
+        delay = self._progress_shown_at + PROGRESS_UI_SECONDS - time.monotonic()
+        if delay > 0:
+            GLib.timeout_add(int(delay * 1000) + 1, self._apply_progress)
+        else:
+            GLib.idle_add(self._apply_progress, priority=GLib.PRIORITY_HIGH_IDLE)
+
+    def _drop_pending_progress(self) -> None:
+        """
+        Forget a sample not drawn yet and stop the pulse animation, so neither can overwrite
+        the final state of an operation.
+        """
+        self._progress_slot.clear()
+        self._stop_pulse()
+
+    def _start_pulse(self) -> None:
+        """Animate the bar (no total known) on its own timer, independent of how often samples arrive."""
+        if self._pulse_source is not None:
+            return
+        self._progress_bar.set_pulse_step(0.1)
+        self._progress_bar.pulse()
+        self._pulse_source = GLib.timeout_add(int(PROGRESS_UI_SECONDS * 1000), self._pulse_tick)
+
+    def _pulse_tick(self):
+        self._progress_bar.pulse()
+        return True
+
+    def _stop_pulse(self) -> None:
+        if self._pulse_source is not None:
+            GLib.source_remove(self._pulse_source)
+            self._pulse_source = None
+
+    def _apply_progress(self):
+        self._progress_scheduled = False
+        try:
+            sample = self._progress_slot.popleft()
+        except IndexError:
             return False
-        GLib.idle_add(do)
+        self._progress_shown_at = time.monotonic()
+        bytes_written, total_bytes, elapsed_sec = sample
+        if total_bytes and total_bytes > 0:
+            self._stop_pulse()
+            self._progress_bar.set_fraction(bytes_written / total_bytes)
+            pct = 100.0 * bytes_written / total_bytes
+            msg = f"{_format_bytes(bytes_written)} / {_format_bytes(total_bytes)} ({pct:.1f}%)"
+            if bytes_written > 0 and total_bytes > bytes_written:
+                eta_sec = elapsed_sec * (total_bytes - bytes_written) / bytes_written
+                msg += f"  Elapsed: {_format_elapsed(elapsed_sec)}  ETA: {_format_elapsed(eta_sec)}"
+            else:
+                msg += f"  Elapsed: {_format_elapsed(elapsed_sec)}"
+            self._progress_label.set_label(msg)
+        else:
+            self._start_pulse()
+            verb = "read" if self._progress_is_restore else "written"
+            msg = f"{_format_bytes(bytes_written)} {verb}  Elapsed: {_format_elapsed(elapsed_sec)}"
+            self._progress_label.set_label(msg)
+        return False
 
     def _on_tape_status(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("No tape device selected.")
             return
@@ -656,11 +922,11 @@ class MainWindow(Gtk.ApplicationWindow):
         self._log("-------------------")
 
     def _on_browse_tape(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
-        self._cancel_browse_requested = False
+        self._cancel_browse_requested.clear()
         # Dialog: status label, Cancel, TreeView (path, size, type)
         dialog = Gtk.Dialog(
             title="Tape contents",
@@ -678,7 +944,7 @@ class MainWindow(Gtk.ApplicationWindow):
         )
         content.pack_start(status_label, False, False, 0)
         cancel_btn = Gtk.Button(label="Cancel")
-        cancel_btn.connect("clicked", lambda b: setattr(self, "_cancel_browse_requested", True))
+        cancel_btn.connect("clicked", lambda b: self._cancel_browse_requested.set())
         cancel_btn_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL)
         cancel_btn_box.pack_start(cancel_btn, False, False, 0)
         content.pack_start(cancel_btn_box, False, False, 0)
@@ -693,6 +959,7 @@ class MainWindow(Gtk.ApplicationWindow):
         self._browse_dialog = dialog
         self._browse_dialog_status_label = status_label
         self._browse_dialog_store = store
+        self._browse_dialog_tree = tree
         self._browse_dialog_cancel_btn = cancel_btn
         dialog.connect("destroy", self._on_browse_dialog_destroy)
         dialog.connect("response", lambda d, _r: d.destroy())
@@ -702,25 +969,34 @@ class MainWindow(Gtk.ApplicationWindow):
             try:
                 entries = list_tape_contents(
                     device,
-                    on_progress=lambda m: GLib.idle_add(self._set_browse_status, m),
-                    cancel_check=lambda: self._cancel_browse_requested,
+                    on_progress=lambda m: GLib.idle_add(
+                        self._set_browse_status, m, priority=GLib.PRIORITY_HIGH_IDLE
+                    ),
+                    cancel_check=self._cancel_browse_requested.is_set,
                 )
-                GLib.idle_add(self._browse_finished, entries, None)
+                # Format the rows here, so the main loop only inserts them
+                fmt = _format_bytes
+                rows = [
+                    [e.path, "—", "Directory"] if e.is_dir else [e.path, fmt(e.size), "File"]
+                    for e in entries
+                ]
+                GLib.idle_add(self._browse_finished, rows, None)
             except Exception as e:
                 GLib.idle_add(self._browse_finished, None, e)
 
-        self._browse_thread = threading.Thread(target=run, daemon=True)
-        self._browse_thread.start()
+        self._browse_thread = self._tasks.submit_operation(run)
         self._update_start_sensitivity()
 
     def _set_browse_status(self, msg: str) -> None:
         if getattr(self, "_browse_dialog_status_label", None):
             self._browse_dialog_status_label.set_label(msg)
 
-    def _browse_finished(self, entries, error) -> None:
+    def _browse_finished(self, rows, error) -> None:
+        """rows: [path, size, type] strings per tape entry, ready for the store."""
         self._browse_thread = None
         status_label = getattr(self, "_browse_dialog_status_label", None)
         store = getattr(self, "_browse_dialog_store", None)
+        tree = getattr(self, "_browse_dialog_tree", None)
         cancel_btn = getattr(self, "_browse_dialog_cancel_btn", None)
         if cancel_btn:
             cancel_btn.set_sensitive(False)
@@ -728,24 +1004,36 @@ class MainWindow(Gtk.ApplicationWindow):
             if status_label:
                 status_label.set_label("Error: %s" % error)
             self._log("Browse tape failed: %s" % error)
-        elif entries is not None and store is not None:
-            for e in entries:
-                size_str = _format_bytes(e.size) if not e.is_dir else "—"
-                type_str = "Directory" if e.is_dir else "File"
-                store.append([e.path, size_str, type_str])
+        elif rows is not None and store is not None:
+            # Fill the store detached from the view: one revalidation when it is set back,
+            # instead of one per inserted row
+            if tree is not None:
+                tree.set_model(None)
+            columns = [0, 1, 2]
+            insert = store.insert_with_valuesv
+            for row in rows:
+                insert(-1, columns, row)
+            if tree is not None:
+                tree.set_model(store)
             if status_label:
-                status_label.set_label("Done. %d entries." % len(entries))
+                status_label.set_label("Done. %d entries." % len(rows))
         self._update_start_sensitivity()
 
     def _on_browse_dialog_destroy(self, dialog) -> None:
-        self._cancel_browse_requested = True
-        for attr in ("_browse_dialog", "_browse_dialog_status_label", "_browse_dialog_store", "_browse_dialog_cancel_btn"):
+        self._cancel_browse_requested.set()
+        for attr in (
+            "_browse_dialog",
+            "_browse_dialog_status_label",
+            "_browse_dialog_store",
+            "_browse_dialog_tree",
+            "_browse_dialog_cancel_btn",
+        ):
             if hasattr(self, attr):
                 setattr(self, attr, None)
         self._update_start_sensitivity()
 
     def _on_rewind(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -757,7 +1045,7 @@ class MainWindow(Gtk.ApplicationWindow):
             self._log("Rewind failed: %s" % e)
 
     def _on_erase(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -772,25 +1060,21 @@ class MainWindow(Gtk.ApplicationWindow):
             "Long erase is destructive and can take many hours. It cannot be aborted. "
             "Only use with a tape you intend to fully erase."
         )
-        if dialog.run() != Gtk.ResponseType.OK:
-            dialog.destroy()
-            return
-        dialog.destroy()
 
-        self._log("=== Erase started ===")
-        self._erase_thread = threading.Thread(
-            target=self._run_erase,
-            args=(device,),
-            daemon=True,
-        )
-        self._erase_thread.start()
-        self._update_start_sensitivity()
+        def on_response(response):
+            if response != Gtk.ResponseType.OK:
+                return
+            self._log("=== Erase started ===")
+            self._erase_thread = self._tasks.submit_operation(self._run_erase, device)
+            self._update_start_sensitivity()
+
+        self._show_dialog(dialog, on_response)
 
     def _run_erase(self, device: str) -> None:
         try:
             erase(
                 device,
-                on_log=lambda line: GLib.idle_add(self._log, line),
+                on_log=self._log,
             )
             GLib.idle_add(self._erase_finished, None)
         except Exception as e:
@@ -804,7 +1088,7 @@ class MainWindow(Gtk.ApplicationWindow):
         self._log("=== Erase ended ===\n")
 
     def _on_format_ltfs(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -815,23 +1099,18 @@ class MainWindow(Gtk.ApplicationWindow):
             )
             return
         self._log("=== Format for LTFS started ===")
-        self._format_ltfs_thread = threading.Thread(
-            target=self._run_format_ltfs,
-            args=(device,),
-            daemon=True,
-        )
-        self._format_ltfs_thread.start()
+        self._format_ltfs_thread = self._tasks.submit_operation(self._run_format_ltfs, device)
         self._update_start_sensitivity()
 
     def _run_format_ltfs(self, device: str) -> None:
         try:
-            unmount_leftover_ltfs_mounts(on_log=lambda line: GLib.idle_add(self._log, line))
+            unmount_leftover_ltfs_mounts(on_log=self._log)
             format_ltfs(
                 device,
-                on_log=lambda line: GLib.idle_add(self._log, line),
+                on_log_batch=self._log_batch,
                 force=True,
             )
-            GLib.idle_add(self._log, "Rewinding tape…")
+            self._log("Rewinding tape…")
             rewind(device)
             GLib.idle_add(self._format_ltfs_finished, None)
         except Exception as e:
@@ -842,22 +1121,19 @@ class MainWindow(Gtk.ApplicationWindow):
         self._update_start_sensitivity()
         if error:
             self._log("Format for LTFS failed: %s" % error)
-            device = self._get_selected_device_path()
+            device = self._selected_device_path
             if device:
                 self._log("Running tape diagnostics…")
                 def run_diag():
-                    run_tape_diagnostics(
-                        device,
-                        lambda line: GLib.idle_add(self._log, line),
-                    )
-                threading.Thread(target=run_diag, daemon=True).start()
+                    run_tape_diagnostics(device, self._log, on_log_batch=self._log_batch)
+                self._tasks.submit(run_diag)
         else:
             self._log("Format for LTFS completed.")
         self._log("=== Format for LTFS ended ===\n")
 
     def _on_start_ltfs_rsync(self, _btn):
-        device = self._get_selected_device_path()
-        paths = [row[0] for row in self._dir_store]
+        device = self._selected_device_path
+        paths = list(self._dir_paths)
         if not device:
             self._log("Select a tape device first.")
             return
@@ -871,11 +1147,11 @@ class MainWindow(Gtk.ApplicationWindow):
         if self._ltfs_standalone_mount and self._ltfs_mount_point_holder and self._ltfs_mount_point_holder[0]:
             mp = self._ltfs_mount_point_holder[0]
             proc = self._ltfs_rsync_process_holder[0] if self._ltfs_rsync_process_holder else None
-            unmount_ltfs(mp, proc, on_log=lambda line: GLib.idle_add(self._log, line))
+            unmount_ltfs(mp, proc, on_log=self._log)
             self._ltfs_mount_point_holder[0] = None
             self._ltfs_standalone_mount = False
             self._ltfs_rsync_process_holder.clear()
-        self._cancel_ltfs_rsync_requested = False
+        self._cancel_ltfs_rsync_requested.clear()
         self._progress_is_restore = False
         self._update_start_sensitivity()
         self._progress_bar.set_fraction(0)
@@ -891,12 +1167,10 @@ class MainWindow(Gtk.ApplicationWindow):
                 run_ltfs_rsync(
                     device,
                     paths,
-                    on_progress=lambda m: GLib.idle_add(self._set_progress, m),
-                    on_progress_update=lambda b, t, e: GLib.idle_add(
-                        self._on_progress_update, b, t, e
-                    ),
-                    on_log=lambda line: GLib.idle_add(self._log, line),
-                    cancel_check=lambda: self._cancel_ltfs_rsync_requested,
+                    on_progress=self._set_progress,
+                    on_progress_update=self._on_progress_update,
+                    on_log=self._log,
+                    cancel_check=self._cancel_ltfs_rsync_requested.is_set,
                     process_holder=self._ltfs_rsync_process_holder,
                     mount_point_holder=self._ltfs_mount_point_holder,
                 )
@@ -904,12 +1178,12 @@ class MainWindow(Gtk.ApplicationWindow):
             except Exception as e:
                 GLib.idle_add(self._ltfs_rsync_finished, e)
 
-        self._ltfs_rsync_thread = threading.Thread(target=run, daemon=True)
-        self._ltfs_rsync_thread.start()
+        self._ltfs_rsync_thread = self._tasks.submit_operation(run)
         self._update_start_sensitivity()
 
     def _ltfs_rsync_finished(self, error) -> None:
         self._ltfs_rsync_thread = None
+        self._drop_pending_progress()
         self._update_start_sensitivity()
         if error:
             self._progress_bar.set_fraction(0)
@@ -948,7 +1222,7 @@ class MainWindow(Gtk.ApplicationWindow):
                 self._log("Could not open file manager (xdg-open and gio not found).")
 
     def _on_mount_ltfs(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device:
             self._log("Select a tape device first.")
             return
@@ -962,7 +1236,7 @@ class MainWindow(Gtk.ApplicationWindow):
             try:
                 mount_ltfs_only(
                     device,
-                    on_log=lambda line: GLib.idle_add(self._log, line),
+                    on_log=self._log,
                     mount_point_holder=self._ltfs_mount_point_holder,
                     process_holder=self._ltfs_rsync_process_holder,
                 )
@@ -970,8 +1244,7 @@ class MainWindow(Gtk.ApplicationWindow):
             except Exception as e:
                 GLib.idle_add(self._ltfs_mount_finished, e)
 
-        self._ltfs_mount_thread = threading.Thread(target=run, daemon=True)
-        self._ltfs_mount_thread.start()
+        self._ltfs_mount_thread = self._tasks.submit_operation(run)
         self._update_start_sensitivity()
 
     def _ltfs_mount_finished(self, error) -> None:
@@ -993,7 +1266,7 @@ class MainWindow(Gtk.ApplicationWindow):
         unmount_ltfs(
             mount_point,
             ltfs_proc,
-            on_log=lambda line: GLib.idle_add(self._log, line),
+            on_log=self._log,
         )
         self._ltfs_mount_point_holder[0] = None
         self._ltfs_standalone_mount = False
@@ -1009,24 +1282,26 @@ class MainWindow(Gtk.ApplicationWindow):
             action=Gtk.FileChooserAction.SELECT_FOLDER,
         )
         dialog.add_buttons("_Cancel", Gtk.ResponseType.CANCEL, "_Open", Gtk.ResponseType.OK)
-        if dialog.run() == Gtk.ResponseType.OK:
-            path = dialog.get_filename()
+
+        def on_response(response):
+            path = dialog.get_filename() if response == Gtk.ResponseType.OK else None
             if path:
                 self._restore_destination = path
                 self._restore_path_label.set_label(path)
                 self._update_start_sensitivity()
-        dialog.destroy()
+
+        self._show_dialog(dialog, on_response)
 
     def _on_start_backup(self, _btn):
-        device = self._get_selected_device_path()
-        paths = [row[0] for row in self._dir_store]
+        device = self._selected_device_path
+        paths = list(self._dir_paths)
         if not device:
             self._log("Select a tape device (and click Refresh if needed).")
             return
         if not paths:
             self._log("Add at least one directory to backup.")
             return
-        self._cancel_requested = False
+        self._cancel_requested.clear()
         self._progress_is_restore = False
         self._update_start_sensitivity()
         self._progress_bar.set_fraction(0)
@@ -1047,17 +1322,23 @@ class MainWindow(Gtk.ApplicationWindow):
                     paths,
                     skip_rewind=skip_rewind,
                     max_tape_bytes=max_tape_bytes,
-                    on_progress=lambda m: GLib.idle_add(self._set_progress, m),
-                    on_progress_update=lambda b, t, e: GLib.idle_add(
-                        self._on_progress_update, b, t, e
-                    ),
-                    on_log=lambda line: GLib.idle_add(self._log, line),
-                    cancel_check=lambda: self._cancel_requested,
+                    on_progress=self._set_progress,
+                    on_progress_update=self._on_progress_update,
+                    on_log_batch=self._log_batch,
+                    cancel_check=self._cancel_requested.is_set,
                 )
                 GLib.idle_add(self._backup_finished, None)
             except Exception as e:
                 GLib.idle_add(self._backup_finished, e)
 
+        def start_backup(response=Gtk.ResponseType.YES):
+            if response != Gtk.ResponseType.YES:
+                self._log("Backup cancelled to protect LTFS tape.")
+                self._update_start_sensitivity()
+                return
+            self._backup_thread = self._tasks.submit_operation(start_backup_thread)
+            self._update_start_sensitivity()
+
         def continuation(has_ltfs):
             if has_ltfs:
                 dialog = Gtk.MessageDialog(
@@ -1074,27 +1355,26 @@ class MainWindow(Gtk.ApplicationWindow):
                 )
                 dialog.add_button("Cancel", Gtk.ResponseType.CANCEL)
                 dialog.add_button("Continue anyway", Gtk.ResponseType.YES)
-                response = dialog.run()
-                dialog.destroy()
-                if response != Gtk.ResponseType.YES:
-                    self._log("Backup cancelled to protect LTFS tape.")
-                    self._update_start_sensitivity()
-                    return
-            self._backup_thread = threading.Thread(target=start_backup_thread, daemon=True)
-            self._backup_thread.start()
-            self._update_start_sensitivity()
+                self._show_dialog(dialog, start_backup)
+            else:
+                start_backup()
 
         def pre_check():
             self._log("Checking for LTFS partition before tar backup…")
-            unmount_leftover_ltfs_mounts(on_log=lambda line: GLib.idle_add(self._log, line))
-            has_ltfs = tape_has_ltfs(device)
+            try:
+                # Appending: the archive goes where the tape is now, so it must not move
+                has_ltfs = detect_ltfs(device, on_log=self._log, keep_position=skip_rewind)
+            except TapeBackupError as e:
+                self._log("Backup not started: %s" % e)
+                return
             GLib.idle_add(continuation, has_ltfs)
 
-        threading.Thread(target=pre_check, daemon=True).start()
+        self._tasks.submit_operation(pre_check)
         self._update_start_sensitivity()
 
     def _backup_finished(self, error):
         self._backup_thread = None
+        self._drop_pending_progress()
         self._update_start_sensitivity()
         if error:
             self._progress_bar.set_fraction(0)
@@ -1106,10 +1386,10 @@ class MainWindow(Gtk.ApplicationWindow):
         self._log("=== Backup ended ===\n")
 
     def _on_start_restore(self, _btn):
-        device = self._get_selected_device_path()
+        device = self._selected_device_path
         if not device or not self._restore_destination:
             return
-        self._cancel_restore_requested = False
+        self._cancel_restore_requested.clear()
         self._progress_is_restore = True
         self._update_start_sensitivity()
         self._progress_bar.set_fraction(0)
@@ -1125,23 +1405,21 @@ class MainWindow(Gtk.ApplicationWindow):
                     device,
                     self._restore_destination,
                     archive_number=self._restore_archive_spin.get_value_as_int(),
-                    on_progress=lambda m: GLib.idle_add(self._set_progress, m),
-                    on_progress_update=lambda b, t, e: GLib.idle_add(
-                        self._on_progress_update, b, t, e
-                    ),
-                    on_log=lambda line: GLib.idle_add(self._log, line),
-                    cancel_check=lambda: self._cancel_restore_requested,
+                    on_progress=self._set_progress,
+                    on_progress_update=self._on_progress_update,
+                    on_log_batch=self._log_batch,
+                    cancel_check=self._cancel_restore_requested.is_set,
                 )
                 GLib.idle_add(self._restore_finished, None)
             except Exception as e:
                 GLib.idle_add(self._restore_finished, e)
 
-        self._restore_thread = threading.Thread(target=run, daemon=True)
-        self._restore_thread.start()
+        self._restore_thread = self._tasks.submit_operation(run)
         self._update_start_sensitivity()
 
     def _restore_finished(self, error):
         self._restore_thread = None
+        self._drop_pending_progress()
         self._progress_is_restore = False
         self._update_start_sensitivity()
         if error:
@@ -1154,12 +1432,9 @@ class MainWindow(Gtk.ApplicationWindow):
         self._log("=== Restore ended ===\n")
 
     def _on_cancel_operation(self, _btn):
-        if self._backup_thread is not None:
-            self._cancel_requested = True
-            self._log("Cancel requested…")
-        elif self._restore_thread is not None:
-            self._cancel_restore_requested = True
-            self._log("Cancel requested…")
-        elif self._ltfs_rsync_thread is not None:
-            self._cancel_ltfs_rsync_requested = True
-            self._log("Cancel requested…")
+        # Operations exclude each other, so at most one of these is running
+        for task_name, event_name in _CANCEL_EVENTS.items():
+            if getattr(self, task_name) is not None:
+                getattr(self, event_name).set()
+                self._log("Cancel requested…")
+                break
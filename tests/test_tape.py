@@ -3,14 +3,50 @@ import io
 import os
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, mock_open, patch
 
 import pytest
 
-from tape_drive_controller.tape.list_devices import list_tape_devices
-from tape_drive_controller.tape.backup import run_backup, erase, TapeBackupError
-from tape_drive_controller.tape.capacity import nst_to_sg
-from tape_drive_controller.tape.ltfs import is_ltfs_available, format_ltfs, run_ltfs_rsync
+from tape_drive_controller.tape.list_devices import list_tape_devices, _parse_lsscsi_labels
+from tape_drive_controller.tape.backup import (
+    run_backup,
+    erase,
+    TapeBackupError,
+    _compute_total_size,
+    _sample_size,
+    _path_size,
+    _measure_path_size,
+    _mount_points_below,
+    _parse_checkpoint,
+    _poll_line_blocks,
+    _parse_tar_list_line,
+    TapeEntry,
+)
+from tape_drive_controller.tape.buffer import (
+    BUFFER_BYTES,
+    BUFFER_MAX_BYTES,
+    StreamBuffer,
+    buffer_bytes,
+)
+from tape_drive_controller.tape.size_cache import _SizeCache
+from tape_drive_controller.tape.capacity import (
+    nst_to_sg,
+    _find_capacity_mib,
+    _SG_LOGS_MAXIMUM_RE,
+    _SG_READ_ATTR_MAXIMUM_RE,
+)
+from tape_drive_controller.tape.ltfs import (
+    is_ltfs_available,
+    format_ltfs,
+    run_ltfs_rsync,
+    _parse_rsync_progress2,
+    _LineBuffer,
+    _ltfs_label_present,
+    detect_ltfs,
+    _copy_to_mount,
+    _ProgressThrottle,
+    _rsync_to_mount,
+)
 
 
 def test_list_tape_devices_returns_list():
@@ -22,6 +58,19 @@ def test_list_tape_devices_returns_list():
         assert os.path.basename(d.path).isdigit() or False  # nst0, nst1, etc.
 
 
+def test_parse_lsscsi_labels_maps_tape_lines_to_nst():
+    """Only tape lines are picked up; the label is the vendor/model text with padding collapsed."""
+    output = (
+        b"[0:0:0:0]    disk    ATA      Samsung SSD 860  4B6Q  /dev/sda\n"
+        b"[2:0:0:0]    tape    HP       Ultrium 2-SCSI   F6CH  /dev/st0\n"
+        b"[3:0:1:0]    tape    HPE      Ultrium 9-SCSI   Q3A1  /dev/st1\n"
+    )
+    assert _parse_lsscsi_labels(output) == {
+        "/dev/nst0": "HP Ultrium 2-SCSI F6CH",
+        "/dev/nst1": "HPE Ultrium 9-SCSI Q3A1",
+    }
+
+
 def test_run_backup_to_file():
     """Backup runs to a file (skip_rewind) and produces valid tar output."""
     with tempfile.TemporaryDirectory() as tmp:
@@ -56,6 +105,347 @@ def test_run_backup_to_file():
         assert "hello.txt" in r.stdout or "src/hello.txt" in r.stdout
 
 
+def test_run_backup_writes_tar_image_as_is():
+    """A single .tar file is copied to the target unchanged instead of being archived again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        image = Path(tmp) / "image.tar"
+        image.write_bytes(os.urandom(10240 * 5 + 100))
+        out_file = Path(tmp) / "backup.tar"
+        progress_msgs = []
+
+        run_backup(str(out_file), [str(image)], skip_rewind=True, on_progress=progress_msgs.append)
+
+        assert out_file.read_bytes() == image.read_bytes()
+        assert progress_msgs[-1] == "Completed. 5 records written."
+
+
+def test_run_backup_log_batches_match_log_lines():
+    """on_log_batch delivers the same lines as on_log, in order, in fewer calls."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        src.mkdir()
+        for i in range(200):
+            (src / f"f{i}.txt").write_text(str(i))
+        log_lines, batches = [], []
+
+        run_backup(
+            str(Path(tmp) / "backup.tar"),
+            [str(src)],
+            skip_rewind=True,
+            on_log=log_lines.append,
+            on_log_batch=batches.append,
+        )
+
+        assert [line for batch in batches for line in batch] == log_lines
+        assert len(batches) < len(log_lines)
+
+
+def test_stream_buffer_copies_in_whole_records():
+    """StreamBuffer copies everything through a small buffer, writing only whole records."""
+    data = os.urandom(10240 * 37)
+    with tempfile.TemporaryDirectory() as tmp:
+        src, dst = Path(tmp) / "src", Path(tmp) / "dst"
+        src.write_bytes(data)
+        sizes = []
+        real_write = os.write
+
+        def recording_write(fd, block):
+            sizes.append(len(block))
+            return real_write(fd, block)
+
+        buffer = StreamBuffer(
+            os.open(src, os.O_RDONLY),
+            os.open(dst, os.O_WRONLY | os.O_CREAT),
+            read_size=7000,
+            write_size=10240,
+            capacity=50000,
+        )
+        with patch("tape_drive_controller.tape.buffer.os.write", side_effect=recording_write):
+            buffer.start()
+            buffer.join()
+        assert buffer.error is None
+        assert dst.read_bytes() == data
+        assert set(sizes) == {10240}
+
+
+def test_stream_buffer_without_fill_level_passes_data_on_at_once():
+    """start_fill_percent=0 (restore) writes what has arrived without waiting for the buffer to fill or the source to end."""
+    import select
+    src_read, src_write = os.pipe()
+    dst_read, dst_write = os.pipe()
+    buffer = StreamBuffer(src_read, dst_write, read_size=4096, capacity=1 << 20, start_fill_percent=0)
+    buffer.start()
+    try:
+        os.write(src_write, b"x" * 100)
+        assert select.select([dst_read], [], [], 5)[0]
+        assert os.read(dst_read, 4096) == b"x" * 100
+    finally:
+        os.close(src_write)
+        assert buffer.join(timeout=5)
+        os.close(dst_read)
+    assert buffer.error is None
+
+
+def test_buffer_bytes_scales_with_available_memory():
+    """A quarter of MemAvailable, clamped to [BUFFER_BYTES, BUFFER_MAX_BYTES]; the minimum if unknown."""
+    from unittest.mock import mock_open
+    for available_kb, expected in (
+        (1 << 20, BUFFER_BYTES),  # 1 GiB free
+        (4 << 20, 1 << 30),  # 4 GiB free
+        (64 << 20, BUFFER_MAX_BYTES),
+    ):
+        meminfo = b"MemTotal: 1 kB\nMemAvailable: %d kB\n" % available_kb
+        with patch("builtins.open", mock_open(read_data=meminfo)):
+            assert buffer_bytes() == expected
+    with patch("builtins.open", side_effect=OSError):
+        assert buffer_bytes() == BUFFER_BYTES
+
+
+def test_compute_total_size_matches_du():
+    """_compute_total_size walks in-process but reports the same total as du -sb."""
+    import subprocess
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        (src / "sub").mkdir(parents=True)
+        (src / "a.bin").write_bytes(b"x" * 5000)
+        (src / "sub" / "b.txt").write_text("hello")
+        os.link(src / "a.bin", src / "sub" / "a-link.bin")  # hard link counted once
+        os.symlink("a.bin", src / "a-symlink")
+        r = subprocess.run(["du", "-sb", str(src)], capture_output=True, text=True)
+        assert _compute_total_size([str(src)]) == (int(r.stdout.split()[0]), False)
+        assert _compute_total_size([]) == (0, False)
+
+
+def test_sample_size_extrapolates_past_the_entry_limit():
+    """A walk within the limit is exact; a cut-off one is flagged and extrapolated from the listed dirs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        for d in range(4):
+            (src / f"d{d}").mkdir(parents=True)
+            for f in range(5):
+                (src / f"d{d}" / f"f{f}").write_bytes(b"x" * 1000)
+        exact, estimate = _sample_size(str(src))
+        assert estimate is False
+        assert exact == _compute_total_size([str(src)])[0]
+        sampled, estimate = _sample_size(str(src), max_entries=10)
+        assert estimate is True
+        assert 0 < sampled <= exact * 2
+
+
+def test_sample_size_reuses_cached_listings():
+    """Unchanged directories come from the cache (saved and reloaded); a changed one is listed again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        (src / "sub").mkdir(parents=True)
+        (src / "a").write_bytes(b"x" * 100)
+        (src / "sub" / "b").write_bytes(b"x" * 200)
+        exact = _compute_total_size([str(src)])[0]
+        cache_file = str(Path(tmp) / "cache" / "sizes.json")
+        cache = _SizeCache(cache_file)
+        assert _sample_size(str(src), cache=cache) == (exact, False)
+        cache.save()
+
+        cache = _SizeCache(cache_file)
+        assert _sample_size(str(src), cache=cache) == (exact, True)
+        (src / "sub" / "c").write_bytes(b"x" * 300)
+        assert _sample_size(str(src), cache=cache) == (exact + 300, True)
+
+
+def test_mount_point_size_includes_nested_mounts():
+    """A mount point's statvfs estimate adds every file system mounted below it, as tar descends into them."""
+    mountinfo = (
+        b"22 1 8:1 / / rw - ext4 /dev/sda1 rw\n"
+        b"23 22 8:2 / /home rw - ext4 /dev/sda2 rw\n"
+        b"24 23 0:40 / /home/my\\040disk rw - fuse x rw\n"
+        b"25 22 0:5 / /homework rw - tmpfs tmpfs rw\n"
+    )
+    used = {"/home": 100, "/home/my disk": 20, "/": 1000, "/homework": 7}
+    with patch("builtins.open", mock_open(read_data=mountinfo)):
+        assert _mount_points_below("/home") == ["/home/my disk"]
+        assert _mount_points_below("/") == ["/home", "/home/my disk", "/homework"]
+    with patch("tape_drive_controller.tape.backup.os.path.ismount", return_value=True), \
+            patch("tape_drive_controller.tape.backup._mount_points_below", return_value=["/home/my disk"]), \
+            patch("tape_drive_controller.tape.backup._used_bytes", side_effect=used.__getitem__):
+        assert _measure_path_size("/home", exact=False, sample=False) == (120, True)
+
+
+def test_path_size_shares_concurrent_walks():
+    """Concurrent calls for one path share a walk; sampled sizes are reused afterwards, exact ones are not."""
+    import threading
+    import time
+    calls = []
+
+    def slow_measure(path, exact, sample):
+        calls.append((path, exact, sample))
+        time.sleep(0.05)
+        return 1234, sample
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with patch("tape_drive_controller.tape.backup._measure_path_size", side_effect=slow_measure):
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(_path_size(tmp, sample=True)))
+                for _ in range(3)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert results == [(1234, True)] * 3
+            assert _path_size(tmp, sample=True) == (1234, True)
+            assert len(calls) == 1
+            _path_size(tmp)
+            _path_size(tmp)
+            assert len(calls) == 3
+
+
+def test_find_capacity_mib():
+    """Capacity lines are found case-insensitively among other output; lines without a number don't match."""
+    sg_logs = (
+        b"Tape capacity page  [0x31]\n"
+        b"  Main partition remaining capacity (in MiB): 11000000\n"
+        b"  Main partition maximum capacity (in MiB): 11444224\n"
+    )
+    assert _find_capacity_mib(sg_logs, _SG_LOGS_MAXIMUM_RE) == 11444224
+    assert _find_capacity_mib(b"Maximum capacity in partition [MiB]: 18874368\n", _SG_READ_ATTR_MAXIMUM_RE) == 18874368
+    assert _find_capacity_mib(b"maximum capacity: unknown\n", _SG_LOGS_MAXIMUM_RE) is None
+
+
+def test_poll_line_blocks_yields_lines_and_idle_ticks():
+    """Complete lines come per read, [] when the pipe is quiet, and a partial last line at EOF."""
+    r, w = os.pipe()
+    with os.fdopen(r, "rb") as stream:
+        blocks = _poll_line_blocks(stream, 0.01)
+        os.write(w, b"a\nb\npart")
+        assert next(blocks) == [b"a", b"b"]
+        assert next(blocks) == []
+        os.write(w, b"ial")
+        os.close(w)
+        assert list(blocks) == [[b"partial"]]
+
+
+def test_parse_checkpoint_lines():
+    """Checkpoint lines from tar's echo action yield (records, bytes); other lines yield None."""
+    assert _parse_checkpoint(b"tar: CHECKPOINT 500 W: 5120000 (4.9MiB, 63MiB/s)") == (500, 5120000)
+    assert _parse_checkpoint(b"tar: CHECKPOINT 1000 R: 10240000 (9.8MiB, 48MiB/s)") == (1000, 10240000)
+    assert _parse_checkpoint(b"src/CHECKPOINT 1 W: 2") is None
+    assert _parse_checkpoint(b"-rw-r--r-- root/root 4 2024-01-15 12:00 src/f") is None
+
+
+def test_parse_tar_list_line():
+    """tar -tv member lines parse to TapeEntry (paths with spaces kept); other lines are skipped."""
+    assert _parse_tar_list_line(
+        b"-rw-r--r-- user/group     12345 2024-01-15 12:00 photos/my file.jpg"
+    ) == TapeEntry(path="photos/my file.jpg", size=12345, is_dir=False)
+    assert _parse_tar_list_line(
+        b"drwxr-xr-x user/group         0 2024-01-15 12:00 photos/"
+    ) == TapeEntry(path="photos/", size=0, is_dir=True)
+    assert _parse_tar_list_line(b"tar: Removing leading `/' from member names") is None
+
+
+def test_parse_rsync_progress2_lines():
+    """progress2 lines parse to (bytes, percent) with suffixes and separators; other output doesn't."""
+    assert _parse_rsync_progress2(b"    105.45M  13%  602.83kB/s    0:02:50") == (int(105.45 * 1024 * 1024), 13)
+    assert _parse_rsync_progress2(b"  1,234,567  12%   1.18MB/s    0:00:01") == (1234567, 12)
+    assert _parse_rsync_progress2(b"sending incremental file list") == (None, None)
+    assert _parse_rsync_progress2(b"     12000 files...") == (None, None)
+
+
+def test_line_buffer_splits_on_cr_and_lf():
+    """Complete lines are returned (empty ones skipped); a partial line waits for its terminator."""
+    buf = _LineBuffer()
+    assert buf.feed(b"a\r\nb 1%\rc 2%\rpa") == [b"a", b"b 1%", b"c 2%"]
+    assert buf.feed(b"rt") == []
+    assert buf.feed(b"\nx" * 40000) == [b"part"] + [b"x"] * 39999
+    assert buf.feed(b"y\n") == [b"xy"]
+
+
+def test_ltfs_label_present_reads_vol1_label():
+    """The first block decides: LTFS VOL1 label -> True, other data -> False, nothing readable -> None."""
+    label = b"VOL1" + b"ABC123" + b"L" + b" " * 13 + b"LTFS".ljust(13) + b" " * 42 + b"4"
+    with tempfile.TemporaryDirectory() as tmp:
+        ltfs_tape, tar_tape, blank_tape = (Path(tmp) / n for n in ("ltfs", "tar", "blank"))
+        ltfs_tape.write_bytes(label)
+        tar_tape.write_bytes(b"\0" * 10240)
+        blank_tape.write_bytes(b"")
+        with patch("tape_drive_controller.tape.ltfs.tell", return_value=0), \
+                patch("tape_drive_controller.tape.ltfs.rewind"):
+            assert _ltfs_label_present(str(ltfs_tape)) is True
+            assert _ltfs_label_present(str(tar_tape)) is False
+            assert _ltfs_label_present(str(blank_tape)) is None
+            assert _ltfs_label_present(str(Path(tmp) / "missing")) is None
+
+
+def test_ltfs_label_present_puts_tape_back():
+    """Away from BOT the tape is rewound for the label and sought back; an unknown position is left alone."""
+    with tempfile.NamedTemporaryFile() as tape:
+        tape.write(b"\0" * 10240)
+        tape.flush()
+        with patch("tape_drive_controller.tape.ltfs.tell", return_value=7), \
+                patch("tape_drive_controller.tape.ltfs.rewind") as rewind, \
+                patch("tape_drive_controller.tape.ltfs.seek") as seek:
+            assert _ltfs_label_present(tape.name) is False
+        rewind.assert_called_once_with(tape.name)
+        seek.assert_called_once_with(tape.name, 7)
+        with patch("tape_drive_controller.tape.ltfs.tell", side_effect=TapeBackupError("no tape")), \
+                patch("tape_drive_controller.tape.ltfs.rewind") as rewind, \
+                patch("tape_drive_controller.tape.ltfs.seek") as seek:
+            assert _ltfs_label_present(tape.name) is None
+        rewind.assert_not_called()
+        seek.assert_not_called()
+
+
+def test_detect_ltfs_keep_position_does_not_move_tape():
+    """Appending (keep_position): a tape away from BOT is neither rewound nor test-mounted."""
+    with patch("tape_drive_controller.tape.ltfs.unmount_leftover_ltfs_mounts"), \
+            patch("tape_drive_controller.tape.ltfs.tell", return_value=42), \
+            patch("tape_drive_controller.tape.ltfs.rewind") as rewind, \
+            patch("tape_drive_controller.tape.ltfs.seek") as seek, \
+            patch("tape_drive_controller.tape.ltfs.tape_has_ltfs") as has_ltfs:
+        assert detect_ltfs("/dev/nst0", keep_position=True) is False
+    rewind.assert_not_called()
+    seek.assert_not_called()
+    has_ltfs.assert_not_called()
+
+
+def test_detect_ltfs_waits_for_unmount_before_falling_back():
+    """A readable label answers directly; an unreadable one is retried only after leftovers are unmounted."""
+    order = []
+    with patch("tape_drive_controller.tape.ltfs.unmount_leftover_ltfs_mounts",
+               side_effect=lambda on_log: order.append("unmount")), \
+            patch("tape_drive_controller.tape.ltfs._ltfs_label_present", return_value=True), \
+            patch("tape_drive_controller.tape.ltfs.tape_has_ltfs") as has_ltfs:
+        assert detect_ltfs("/dev/nst0") is True
+        has_ltfs.assert_not_called()
+    assert order == ["unmount"]
+    with patch("tape_drive_controller.tape.ltfs.unmount_leftover_ltfs_mounts",
+               side_effect=lambda on_log: order.append("unmount")), \
+            patch("tape_drive_controller.tape.ltfs._ltfs_label_present", return_value=None), \
+            patch("tape_drive_controller.tape.ltfs.tape_has_ltfs",
+                  side_effect=lambda device: order.append("fallback") or False):
+        assert detect_ltfs("/dev/nst0") is False
+    assert order == ["unmount", "unmount", "fallback"]
+
+
+def test_rsync_to_mount_stops_rsync_on_error():
+    """An exception while rsync runs terminates it and closes its pipe."""
+    def on_log(line):
+        if line.startswith("rsync:"):
+            raise RuntimeError("log failed")
+
+    procs = []
+    with patch("tape_drive_controller.tape.ltfs.spawn_argv",
+               return_value=["sh", "-c", "echo 'rsync: boom'; exec sleep 30"]):
+        with pytest.raises(RuntimeError):
+            _rsync_to_mount(
+                ["/src"], "/mnt", None, _ProgressThrottle(None, None), lambda: False,
+                on_progress=None, on_log=on_log, process_holder=procs,
+            )
+    assert len(procs) == 1
+    assert procs[0].poll() is not None
+    assert procs[0].stdout.closed
+
+
 def test_is_ltfs_available_returns_bool():
     """is_ltfs_available returns a boolean."""
     assert isinstance(is_ltfs_available(), bool)
@@ -105,26 +495,124 @@ def test_run_ltfs_rsync_succeeds_when_ltfs_daemonizes():
         ltfs_mock.stderr = io.StringIO("")
 
         rsync_mock = MagicMock()
-        rsync_mock.stderr = io.StringIO("")  # no progress lines; read() returns ""
-        rsync_mock.poll.return_value = 0  # exited, so read loop breaks after first read
+        read_fd, write_fd = os.pipe()
+        os.close(write_fd)
+        rsync_mock.stdout = os.fdopen(read_fd, "rb", buffering=0)  # no output; EOF right away
+        rsync_mock.poll.return_value = 0
         rsync_mock.returncode = 0
         rsync_mock.wait.return_value = None
 
         with patch("tape_drive_controller.tape.ltfs.nst_to_sg", return_value="/dev/sg0"):
             with patch(
-                "tape_drive_controller.tape.ltfs.shutil.which",
+                "tape_drive_controller.tape.ltfs._have",
                 side_effect=lambda c: "/usr/bin/ltfs" if c in ("ltfs", "rsync") else None,
             ):
                 with patch("tape_drive_controller.tape.ltfs.os.path.ismount", return_value=True):
-                    with patch("tape_drive_controller.tape.ltfs.pty", None):  # use pipe so stderr.read() returns ""
+                    with patch(
+                        "tape_drive_controller.tape.ltfs.subprocess.Popen",
+                        side_effect=[ltfs_mock, rsync_mock],
+                    ):
                         with patch(
-                            "tape_drive_controller.tape.ltfs.subprocess.Popen",
-                            side_effect=[ltfs_mock, rsync_mock],
+                            "tape_drive_controller.tape.ltfs.subprocess.run",
+                            return_value=MagicMock(returncode=0),
                         ):
-                            with patch(
-                                "tape_drive_controller.tape.ltfs.subprocess.run",
-                                return_value=MagicMock(returncode=0),
-                            ):
-                                run_ltfs_rsync("/dev/nst0", paths)
+                            run_ltfs_rsync("/dev/nst0", paths)
 
         rsync_mock.wait.assert_called_once()
+
+
+def test_copy_to_mount_copies_tree_like_rsync():
+    """Direct LTFS copy lays paths out as rsync -a does, keeps mtimes and links, and skips unchanged files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        (src / "sub").mkdir(parents=True)
+        (src / "a").write_bytes(b"a" * 100)
+        (src / "sub" / "b").write_bytes(b"b" * 50000)
+        os.symlink("a", src / "link")
+        os.utime(src / "a", (1_000_000_000, 1_000_000_000))
+        mount = Path(tmp) / "mnt"
+        mount.mkdir()
+        log = []
+        _copy_to_mount([str(src)], str(mount), _ProgressThrottle(None, None), lambda: False, log.append)
+        assert (mount / "src" / "a").read_bytes() == b"a" * 100
+        assert (mount / "src" / "sub" / "b").read_bytes() == b"b" * 50000
+        assert os.readlink(mount / "src" / "link") == "a"
+        assert os.stat(mount / "src" / "a").st_mtime == 1_000_000_000
+        assert log == []
+
+        # Trailing slash: the contents go into the mount itself, as with rsync
+        contents_mount = Path(tmp) / "mnt2"
+        contents_mount.mkdir()
+        _copy_to_mount([str(src) + "/"], str(contents_mount), _ProgressThrottle(None, None), lambda: False, log.append)
+        assert (contents_mount / "a").read_bytes() == b"a" * 100
+        assert (contents_mount / "sub" / "b").read_bytes() == b"b" * 50000
+        assert not (contents_mount / "src").exists()
+        assert log == []
+
+        (mount / "src" / "a").write_bytes(b"x" * 100)  # same size
+        os.utime(mount / "src" / "a", (1_000_000_000, 1_000_000_000))  # and mtime: not copied again
+        _copy_to_mount([str(src)], str(mount), _ProgressThrottle(None, None), lambda: False, log.append)
+        assert (mount / "src" / "a").read_bytes() == b"x" * 100
+
+
+def test_copy_to_mount_reports_entries_that_cannot_be_statted():
+    """A directory entry whose lstat fails is logged and fails the copy, like rsync's exit code 23."""
+    from tape_drive_controller.tape.backup import _list_dir
+
+    def list_dir(path, on_error=None):
+        for name, st in _list_dir(path, on_error):
+            if name == "gone":
+                on_error(name, FileNotFoundError(2, "No such file or directory"))
+            else:
+                yield name, st
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        src.mkdir()
+        (src / "kept").write_bytes(b"k")
+        (src / "gone").write_bytes(b"g")
+        mount = Path(tmp) / "mnt"
+        mount.mkdir()
+        log = []
+        with patch("tape_drive_controller.tape.ltfs._list_dir", side_effect=list_dir):
+            with pytest.raises(TapeBackupError, match="1 file"):
+                _copy_to_mount([str(src)], str(mount), _ProgressThrottle(None, None), lambda: False, log.append)
+        assert (mount / "src" / "kept").read_bytes() == b"k"
+        assert log == ["%s: No such file or directory" % (src / "gone")]
+
+
+def test_run_ltfs_rsync_reports_rsync_error_line():
+    """rsync's errors arrive on the same pipe as its progress; the last one is part of the failure message."""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "src"
+        src.mkdir()
+
+        ltfs_mock = MagicMock()
+        ltfs_mock.poll.return_value = 0
+        ltfs_mock.stderr = io.StringIO("")
+
+        rsync_mock = MagicMock()
+        read_fd, write_fd = os.pipe()
+        os.write(
+            write_fd,
+            b"      1,024 100%    1.00MB/s    0:00:00\r"
+            b"rsync: [sender] send_files failed to open \"f\": Permission denied (13)\n"
+            b"rsync error: some files/attrs were not transferred (code 23)\n",
+        )
+        os.close(write_fd)
+        rsync_mock.stdout = os.fdopen(read_fd, "rb", buffering=0)
+        rsync_mock.returncode = 23
+
+        with patch("tape_drive_controller.tape.ltfs.nst_to_sg", return_value="/dev/sg0"):
+            with patch("tape_drive_controller.tape.ltfs._have", return_value="/usr/bin/x"):
+                with patch("tape_drive_controller.tape.ltfs.os.path.ismount", return_value=True):
+                    with patch(
+                        "tape_drive_controller.tape.ltfs.subprocess.Popen",
+                        side_effect=[ltfs_mock, rsync_mock],
+                    ):
+                        with patch(
+                            "tape_drive_controller.tape.ltfs.subprocess.run",
+                            return_value=MagicMock(returncode=0),
+                        ):
+                            with pytest.raises(TapeBackupError, match=r"code 23: .*not transferred"):
+                                run_ltfs_rsync("/dev/nst0", [str(src)])